@@ -0,0 +1,71 @@
+"""
+Benchmark the scalar ai_helpers functions against their vectorized versions
+
+Run from the project root:  python -m benchmarks.bench_ai_helpers [rows]
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from utils.ai_helpers import (
+    predict_placement_probability, predict_placement_probability_batch,
+    get_career_recommendations, get_career_recommendations_batch
+)
+
+SKILLS = ["Python", "Java", "SQL", "C++", "React", "AWS", "Docker", "Machine Learning"]
+
+
+def sample_students(n_rows, seed=42):
+    """Synthetic student rows with list-valued skills"""
+    rng = np.random.default_rng(seed)
+    skill_counts = rng.integers(0, 7, n_rows)
+
+    students = pd.DataFrame({
+        "cgpa": np.round(rng.uniform(5.0, 10.0, n_rows), 2),
+        "internships": rng.integers(0, 4, n_rows),
+        "projects": rng.integers(0, 8, n_rows),
+        "backlogs": rng.integers(0, 4, n_rows),
+        "skills": [list(rng.choice(SKILLS, k, replace=False)) for k in skill_counts]
+    })
+    students["technical_skills"] = students["skills"].str.join(", ")
+    return students
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(n_rows=100_000):
+    students = sample_students(n_rows)
+    records = students.to_dict("records")
+
+    print(f"Rows: {n_rows:,}")
+
+    loop_probs, loop_time = timed(lambda: [predict_placement_probability(r) for r in records])
+    batch_probs, batch_time = timed(predict_placement_probability_batch, students)
+    assert np.allclose(loop_probs, batch_probs), "batch probabilities differ from the scalar version"
+    print(f"predict_placement_probability   loop {loop_time:8.3f}s   batch {batch_time:8.3f}s   "
+          f"speedup {loop_time / batch_time:6.1f}x")
+
+    loop_recs, loop_time = timed(lambda: [get_career_recommendations(r) for r in records])
+    batch_recs, batch_time = timed(get_career_recommendations_batch, students)
+    grouped = {
+        row: group[["career", "match", "reason"]].to_dict("records")
+        for row, group in batch_recs.groupby("row")
+    }
+    assert loop_recs == [grouped.get(i, []) for i in range(n_rows)], \
+        "batch recommendations differ from the scalar version"
+    print(f"get_career_recommendations      loop {loop_time:8.3f}s   batch {batch_time:8.3f}s   "
+          f"speedup {loop_time / batch_time:6.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
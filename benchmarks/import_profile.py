@@ -0,0 +1,101 @@
+"""
+Import-time profile of the app's first paint, from ``python -X importtime``
+
+Run from the project root:  python -m benchmarks.import_profile [--budget-ms 1500] [--top 15]
+
+Each target is imported in a fresh interpreter inside a scratch directory.
+The run fails (exit status 1) if a first-paint target is over budget, pulls
+in a module that should load only with its role, or creates the database.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What streamlit_app.py imports before any role is selected
+FIRST_PAINT = ["database.db_manager", "modules.flow_registry", "modules.workflow_manager"]
+
+# Role modules, profiled for information only
+ROLE_MODULES = ["modules.student_flow", "modules.college_flow", "modules.recruiter_flow",
+                "modules.placement_module"]
+
+# Packages that must not load before a role needs them (plotly is absent because streamlit loads it)
+DEFERRED = ["sklearn", "scipy", "joblib", "modules.college_flow", "modules.student_flow",
+            "modules.recruiter_flow"]
+
+
+def profile(module):
+    """
+    Import ``module`` in a fresh interpreter and return (rows, loaded
+    module names, created files). Rows are (cumulative µs, self µs, depth,
+    name) as reported by -X importtime.
+    """
+    code = f"import sys; sys.path.insert(0, {ROOT!r}); import {module}; print('\\n'.join(sys.modules))"
+    with tempfile.TemporaryDirectory() as scratch:
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                cwd=scratch, capture_output=True, text=True)
+        created = os.listdir(scratch)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), (len(name) - len(name.lstrip())) // 2, name.strip()))
+    return rows, set(result.stdout.split()), created
+
+
+def report(module, rows, top):
+    # -X importtime lists a module after everything it imported, so its tree is the deeper rows just before it
+    end = next((i for i, row in enumerate(rows) if row[3] == module), None)
+    if end is None:
+        print(f"\n{module}: already imported by the interpreter")
+        return 0
+    start = end
+    while start > 0 and rows[start - 1][2] > rows[end][2]:
+        start -= 1
+
+    total = rows[end][0] / 1000
+    print(f"\n{module}: {total:.1f} ms cumulative")
+    for cumulative_us, _, depth, name in sorted(rows[start:end + 1], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {'  ' * depth}{name}")
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile import time of the app's first paint")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="limit per first-paint module")
+    parser.add_argument("--top", type=int, default=15, help="heaviest imports to list per module")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for module in FIRST_PAINT:
+        rows, loaded, created = profile(module)
+        total = report(module, rows, args.top)
+        if total > args.budget_ms:
+            failures.append(f"{module} takes {total:.0f} ms (budget {args.budget_ms:.0f} ms)")
+        early = [name for name in DEFERRED if name in loaded]
+        if early:
+            failures.append(f"{module} loads {', '.join(early)} before a role needs them")
+        if created:
+            failures.append(f"{module} creates {', '.join(created)} at import")
+
+    for module in ROLE_MODULES:
+        rows, _, _ = profile(module)
+        report(module, rows, args.top)
+
+    print()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print("OK" if not failures else f"{len(failures)} import-time check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Memory footprint of the in-memory tables against their per-row budgets
+
+Run from the project root:  python -m benchmarks.table_memory
+
+Builds each table the way the app loads it and prints its deep memory use
+per row and per column. The run fails (exit status 1) if a table is over
+its budget in utils.schema.BUDGETS or misses a dtype from its schema.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.college_flow import CollegeFlow  # noqa: E402
+from modules.college_info import CollegeInfoModule  # noqa: E402
+from modules.student_info import StudentInfoModule  # noqa: E402
+from utils.schema import SCHEMAS, memory_report  # noqa: E402
+
+
+def load_tables():
+    # The generators only need the class, not a session (which would open the database)
+    flow = CollegeFlow.__new__(CollegeFlow)
+    return {
+        "students": flow.generate_sample_students(),
+        "placements": flow.generate_sample_placements(),
+        "student_profiles": StudentInfoModule().students_df,
+        "colleges": CollegeInfoModule().college_data
+    }
+
+
+def main():
+    tables = load_tables()
+    report = memory_report(tables)
+    print(report.to_string(index=False))
+
+    failures = [f"{row.table} uses {row.bytes_per_row} bytes/row (budget {row.budget_per_row})"
+                for row in report.itertuples() if not row.within_budget]
+    for table, frame in tables.items():
+        print(f"\n{table}:")
+        usage = frame.memory_usage(deep=True, index=False)
+        for column in frame.columns:
+            print(f"  {column:<20} {str(frame[column].dtype):<10} {usage[column]:>8} B")
+        failures += [f"{table}.{column} is {frame[column].dtype}, schema says {dtype}"
+                     for column, dtype in SCHEMAS[table].items()
+                     if column in frame and str(frame[column].dtype) != dtype]
+
+    print()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print("OK" if not failures else f"{len(failures)} memory check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
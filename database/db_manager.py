@@ -10,6 +10,9 @@ import os
 class DatabaseManager:
     def __init__(self, db_path='campus_placement.db'):
         self.db_path = db_path
+        self._listeners = {}
+        self._match_cache = {}
+        self._eligibility_index = None
         self.init_database()
     
     @contextmanager
@@ -45,6 +48,16 @@ class DatabaseManager:
                 # Create tables programmatically if schema file doesn't exist
                 self.create_tables(conn)
                 self.insert_default_data(conn)
+            
+            self.migrate_schema(conn)
+    
+    def migrate_schema(self, conn):
+        """Bring databases created by older versions up to the current schema"""
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(students)")}
+        if 'college_id' not in columns:
+            # Existing single-college deployments belong to college 1
+            conn.execute("ALTER TABLE students ADD COLUMN college_id INTEGER DEFAULT 1")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_students_college_id ON students(college_id)")
     
     def create_tables(self, conn):
         """Create tables programmatically"""
@@ -83,6 +96,7 @@ class DatabaseManager:
                 placement_status VARCHAR(20) DEFAULT 'Not Placed' CHECK (placement_status IN ('Not Placed', 'Placed', 'Intern', 'Higher Studies')),
                 placement_company_id INTEGER,
                 placement_package DECIMAL(10,2),
+                college_id INTEGER DEFAULT 1,
                 FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
             )
             """,
@@ -247,14 +261,17 @@ class DatabaseManager:
     # === STUDENT MANAGEMENT METHODS ===
     
     def create_student(self, user_id: int, roll_number: str, department: str, 
-                      semester: int, cgpa: float = None, graduation_year: int = None) -> int:
+                      semester: int, cgpa: float = None, graduation_year: int = None,
+                      college_id: int = 1) -> int:
         """Create a new student record"""
         with self.get_connection() as conn:
             cursor = conn.execute(
-                """INSERT INTO students (user_id, roll_number, department, semester, cgpa, graduation_year) 
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (user_id, roll_number, department, semester, cgpa, graduation_year)
+                """INSERT INTO students (user_id, roll_number, department, semester, cgpa, graduation_year, college_id) 
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (user_id, roll_number, department, semester, cgpa, graduation_year, college_id)
             )
+            self._refresh_student_features(conn, [cursor.lastrowid])
+            self._eligibility_index = None
             return cursor.lastrowid
     
     def get_student_by_user_id(self, user_id: int) -> Optional[Dict]:
@@ -288,10 +305,14 @@ class DatabaseManager:
                     f"UPDATE students SET {set_clause} WHERE student_id = ?",
                     values
                 )
+                self._refresh_student_features(conn, [student_id])
+            self._eligibility_index = None
+            self._notify('student_updated', student_id=student_id)
     
     def add_student_skill(self, student_id: int, skill_name: str, 
                          skill_level: str = 'Intermediate', skill_category: str = 'Technical'):
         """Add a skill to student profile"""
+        skill_id = None
         with self.get_connection() as conn:
             try:
                 cursor = conn.execute(
@@ -299,7 +320,8 @@ class DatabaseManager:
                        VALUES (?, ?, ?, ?)""",
                     (student_id, skill_name, skill_level, skill_category)
                 )
-                return cursor.lastrowid
+                self._refresh_student_features(conn, [student_id])
+                skill_id = cursor.lastrowid
             except sqlite3.IntegrityError:
                 # Skill already exists, update it
                 conn.execute(
@@ -307,6 +329,8 @@ class DatabaseManager:
                        WHERE student_id = ? AND skill_name = ?""",
                     (skill_level, skill_category, student_id, skill_name)
                 )
+        self._notify('student_updated', student_id=student_id)
+        return skill_id
     
     def get_student_skills(self, student_id: int) -> List[Dict]:
         """Get all skills for a student"""
@@ -317,6 +341,25 @@ class DatabaseManager:
             )
             return [dict(row) for row in cursor.fetchall()]
     
+    def mark_student_placed(self, student_id: int, company_id: int = None, package: float = None):
+        """Record a student's placement"""
+        with self.get_connection() as conn:
+            conn.execute(
+                """UPDATE students SET placement_status = 'Placed', placement_company_id = ?, 
+                   placement_package = ? WHERE student_id = ?""",
+                (company_id, package, student_id)
+            )
+            company = conn.execute(
+                "SELECT company_name FROM companies WHERE company_id = ?", (company_id,)
+            ).fetchone()
+            college = conn.execute(
+                "SELECT college_id FROM students WHERE student_id = ?", (student_id,)
+            ).fetchone()
+            self._record_match_outcome(conn, student_id, company['company_name'] if company else None,
+                                       college['college_id'] if college else None)
+        self._eligibility_index = None
+        self._notify('student_placed', student_id=student_id)
+    
     # === COMPANY & JOB MANAGEMENT METHODS ===
     
     def create_company(self, company_name: str, industry: str = None, website: str = None,
@@ -333,6 +376,16 @@ class DatabaseManager:
             )
             return cursor.lastrowid
     
+    def get_or_create_company(self, company_name: str, **kwargs) -> int:
+        """company_id of the company with this name, creating the record if there is none"""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT company_id FROM companies WHERE company_name = ?", (company_name,)
+            ).fetchone()
+        if row:
+            return row['company_id']
+        return self.create_company(company_name, **kwargs)
+    
     def create_job_posting(self, company_id: int, job_title: str, job_description: str,
                           job_type: str, location: str, salary_min: float, salary_max: float,
                           vacancies: int = 1, min_cgpa: float = 7.0, max_backlogs: int = 2,
@@ -350,7 +403,9 @@ class DatabaseManager:
                  ','.join(required_skills) if required_skills else None,
                  kwargs.get('benefits'), kwargs.get('application_deadline'))
             )
-            return cursor.lastrowid
+            job_id = cursor.lastrowid
+        self._notify('job_posted', job_id=job_id)
+        return job_id
     
     def get_active_jobs(self, filters: Dict = None) -> List[Dict]:
         """Get active job postings with optional filters"""
@@ -387,6 +442,268 @@ class DatabaseManager:
             cursor = conn.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_eligibility_index(self):
+        """
+        EligibilityIndex over unplaced students for CGPA/backlog/department
+        cutoffs, built on first use and kept until a student write
+        """
+        from utils.eligibility_index import EligibilityIndex
+        
+        if self._eligibility_index is None:
+            with self.get_connection() as conn:
+                students = pd.read_sql_query(
+                    """SELECT student_id, department, cgpa, backlogs FROM students
+                       WHERE placement_status = 'Not Placed' AND cgpa IS NOT NULL""",
+                    conn
+                )
+            self._eligibility_index = EligibilityIndex(students)
+        return self._eligibility_index
+    
+    def get_job_eligibility_counts(self, jobs: List[Dict] = None) -> Dict[int, int]:
+        """Number of unplaced students meeting each job's min_cgpa/max_backlogs"""
+        jobs = self.get_active_jobs() if jobs is None else jobs
+        index = self.get_eligibility_index()
+        return {job['job_id']: index.count_for(job) for job in jobs}
+    
+    # === MATCHING DATA METHODS ===
+    
+    def get_matching_students(self, student_ids: List[int] = None, college_id: int = None) -> pd.DataFrame:
+        """Unplaced students with their skill lists, in MatchingEngine's student format"""
+        query = """
+            SELECT s.student_id, u.full_name AS name, s.department, s.cgpa, s.backlogs,
+                   GROUP_CONCAT(k.skill_name) AS skills
+            FROM students s
+            JOIN users u ON s.user_id = u.user_id
+            LEFT JOIN student_skills k ON k.student_id = s.student_id
+            WHERE s.placement_status = 'Not Placed'
+        """
+        params = []
+        if student_ids is not None:
+            query += f" AND s.student_id IN ({','.join('?' * len(student_ids))})"
+            params.extend(student_ids)
+        if college_id is not None:
+            query += " AND s.college_id = ?"
+            params.append(college_id)
+        query += " GROUP BY s.student_id ORDER BY s.student_id"
+        
+        with self.get_connection() as conn:
+            frame = pd.read_sql_query(query, conn, params=params)
+        frame['skills'] = frame['skills'].map(lambda v: v.split(',') if isinstance(v, str) else [])
+        frame['cgpa'] = frame['cgpa'].fillna(0.0)
+        return frame
+    
+    def get_college_ids(self) -> List[int]:
+        """Colleges that have students"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT DISTINCT college_id FROM students WHERE college_id IS NOT NULL ORDER BY college_id"
+            )
+            return [row['college_id'] for row in cursor.fetchall()]
+    
+    def get_college(self, college_id: int) -> Optional[Dict]:
+        """Get a college record"""
+        with self.get_connection() as conn:
+            cursor = conn.execute("SELECT * FROM colleges WHERE college_id = ?", (college_id,))
+            college = cursor.fetchone()
+            return dict(college) if college else None
+    
+    def get_matching_jobs(self, job_ids: List[int] = None) -> pd.DataFrame:
+        """Active job postings in MatchingEngine's company format, keyed by job_id"""
+        query = """
+            SELECT j.job_id, c.company_name AS name, j.job_title, j.required_skills,
+                   j.min_cgpa, j.max_backlogs, j.vacancies
+            FROM job_postings j
+            JOIN companies c ON j.company_id = c.company_id
+            WHERE j.is_active = 1
+        """
+        params = []
+        if job_ids is not None:
+            query += f" AND j.job_id IN ({','.join('?' * len(job_ids))})"
+            params.extend(job_ids)
+        query += " ORDER BY j.job_id"
+        
+        with self.get_connection() as conn:
+            frame = pd.read_sql_query(query, conn, params=params)
+        frame['required_skills'] = frame['required_skills'].map(
+            lambda v: v.split(',') if isinstance(v, str) else [])
+        return frame
+    
+    # === MATCH RESULTS METHODS ===
+    
+    _MATCH_COLUMNS = ['student_id', 'student_name', 'department', 'cgpa', 'company_name',
+                      'recommended_role', 'match_score', 'cgpa_score', 'skills_score',
+                      'department_score', 'backlog_penalty', 'reason']
+    
+    def save_matches(self, matches: pd.DataFrame, run_id: str, algorithm: str, algorithm_version: str,
+                     college_id: int = 1, match_mode: str = None) -> int:
+        """Store one matching run's results (MatchingEngine frame plus score components) in one transaction"""
+        frame = matches.rename(columns={'company': 'company_name'}).reindex(columns=self._MATCH_COLUMNS)
+        frame['student_id'] = frame['student_id'].astype(str)
+        frame = frame.astype(object).where(frame.notna(), None)
+        
+        rows = [
+            (run_id, college_id, *values, algorithm, algorithm_version, match_mode)
+            for values in frame.itertuples(index=False, name=None)
+        ]
+        
+        with self.get_connection() as conn:
+            conn.executemany(
+                f"""INSERT INTO matches 
+                   (run_id, college_id, {', '.join(self._MATCH_COLUMNS)}, algorithm, algorithm_version, match_mode) 
+                   VALUES ({', '.join('?' * (len(self._MATCH_COLUMNS) + 5))})""",
+                rows
+            )
+        self._match_cache.clear()
+        return len(rows)
+    
+    def get_matches(self, run_id: str = None, college_id: int = None, status: str = None) -> pd.DataFrame:
+        """Stored matches, best first within each run. Results are cached until matches change."""
+        key = ('matches', run_id, college_id, status)
+        if key not in self._match_cache:
+            query = "SELECT * FROM matches WHERE 1=1"
+            params = []
+            for column, value in (('run_id', run_id), ('college_id', college_id), ('status', status)):
+                if value is not None:
+                    query += f" AND {column} = ?"
+                    params.append(value)
+            query += " ORDER BY match_id"
+            
+            with self.get_connection() as conn:
+                self._match_cache[key] = pd.read_sql_query(query, conn, params=params)
+        return self._match_cache[key].copy()
+    
+    def mark_matches_sent(self, run_id: str, student_ids: List[str] = None) -> int:
+        """Mark a run's open recommendations as sent to students"""
+        query = """UPDATE matches SET status = 'Sent', notified_at = CURRENT_TIMESTAMP 
+                   WHERE run_id = ? AND status = 'Recommended'"""
+        params = [run_id]
+        if student_ids is not None:
+            query += f" AND student_id IN ({', '.join('?' * len(student_ids))})"
+            params.extend(str(s) for s in student_ids)
+        
+        with self.get_connection() as conn:
+            updated = conn.execute(query, params).rowcount
+        self._match_cache.clear()
+        return updated
+    
+    def _record_match_outcome(self, conn, student_id, company_name: str = None, college_id: int = None):
+        """
+        Resolve a placed student's open matches: the earliest one with the
+        placing company becomes 'Placed', the rest 'Closed'.
+        """
+        scope = "student_id = ? AND status IN ('Recommended', 'Sent')"
+        params = [str(student_id)]
+        if college_id is not None:
+            scope += " AND college_id = ?"
+            params.append(college_id)
+        
+        placed = conn.execute(
+            f"SELECT MIN(match_id) AS match_id FROM matches WHERE {scope} AND company_name = ?",
+            params + [company_name]
+        ).fetchone()['match_id']
+        cursor = conn.execute(
+            f"""UPDATE matches SET outcome_at = CURRENT_TIMESTAMP,
+                   status = CASE WHEN match_id = ? THEN 'Placed' ELSE 'Closed' END
+                WHERE {scope}""",
+            [placed] + params
+        )
+        if cursor.rowcount:
+            self._match_cache.clear()
+        return cursor.rowcount
+    
+    def record_match_outcome(self, student_id, company_name: str, college_id: int = None) -> int:
+        """Record that a student was placed with a company against their stored matches"""
+        with self.get_connection() as conn:
+            return self._record_match_outcome(conn, student_id, company_name, college_id)
+    
+    def get_match_analytics(self, college_id: int = None) -> Dict:
+        """
+        Match outcomes rolled up overall, by department and by company from
+        one aggregated query. A (student, company) pair matched in several
+        runs counts once, as its placed match or else its latest one.
+        Success rate is the share of matched students placed with a company
+        they were matched to; time to match runs from that match being
+        stored to the placement.
+        """
+        key = ('analytics', college_id)
+        if key not in self._match_cache:
+            # first_match flags each student's earliest match, so summing it
+            # counts distinct students across departments; within a company a
+            # group's distinct count is exact
+            query = """
+                SELECT department, company_name AS company,
+                       COUNT(*) AS matches,
+                       COUNT(DISTINCT student_id) AS company_students,
+                       SUM(first_match) AS students,
+                       SUM(status = 'Placed') AS placed,
+                       SUM(CASE WHEN status = 'Placed' 
+                           THEN julianday(outcome_at) - julianday(created_at) ELSE 0 END) AS days_to_match,
+                       AVG(match_score) AS avg_score
+                FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY college_id, student_id ORDER BY match_id) = 1 AS first_match
+                      FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY college_id, student_id, company_name
+                                                         ORDER BY status = 'Placed' DESC, match_id DESC) AS pair_rank
+                            FROM matches)
+                      WHERE pair_rank = 1)
+            """
+            params = []
+            if college_id is not None:
+                query += " WHERE college_id = ?"
+                params.append(college_id)
+            query += " GROUP BY department, company_name"
+            
+            with self.get_connection() as conn:
+                self._match_cache[key] = pd.read_sql_query(query, conn, params=params)
+        groups = self._match_cache[key]
+        groups = groups.assign(score_total=groups['avg_score'] * groups['matches'])
+        sums = ['matches', 'students', 'placed', 'days_to_match', 'score_total']
+        
+        # A student has one department and at most one placed match, so
+        # placements add up along either axis
+        def rollup(totals):
+            totals = totals.copy()
+            totals['success_rate'] = (totals['placed'] / totals['students'].where(totals['students'] > 0) * 100).fillna(0.0)
+            totals['avg_days_to_match'] = totals['days_to_match'] / totals['placed'].where(totals['placed'] > 0)
+            totals['avg_score'] = totals['score_total'] / totals['matches'].where(totals['matches'] > 0)
+            return totals.drop(columns=['days_to_match', 'score_total'])
+        
+        overall = rollup(groups[sums].sum().to_frame().T).iloc[0]
+        return {
+            'total_matches': int(overall['matches']),
+            'matched_students': int(overall['students']),
+            'placed_students': int(overall['placed']),
+            'success_rate': float(overall['success_rate']),
+            'avg_days_to_match': None if pd.isna(overall['avg_days_to_match']) else float(overall['avg_days_to_match']),
+            'by_department': rollup(groups.groupby('department')[sums].sum()).reset_index(),
+            'by_company': rollup(groups.assign(students=groups['company_students'])
+                                 .groupby('company')[sums].sum()).reset_index()
+        }
+    
+    # === TREND SNAPSHOT METHODS ===
+    
+    def save_trend_snapshots(self, college_id: int, series: str, frame: pd.DataFrame) -> int:
+        """Store finalized trend periods (frame indexed by period), replacing any stored before for the same period"""
+        rows = [
+            (college_id, series, str(period),
+             json.dumps({column: None if pd.isna(value) else float(value) for column, value in values.items()}))
+            for period, values in frame.iterrows()
+        ]
+        with self.get_connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO trend_snapshots (college_id, series, period, metrics) VALUES (?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+    
+    def get_trend_snapshots(self, college_id: int, series: str) -> pd.DataFrame:
+        """Finalized trend periods of a college as a frame indexed by period"""
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT period, metrics FROM trend_snapshots WHERE college_id = ? AND series = ? ORDER BY period",
+                (college_id, series)
+            ).fetchall()
+        return pd.DataFrame([json.loads(row['metrics']) for row in rows],
+                            index=pd.Index([row['period'] for row in rows], name='period'))
+    
     # === APPLICATION MANAGEMENT METHODS ===
     
     def apply_for_job(self, student_id: int, job_id: int, resume_version: str = None,
@@ -400,6 +717,7 @@ class DatabaseManager:
                        VALUES (?, ?, ?, ?)""",
                     (student_id, job_id, resume_version, cover_letter)
                 )
+                self._refresh_student_features(conn, [student_id])
                 return cursor.lastrowid
             except sqlite3.IntegrityError:
                 # Already applied
@@ -427,6 +745,59 @@ class DatabaseManager:
                 "UPDATE student_applications SET application_status = ?, notes = ? WHERE application_id = ?",
                 (status, notes, application_id)
             )
+            cursor = conn.execute(
+                "SELECT student_id FROM student_applications WHERE application_id = ?",
+                (application_id,)
+            )
+            row = cursor.fetchone()
+            if row:
+                self._refresh_student_features(conn, [row['student_id']])
+    
+    def update_application_statuses(self, updates: List[Dict]) -> int:
+        """
+        Set many applications' statuses (dicts with application_id, status
+        and optional notes) in one transaction; any invalid status rolls
+        back the whole batch
+        """
+        rows = [(u['status'], u.get('notes'), u['application_id']) for u in updates]
+        if not rows:
+            return 0
+        
+        with self.get_connection() as conn:
+            updated = conn.executemany(
+                """UPDATE student_applications 
+                   SET application_status = ?, notes = COALESCE(?, notes) 
+                   WHERE application_id = ?""",
+                rows
+            ).rowcount
+            application_ids = [r[2] for r in rows]
+            cursor = conn.execute(
+                f"""SELECT DISTINCT student_id FROM student_applications 
+                    WHERE application_id IN ({', '.join('?' * len(application_ids))})""",
+                application_ids
+            )
+            student_ids = [row['student_id'] for row in cursor.fetchall()]
+            self._refresh_student_features(conn, student_ids)
+        return updated
+    
+    # === CHANGE LISTENERS ===
+    
+    def add_listener(self, event: str, callback) -> None:
+        """
+        Call ``callback(**payload)`` after a committed change. Events:
+        'job_posted' (job_id), 'student_updated' (student_id) and
+        'student_placed' (student_id).
+        """
+        self._listeners.setdefault(event, []).append(callback)
+    
+    def remove_listener(self, event: str, callback) -> None:
+        """Stop calling a registered callback"""
+        if callback in self._listeners.get(event, []):
+            self._listeners[event].remove(callback)
+    
+    def _notify(self, event: str, **payload) -> None:
+        for callback in list(self._listeners.get(event, [])):
+            callback(**payload)
     
     # === ANALYTICS & REPORTING METHODS ===
     
@@ -446,9 +817,8 @@ class DatabaseManager:
         params = []
         
         if college_id:
-            # Assuming students are linked to college through some relation
-            # You might need to adjust this based on your schema
-            pass
+            query += " AND college_id = ?"
+            params.append(college_id)
         
         if department:
             query += " AND department = ?"
@@ -564,6 +934,27 @@ class DatabaseManager:
             )
             return cursor.lastrowid
     
+    def save_placement_predictions(self, predictions: List[Dict]) -> int:
+        """Save many placement predictions in one transaction"""
+        rows = [
+            (p['student_id'], p['placement_probability'],
+             json.dumps(p['predicted_companies']) if p.get('predicted_companies') else None,
+             p.get('predicted_package'),
+             json.dumps(p['key_factors']) if p.get('key_factors') else None,
+             p.get('model_version'), p.get('confidence_score'))
+            for p in predictions
+        ]
+        
+        with self.get_connection() as conn:
+            conn.executemany(
+                """INSERT INTO placement_predictions 
+                   (student_id, prediction_date, placement_probability, predicted_companies, 
+                    predicted_package, key_factors, model_version, confidence_score) 
+                   VALUES (?, DATE('now'), ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+        return len(rows)
+    
     def get_student_predictions(self, student_id: int) -> List[Dict]:
         """Get placement predictions for a student"""
         with self.get_connection() as conn:
@@ -583,6 +974,79 @@ class DatabaseManager:
                 predictions.append(pred)
             return predictions
     
+    # === FEATURE STORE METHODS ===
+    
+    def _refresh_student_features(self, conn, student_ids: List[int] = None):
+        """Recompute derived feature columns for the given students (all if None)"""
+        query = """
+            INSERT INTO student_features 
+                (student_id, cgpa, backlogs, internships, projects, skill_count, application_count, updated_at)
+            SELECT s.student_id, s.cgpa, COALESCE(s.backlogs, 0),
+                   (SELECT COUNT(*) FROM student_experience e WHERE e.student_id = s.student_id) +
+                   (SELECT COUNT(*) FROM student_applications a 
+                    JOIN job_postings j ON a.job_id = j.job_id 
+                    WHERE a.student_id = s.student_id AND j.job_type = 'Internship' 
+                      AND a.application_status IN ('Selected', 'Offer Accepted')),
+                   (SELECT COUNT(*) FROM student_projects p WHERE p.student_id = s.student_id),
+                   (SELECT COUNT(*) FROM student_skills k WHERE k.student_id = s.student_id),
+                   (SELECT COUNT(*) FROM student_applications a WHERE a.student_id = s.student_id),
+                   CURRENT_TIMESTAMP
+            FROM students s
+            WHERE 1=1
+        """
+        params = []
+        
+        if student_ids is not None:
+            if not student_ids:
+                return
+            query += f" AND s.student_id IN ({', '.join('?' * len(student_ids))})"
+            params = list(student_ids)
+        
+        # Assessment scores are set explicitly and are left untouched on refresh
+        query += """
+            ON CONFLICT(student_id) DO UPDATE SET 
+                cgpa = excluded.cgpa, backlogs = excluded.backlogs,
+                internships = excluded.internships, projects = excluded.projects,
+                skill_count = excluded.skill_count, application_count = excluded.application_count,
+                updated_at = excluded.updated_at
+        """
+        conn.execute(query, params)
+    
+    def refresh_student_features(self, student_ids: List[int] = None):
+        """Rebuild the feature rows for some or all students"""
+        with self.get_connection() as conn:
+            self._refresh_student_features(conn, student_ids)
+    
+    def update_student_features(self, student_id: int, **kwargs):
+        """Record assessment scores (aptitude, coding, communication, extracurricular)"""
+        valid_fields = ['aptitude_score', 'coding_score', 'communication_score', 'extracurricular']
+        
+        updates = {k: v for k, v in kwargs.items() if k in valid_fields and v is not None}
+        
+        with self.get_connection() as conn:
+            self._refresh_student_features(conn, [student_id])
+            
+            if updates:
+                set_clause = ', '.join([f"{k} = ?" for k in updates.keys()])
+                values = list(updates.values())
+                values.append(student_id)
+                conn.execute(
+                    f"UPDATE student_features SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE student_id = ?",
+                    values
+                )
+    
+    def get_student_features(self, student_ids: List[int] = None) -> pd.DataFrame:
+        """Get feature rows for the given students (all if None)"""
+        query = "SELECT * FROM student_features"
+        params = []
+        
+        if student_ids is not None:
+            query += f" WHERE student_id IN ({', '.join('?' * len(student_ids))})"
+            params = list(student_ids)
+        
+        with self.get_connection() as conn:
+            return pd.read_sql_query(query, conn, params=params if params else None)
+    
     # === NEP COURSE PLANNING METHODS ===
     
     def save_nep_plan(self, student_id: int, major_subject: str, minor_subject: str = None,
@@ -649,5 +1113,20 @@ class DatabaseManager:
             cursor = conn.execute(f"PRAGMA table_info({table_name})")
             return [dict(row) for row in cursor.fetchall()]
 
-# Singleton instance
-db_manager = DatabaseManager()
+# Singleton instance, created on first use so importing this module never touches the database
+_db_manager = None
+
+
+def get_db_manager() -> DatabaseManager:
+    """The shared DatabaseManager, opening and initializing the database on first call"""
+    global _db_manager
+    if _db_manager is None:
+        _db_manager = DatabaseManager()
+    return _db_manager
+
+
+def __getattr__(name):
+    # Keeps `from database.db_manager import db_manager` working, lazily
+    if name == "db_manager":
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -31,8 +31,10 @@ CREATE TABLE IF NOT EXISTS students (
     placement_status VARCHAR(20) DEFAULT 'Not Placed' CHECK (placement_status IN ('Not Placed', 'Placed', 'Intern', 'Higher Studies')),
     placement_company_id INTEGER,
     placement_package DECIMAL(10,2),
+    college_id INTEGER DEFAULT 1,
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
-    FOREIGN KEY (placement_company_id) REFERENCES companies(company_id)
+    FOREIGN KEY (placement_company_id) REFERENCES companies(company_id),
+    FOREIGN KEY (college_id) REFERENCES colleges(college_id)
 );
 
 -- Student Skills Table
@@ -246,6 +248,45 @@ CREATE TABLE IF NOT EXISTS placements (
     FOREIGN KEY (drive_id) REFERENCES campus_drives(drive_id)
 );
 
+-- Match Results Table (student-company matches with scoring provenance)
+CREATE TABLE IF NOT EXISTS matches (
+    match_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id VARCHAR(32) NOT NULL,
+    college_id INTEGER DEFAULT 1,
+    student_id VARCHAR(20) NOT NULL, -- students.student_id or a college roster id
+    student_name VARCHAR(100),
+    department VARCHAR(50),
+    cgpa DECIMAL(3,2),
+    company_name VARCHAR(100) NOT NULL,
+    recommended_role VARCHAR(100),
+    match_score DECIMAL(5,2) NOT NULL,
+    cgpa_score DECIMAL(5,2),
+    skills_score DECIMAL(5,2),
+    department_score DECIMAL(5,2),
+    backlog_penalty DECIMAL(5,2),
+    reason TEXT,
+    algorithm VARCHAR(50) NOT NULL,
+    algorithm_version VARCHAR(20) NOT NULL,
+    match_mode VARCHAR(30),
+    status VARCHAR(20) DEFAULT 'Recommended' CHECK (status IN ('Recommended', 'Sent', 'Placed', 'Closed')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    notified_at TIMESTAMP,
+    outcome_at TIMESTAMP,
+    FOREIGN KEY (college_id) REFERENCES colleges(college_id)
+);
+
+-- Trend Snapshots Table (finalized periods of a college's yearly/monthly placement trends)
+CREATE TABLE IF NOT EXISTS trend_snapshots (
+    snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    college_id INTEGER DEFAULT 1,
+    series VARCHAR(10) NOT NULL CHECK (series IN ('year', 'month')),
+    period VARCHAR(7) NOT NULL, -- '2023' or '2023-07'
+    metrics TEXT NOT NULL, -- JSON object of the period's values
+    finalized_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (college_id, series, period),
+    FOREIGN KEY (college_id) REFERENCES colleges(college_id)
+);
+
 -- NEP Course Planning Table
 CREATE TABLE IF NOT EXISTS nep_course_plans (
     plan_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -323,6 +364,23 @@ CREATE TABLE IF NOT EXISTS placement_predictions (
     FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE
 );
 
+-- Student Features Table (model inputs, maintained incrementally)
+CREATE TABLE IF NOT EXISTS student_features (
+    student_id INTEGER PRIMARY KEY,
+    cgpa DECIMAL(3,2),
+    backlogs INTEGER DEFAULT 0,
+    internships INTEGER DEFAULT 0,
+    projects INTEGER DEFAULT 0,
+    aptitude_score DECIMAL(5,2),
+    coding_score DECIMAL(5,2),
+    communication_score DECIMAL(5,2),
+    extracurricular INTEGER,
+    skill_count INTEGER DEFAULT 0,
+    application_count INTEGER DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE
+);
+
 -- Chatbot Conversations Table
 CREATE TABLE IF NOT EXISTS chatbot_conversations (
     conversation_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -364,16 +422,19 @@ CREATE TABLE IF NOT EXISTS audit_logs (
 );
 
 -- Indexes for Performance
-CREATE INDEX idx_students_user_id ON students(user_id);
-CREATE INDEX idx_students_department ON students(department);
-CREATE INDEX idx_students_placement_status ON students(placement_status);
-CREATE INDEX idx_jobs_company_id ON job_postings(company_id);
-CREATE INDEX idx_jobs_is_active ON job_postings(is_active);
-CREATE INDEX idx_applications_student_id ON student_applications(student_id);
-CREATE INDEX idx_applications_job_id ON student_applications(job_id);
-CREATE INDEX idx_applications_status ON student_applications(application_status);
-CREATE INDEX idx_interviews_application_id ON interview_rounds(application_id);
-CREATE INDEX idx_drives_college_id ON campus_drives(college_id);
-CREATE INDEX idx_drives_company_id ON campus_drives(company_id);
-CREATE INDEX idx_notifications_user_id ON notifications(user_id);
-CREATE INDEX idx_notifications_is_read ON notifications(is_read);
+CREATE INDEX IF NOT EXISTS idx_students_user_id ON students(user_id);
+CREATE INDEX IF NOT EXISTS idx_students_department ON students(department);
+CREATE INDEX IF NOT EXISTS idx_students_placement_status ON students(placement_status);
+CREATE INDEX IF NOT EXISTS idx_jobs_company_id ON job_postings(company_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_is_active ON job_postings(is_active);
+CREATE INDEX IF NOT EXISTS idx_applications_student_id ON student_applications(student_id);
+CREATE INDEX IF NOT EXISTS idx_applications_job_id ON student_applications(job_id);
+CREATE INDEX IF NOT EXISTS idx_applications_status ON student_applications(application_status);
+CREATE INDEX IF NOT EXISTS idx_interviews_application_id ON interview_rounds(application_id);
+CREATE INDEX IF NOT EXISTS idx_drives_college_id ON campus_drives(college_id);
+CREATE INDEX IF NOT EXISTS idx_drives_company_id ON campus_drives(company_id);
+CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications(user_id);
+CREATE INDEX IF NOT EXISTS idx_notifications_is_read ON notifications(is_read);
+CREATE INDEX IF NOT EXISTS idx_matches_run_id ON matches(run_id);
+CREATE INDEX IF NOT EXISTS idx_matches_student_status ON matches(student_id, status);
+CREATE INDEX IF NOT EXISTS idx_matches_college_id ON matches(college_id, created_at);
@@ -149,6 +149,9 @@ def seed_sample_data():
                     (student_id, job_id, status)
                 )
         
+        # Build feature rows for every seeded student in one pass
+        db._refresh_student_features(conn)
+        
         print("Sample data seeded successfully!")
 
 if __name__ == "__main__":
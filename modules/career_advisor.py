@@ -2,11 +2,32 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from utils.skill_bitset import SkillVocabulary, overlap
+
+# Skills that point a student towards a career path
+CAREER_TRIGGER_SKILLS = {
+    "Data Science": ["Python", "Machine Learning", "Data Analysis"],
+    "Software Development": ["Python", "Java", "JavaScript", "React"]
+}
 
 class CareerAdvisor:
     def __init__(self):
         self.career_paths = self.load_career_paths()
         self.skills_data = self.load_skills_data()
+        
+        # Bitsets for the fixed skill lists, so matching is one AND + popcount
+        self.skill_vocabulary = SkillVocabulary().update(
+            [details['skills'] for details in self.career_paths.values()] +
+            list(CAREER_TRIGGER_SKILLS.values())
+        )
+        self.path_skill_bits = {
+            career: self.skill_vocabulary.encode(details['skills'])
+            for career, details in self.career_paths.items()
+        }
+        self.trigger_skill_bits = {
+            career: self.skill_vocabulary.encode(skills)
+            for career, skills in CAREER_TRIGGER_SKILLS.items()
+        }
     
     def load_career_paths(self):
         """Load career paths data"""
@@ -146,6 +167,8 @@ class CareerAdvisor:
                 
                 st.success("Career Analysis Complete!")
                 
+                student_bits = self.skill_vocabulary.encode(technical_skills)
+                
                 # Display recommendations
                 st.subheader("🎯 Top Career Recommendations")
                 
@@ -167,15 +190,19 @@ class CareerAdvisor:
                             st.write(f"• **Senior:** {details['avg_salary_senior']}")
                         
                         # Skills match
-                        st.write("**Key Skills Required:**")
+                        path_bits = self.path_skill_bits[career]
+                        st.write(f"**Key Skills Required:** "
+                                 f"({overlap(student_bits, path_bits)}/{len(details['skills'])} matched)")
                         for skill in details['skills']:
-                            status = "✅" if skill.lower() in [s.lower() for s in technical_skills] else "📚"
+                            status = "✅" if self.skill_vocabulary.has(student_bits, skill) else "📚"
                             st.write(f"{status} {skill}")
                         
-                        # Action plan
+                        # Action plan focuses on the skill gap
+                        gap = self.skill_vocabulary.missing_skills(path_bits, student_bits)
+                        focus = (gap + [s for s in details['skills'] if s not in gap])[:2]
                         st.write("**Recommended Action Plan:**")
                         st.info(f"""
-                        1. Complete courses in {details['skills'][0]} and {details['skills'][1]}
+                        1. Complete courses in {focus[0]} and {focus[1]}
                         2. Build 2-3 projects demonstrating these skills
                         3. Apply for {details['entry_level'][0]} roles
                         4. Network with professionals in this field
@@ -185,12 +212,13 @@ class CareerAdvisor:
         """Analyze and recommend career paths"""
         # Simple matching logic
         recommendations = {}
+        skill_bits = self.skill_vocabulary.encode(skills)
         
-        if any(skill in ["Python", "Machine Learning", "Data Analysis"] for skill in skills):
+        if overlap(skill_bits, self.trigger_skill_bits["Data Science"]):
             if "Data Analysis" in interests or "Research" in interests:
                 recommendations["Data Science"] = self.career_paths["Data Science"]
         
-        if any(skill in ["Python", "Java", "JavaScript", "React"] for skill in skills):
+        if overlap(skill_bits, self.trigger_skill_bits["Software Development"]):
             if "Coding" in interests or "Design" in interests:
                 recommendations["Software Development"] = self.career_paths["Software Development"]
         
@@ -1,31 +1,170 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+import uuid
 import numpy as np
-from database.db_manager import db_manager
+from database.db_manager import get_db_manager
+from utils.matching_engine import ALGORITHM_VERSION, MatchingEngine
+from utils.incremental_matching import IncrementalMatcher
+from utils.eligibility_index import EligibilityIndex
+from utils.interview_scheduler import DEFAULT_ROUNDS, InterviewScheduler, daily_windows
+from utils.calendar_index import CalendarIndex
+from utils.interview_store import BULK_COLUMNS, RESULT_APPLICATION_STATUS, InterviewStore, read_bulk_csv
+from utils.dataset_service import dataset_service
+from utils.analytics_cube import PLACEMENT_DIMENSIONS, STUDENT_DIMENSIONS, AnalyticsCube
+from utils.report_engine import FORMATS as REPORT_FORMATS, report_engine
+from utils.metrics_store import MetricsStore
+from utils.search_index import SearchIndex
+from utils.figure_cache import figure_cache
+from utils.schema import apply_schema, set_values
+from utils.trend_engine import TrendEngine
+from modules.paginated_list import paginate
+
+# Per college, (dataset version, day, TrendEngine) over the shared dataset
+SHARED_TRENDS = {}
+
+# Student KPI history starts when the session loads its data
+SESSION_DELTA_HELP = "Change since this session's data was loaded"
+
+
+def _delta(value, template):
+    """st.metric delta text, or None to hide it when there is no change to show"""
+    if value is None or abs(value) < 1e-9:
+        return None
+    return template.format(int(value) if "d}" in template else value)
+
+
+def _batches(years):
+    """Graduating batches of a report period as text, e.g. 2022-2024 or 2024"""
+    return f"{years[0]}-{years[-1]}" if len(years) > 1 else str(years[0])
+
+
+def _trend(change):
+    """Arrow for the direction of a change; flat when it is missing or zero"""
+    if change is None or pd.isna(change) or abs(change) < 1e-9:
+        return '→'
+    return '↗️' if change > 0 else '↘️'
+
 
 class CollegeFlow:
-    def __init__(self):
-        self.college_data = self.initialize_college_data()
+    def __init__(self, college_id=1):
+        self.college_data = self.initialize_college_data(college_id)
         self.current_step = 1
     
-    def initialize_college_data(self):
-        """Initialize college data"""
+    def eligibility_index(self):
+        """EligibilityIndex over unplaced students, rebuilt when the students frame changes"""
+        students = self.college_data["students"]
+        if getattr(self, "_indexed_students", None) is not students:
+            self._eligibility_index = EligibilityIndex(students[students["placement_status"] == "Not Placed"])
+            self._indexed_students = students
+        return self._eligibility_index
+    
+    def matcher(self, algorithm):
+        """Session IncrementalMatcher for an algorithm; later changes patch it instead of rebuilding"""
+        if not hasattr(self, "_matchers"):
+            self._matchers = {}
+        if algorithm not in self._matchers:
+            self._matchers[algorithm] = IncrementalMatcher(
+                self.college_data["students"], self.college_data["companies"], algorithm)
+        return self._matchers[algorithm]
+    
+    def calendar(self):
+        """Session CalendarIndex over drives, deadlines and interviews, synced when either changes"""
+        if not hasattr(self, "_calendar"):
+            self._calendar = CalendarIndex()
+        drives, interviews = self.college_data["drives"], self.college_data["interviews"]
+        synced = getattr(self, "_calendar_synced", None)
+        if synced is None or synced[0] is not drives:
+            self._calendar.sync("drives", drives)
+        if synced is None or synced[1] != interviews.version:
+            self._calendar.sync("interviews", interviews.frame)
+        self._calendar_synced = (drives, interviews.version)
+        return self._calendar
+    
+    def analytics_cube(self, name="students"):
+        """AnalyticsCube over the students or placements frame, rebuilt when that frame changes"""
+        if not hasattr(self, "_cubes"):
+            self._cubes = {}
+        frame = self.college_data[name]
+        cached = self._cubes.get(name)
+        if cached is None or cached[0] is not frame:
+            dimensions = STUDENT_DIMENSIONS if name == "students" else PLACEMENT_DIMENSIONS
+            self._cubes[name] = (frame, AnalyticsCube(frame, dimensions))
+        return self._cubes[name][1]
+    
+    def search_index(self):
+        """SearchIndex over students; appended rows are indexed incrementally, other changes rebuild it"""
+        students = self.college_data["students"]
+        indexed = getattr(self, "_searched_students", None)
+        if indexed is not students:
+            appended = (indexed is not None and len(students) > len(indexed) and
+                        students["student_id"].iloc[:len(indexed)].equals(indexed["student_id"]))
+            if appended:
+                self._search_index.add_many(students.iloc[len(indexed):])
+            else:
+                self._search_index = SearchIndex(students)
+            self._searched_students = students
+        return self._search_index
+    
+    def metrics(self):
+        """Session MetricsStore, built once and then kept current by placement and offer events"""
+        if not hasattr(self, "_metrics"):
+            self._metrics = MetricsStore(self.college_data["students"], self.college_data["placements"])
+        return self._metrics
+    
+    def trends(self):
+        """
+        TrendEngine for this session. Until the session changes its
+        students, placements or interviews that is the process-wide engine
+        over the shared dataset, the only one that reads and writes trend
+        snapshots; after that a session engine over its own frames, rebuilt
+        when a frame is replaced or the interviews change.
+        """
+        college_data = self.college_data
+        students, placements = college_data["students"], college_data["placements"]
+        interviews = college_data["interviews"]
+        college_id = college_data["college_id"]
+        if interviews.version == 0 and college_data.changed.isdisjoint(["students", "placements"]):
+            version, today = college_data.version, datetime.now().date()
+            shared = SHARED_TRENDS.get(college_id)
+            if shared is None or shared[:2] != (version, today):
+                db = get_db_manager()
+                engine = TrendEngine(college_data.shared("students"), college_data.shared("placements"),
+                                     college_data.shared("interviews"),
+                                     load=lambda series: db.get_trend_snapshots(college_id, series),
+                                     save=lambda series, frame: db.save_trend_snapshots(college_id, series, frame),
+                                     version=version)
+                SHARED_TRENDS[college_id] = shared = (version, today, engine)
+            return shared[2]
+
+        cached = getattr(self, "_trends", None)
+        if cached is None or cached[0] is not students or cached[1] is not placements or cached[2] != interviews.version:
+            self._trends = (students, placements, interviews.version, TrendEngine(students, placements, interviews.frame))
+        return self._trends[3]
+    
+    def initialize_college_data(self, college_id=1):
+        """Session view of the college's shared dataset, generated once per process"""
+        college_data = dataset_service.session(college_id, self.generate_college_data)
+        college_data["interviews"] = InterviewStore(college_data["interviews"])
+        return college_data
+    
+    def generate_college_data(self, college_id=1):
+        """Generate college data"""
+        college = get_db_manager().get_college(college_id)
         return {
-            "college_id": 1,  # Default college ID
-            "college_name": "ABC Engineering College",
-            "students": self.generate_sample_students(),
+            "college_id": college_id,
+            "college_name": college["college_name"] if college else "ABC Engineering College",
+            "students": self.generate_sample_students(college_id),
             "companies": self.generate_sample_companies(),
             "drives": self.generate_sample_drives(),
             "placements": self.generate_sample_placements(),
             "interviews": self.generate_sample_interviews()
         }
     
-    def generate_sample_students(self):
+    def generate_sample_students(self, college_id=1):
         """Generate sample student data"""
-        np.random.seed(42)
+        np.random.seed(41 + college_id)
         n_students = 150
         
         departments = ["Computer Science", "Electrical Engineering", 
@@ -60,7 +199,21 @@ class CollegeFlow:
             
             data.append(student)
         
-        return pd.DataFrame(data)
+        # Skills use their own generator so the columns above stay reproducible
+        skill_rng = np.random.RandomState(6 + college_id)
+        department_skills = {
+            "Computer Science": ["Python", "Java", "SQL", "Data Structures", "Machine Learning", "AWS", "React"],
+            "Information Technology": ["Python", "Java", "SQL", "React", "Node.js", "AWS", "Docker"],
+            "Electrical Engineering": ["MATLAB", "Embedded C", "Python", "Circuit Design", "PLC"],
+            "Mechanical Engineering": ["AutoCAD", "SolidWorks", "MATLAB", "Python", "ANSYS"],
+            "Civil Engineering": ["AutoCAD", "STAAD Pro", "Revit", "Project Management", "Excel"]
+        }
+        for student in data:
+            pool = department_skills[student["department"]]
+            n_skills = skill_rng.randint(2, len(pool) + 1)
+            student["skills"] = sorted(skill_rng.choice(pool, n_skills, replace=False).tolist())
+        
+        return apply_schema(pd.DataFrame(data), "students")
     
     def generate_sample_companies(self):
         """Generate sample company data"""
@@ -76,7 +229,9 @@ class CollegeFlow:
                 "recruitment_status": "Active",
                 "visits_this_year": 3,
                 "total_hires": 25,
-                "avg_package": 22.5
+                "avg_package": 22.5,
+                "required_skills": ["Python", "Data Structures", "Machine Learning", "SQL"],
+                "preferred_departments": ["Computer Science", "Information Technology"]
             },
             {
                 "company_id": "C002",
@@ -89,7 +244,9 @@ class CollegeFlow:
                 "recruitment_status": "Active",
                 "visits_this_year": 2,
                 "total_hires": 18,
-                "avg_package": 20.0
+                "avg_package": 20.0,
+                "required_skills": ["Java", "Python", "Data Structures", "AWS"],
+                "preferred_departments": ["Computer Science", "Information Technology"]
             },
             {
                 "company_id": "C003",
@@ -102,7 +259,9 @@ class CollegeFlow:
                 "recruitment_status": "Active",
                 "visits_this_year": 2,
                 "total_hires": 15,
-                "avg_package": 18.5
+                "avg_package": 18.5,
+                "required_skills": ["Java", "SQL", "AWS", "Docker"],
+                "preferred_departments": ["Computer Science", "Information Technology", "Electrical Engineering"]
             },
             {
                 "company_id": "C004",
@@ -115,7 +274,9 @@ class CollegeFlow:
                 "recruitment_status": "Active",
                 "visits_this_year": 4,
                 "total_hires": 45,
-                "avg_package": 8.5
+                "avg_package": 8.5,
+                "required_skills": ["Java", "SQL", "Excel"],
+                "preferred_departments": []
             },
             {
                 "company_id": "C005",
@@ -128,7 +289,9 @@ class CollegeFlow:
                 "recruitment_status": "Active",
                 "visits_this_year": 3,
                 "total_hires": 38,
-                "avg_package": 8.0
+                "avg_package": 8.0,
+                "required_skills": ["Python", "SQL", "Project Management"],
+                "preferred_departments": []
             }
         ]
         return pd.DataFrame(companies)
@@ -178,7 +341,7 @@ class CollegeFlow:
             }
             placements.append(placement)
         
-        return pd.DataFrame(placements)
+        return apply_schema(pd.DataFrame(placements), "placements")
     
     def generate_sample_interviews(self):
         """Generate sample interview records"""
@@ -262,7 +425,7 @@ class CollegeFlow:
         # Search and filters
         col1, col2, col3 = st.columns(3)
         with col1:
-            search = st.text_input("🔍 Search by Name/ID")
+            search = st.text_input("🔍 Search by Name/ID/Email/Skill")
         with col2:
             department_filter = st.selectbox("Filter by Department", 
                 ["All"] + list(self.college_data["students"]["department"].unique()))
@@ -270,23 +433,28 @@ class CollegeFlow:
             placement_filter = st.selectbox("Filter by Placement Status", 
                 ["All", "Placed", "Not Placed", "Intern"])
         
-        # Filter data
-        filtered_students = self.college_data["students"].copy()
+        # Filter data (search results come back ranked, best match first)
+        students = self.college_data["students"]
+        search_index = self.search_index()
+        filtered_students = students
         if search:
-            filtered_students = filtered_students[
-                filtered_students["name"].str.contains(search, case=False) |
-                filtered_students["student_id"].str.contains(search, case=False)
-            ]
+            filtered_students = students.iloc[search_index.rows(search_index.search(search))]
         if department_filter != "All":
             filtered_students = filtered_students[filtered_students["department"] == department_filter]
         if placement_filter != "All":
             filtered_students = filtered_students[filtered_students["placement_status"] == placement_filter]
         
-        # Display statistics
-        total_students = len(filtered_students)
-        placed_count = len(filtered_students[filtered_students["placement_status"] == "Placed"])
-        intern_count = len(filtered_students[filtered_students["placement_status"] == "Intern"])
-        placement_rate = (placed_count / total_students * 100) if total_students > 0 else 0
+        # Display statistics (free-text search has no precomputed scope, so it counts the filtered rows)
+        if search:
+            total_students = len(filtered_students)
+            placed_count = int((filtered_students["placement_status"] == "Placed").sum())
+            intern_count = int((filtered_students["placement_status"] == "Intern").sum())
+            placement_rate = (placed_count / total_students * 100) if total_students > 0 else 0
+        else:
+            kpis = self.metrics().student_kpis(None if department_filter == "All" else department_filter,
+                                               None if placement_filter == "All" else placement_filter)
+            total_students, placed_count = kpis["total"], kpis["placed"]
+            intern_count, placement_rate = kpis["interns"], kpis["placement_rate"]
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -323,11 +491,12 @@ class CollegeFlow:
         # Student details view
         if not filtered_students.empty:
             st.subheader("Student Details")
+            names = dict(zip(filtered_students["student_id"], filtered_students["name"]))
             selected_student = st.selectbox("Select Student for Details", 
-                filtered_students["name"].tolist())
+                list(names), format_func=lambda student_id: f"{names[student_id]} ({student_id})")
             
             if selected_student:
-                student_data = filtered_students[filtered_students["name"] == selected_student].iloc[0]
+                student_data = students.iloc[search_index.row(selected_student)]
                 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -353,25 +522,38 @@ class CollegeFlow:
                     st.write(f"**Company:** {student_data['company']}")
                     if student_data['package']:
                         st.write(f"**Package:** ₹{student_data['package']} LPA")
+        
+        # Shared dataset vs per-session copies, for admins sizing the server
+        with st.expander("🧠 Dataset Memory"):
+            report = dataset_service.memory_report()
+            report[["owned_mb", "shared_mb"]] = report[["owned_bytes", "shared_bytes"]] / 2**20
+            st.dataframe(report[["scope", "college_id", "owned_mb", "shared_mb"]].round(2), width='stretch')
+            st.caption("Sessions own only the columns they have modified; the rest stays shared.")
     
     def step2_analytics_dashboard(self):
         """Step 2: Analytics Dashboard"""
         st.info("Comprehensive analytics and insights for placement management")
         
-        # Dashboard with multiple metrics
+        cube = self.analytics_cube("students")
+        metrics = self.metrics()
+        kpis = metrics.student_kpis()
+        
+        # Dashboard with multiple metrics; deltas are changes since this session's data was loaded
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            total_students = len(self.college_data["students"])
-            st.metric("Total Students", total_students, "150")
+            total_students = kpis["total"]
+            st.metric("Total Students", total_students, _delta(metrics.delta("students", "total"), "{:+d}"), help=SESSION_DELTA_HELP)
         with col2:
-            placed = len(self.college_data["students"][self.college_data["students"]["placement_status"] == "Placed"])
-            st.metric("Placed", placed, f"+{placed-40}")
+            placed = kpis["placed"]
+            st.metric("Placed", placed, _delta(metrics.delta("students", "placed"), "{:+d}"), help=SESSION_DELTA_HELP)
         with col3:
-            placement_rate = (placed / total_students * 100) if total_students > 0 else 0
-            st.metric("Placement Rate", f"{placement_rate:.1f}%", "+5.2%")
+            placement_rate = kpis["placement_rate"]
+            st.metric("Placement Rate", f"{placement_rate:.1f}%",
+                      _delta(metrics.delta("students", "placement_rate"), "{:+.1f}%"), help=SESSION_DELTA_HELP)
         with col4:
-            avg_package = self.college_data["students"]["package"].mean()
-            st.metric("Avg Package", f"₹{avg_package:.1f}L", "+2.1L")
+            avg_package = kpis["avg_package"]
+            st.metric("Avg Package", f"₹{avg_package:.1f}L",
+                      _delta(metrics.delta("students", "avg_package"), "{:+.1f}L"), help=SESSION_DELTA_HELP)
         
         # Visualizations
         st.subheader("📈 Placement Analytics")
@@ -380,67 +562,59 @@ class CollegeFlow:
         
         with tab1:
             # Department-wise placement
-            dept_stats = self.college_data["students"].groupby("department").agg({
-                "student_id": "count",
-                "placement_status": lambda x: (x == "Placed").sum()
-            }).reset_index()
-            dept_stats["placement_rate"] = (dept_stats["placement_status"] / dept_stats["student_id"] * 100)
-            
-            fig1 = px.bar(dept_stats, x="department", y="placement_rate",
-                         title="Placement Rate by Department",
-                         color="placement_rate",
-                         color_continuous_scale="Viridis")
+            dept_stats = cube.rate(["department"], {"placement_status": "Placed"}).rename(
+                columns={"rate": "placement_rate"})
+            
+            fig1 = figure_cache.figure("bar", dept_stats, x="department", y="placement_rate",
+                                             title="Placement Rate by Department",
+                                             color="placement_rate",
+                                             color_continuous_scale="Viridis")
             st.plotly_chart(fig1, width='stretch')
             
-            # Department-wise packages
-            dept_packages = self.college_data["students"][self.college_data["students"]["placement_status"] == "Placed"]
+            # Department-wise packages: mean with the min-max range
+            dept_packages = cube.rollup(["department"], {"placement_status": "Placed"})
             if not dept_packages.empty:
-                fig2 = px.box(dept_packages, x="department", y="package",
-                             title="Package Distribution by Department")
+                fig2 = figure_cache.figure("scatter", dept_packages, x="department", y="mean",
+                                                     error_y=dept_packages["max"] - dept_packages["mean"],
+                                                     error_y_minus=dept_packages["mean"] - dept_packages["min"],
+                                                     labels={"mean": "package"},
+                                                     title="Package Range by Department")
                 st.plotly_chart(fig2, width='stretch')
         
         with tab2:
             # Company-wise statistics
-            company_stats = self.college_data["placements"].groupby("company").agg({
-                "placement_id": "count",
-                "package": "mean"
-            }).reset_index().rename(columns={"placement_id": "hires", "package": "avg_package"})
+            company_stats = self.analytics_cube("placements").rollup(["company"]).rename(
+                columns={"count": "hires", "mean": "avg_package"})
             
             col1, col2 = st.columns(2)
             with col1:
-                fig3 = px.bar(company_stats, x="company", y="hires",
-                             title="Hires by Company")
+                fig3 = figure_cache.figure("bar", company_stats, x="company", y="hires",
+                                                 title="Hires by Company")
                 st.plotly_chart(fig3, use_container_width=True)
             
             with col2:
-                fig4 = px.bar(company_stats, x="company", y="avg_package",
-                             title="Average Package by Company")
+                fig4 = figure_cache.figure("bar", company_stats, x="company", y="avg_package",
+                                                 title="Average Package by Company")
                 st.plotly_chart(fig4, use_container_width=True)
         
         with tab3:
-            # Monthly trends (simulated)
-            months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-            placements_trend = [5, 8, 12, 15, 20, 25, 30, 35, 40, 42, 45, 50]
-            interviews_trend = [20, 25, 30, 35, 40, 45, 50, 55, 60, 62, 65, 70]
-            
-            trend_data = pd.DataFrame({
-                'Month': months,
-                'Placements': placements_trend,
-                'Interviews': interviews_trend
+            # Monthly trends from placement and interview dates
+            trend_data = self.trends().series("month").reset_index().rename(columns={
+                'period': 'Month', 'placements': 'Placements', 'interviews': 'Interviews'
             })
             
-            fig5 = px.line(trend_data, x='Month', y=['Placements', 'Interviews'],
-                          title="Monthly Placement Trends",
-                          markers=True)
+            fig5 = figure_cache.figure("line", trend_data, x='Month', y=['Placements', 'Interviews'],
+                                              title="Monthly Placement Trends",
+                                              markers=True)
             st.plotly_chart(fig5, use_container_width=True)
             
             # CGPA vs Package scatter
             placed_students = self.college_data["students"][self.college_data["students"]["placement_status"] == "Placed"]
             if not placed_students.empty:
-                fig6 = px.scatter(placed_students, x="cgpa", y="package",
-                                 color="department",
-                                 title="CGPA vs Package Analysis",
-                                 trendline="ols")
+                fig6 = figure_cache.figure("scatter", placed_students, x="cgpa", y="package",
+                                                     color="department",
+                                                     title="CGPA vs Package Analysis",
+                                                     trendline="ols")
                 st.plotly_chart(fig6, use_container_width=True)
         
         with tab4:
@@ -536,6 +710,8 @@ class CollegeFlow:
                         "Software Engineer, Data Analyst, Product Manager")
                     avg_package = st.number_input("Average Package Offered (LPA)", 0.0, 50.0, 12.0, 1.0)
                 
+                required_skills = st.text_input("Required Skills (comma-separated)", "Python, SQL")
+                
                 if st.form_submit_button("✅ Register Company"):
                     # Generate company ID
                     company_id = f"C{len(self.college_data['companies']) + 100:03d}"
@@ -556,10 +732,13 @@ class CollegeFlow:
                         "avg_package": avg_package,
                         "preferred_departments": ", ".join(preferred_departments) if preferred_departments else "All",
                         "min_cgpa": min_cgpa,
-                        "job_roles": job_roles
+                        "job_roles": job_roles,
+                        "required_skills": [s.strip() for s in required_skills.split(",") if s.strip()]
                     }])
                     
                     self.college_data["companies"] = pd.concat([self.college_data["companies"], new_company], ignore_index=True)
+                    for matcher in getattr(self, "_matchers", {}).values():
+                        matcher.upsert_company(new_company.iloc[0])
                     st.success(f"Company {company_name} registered successfully! Company ID: {company_id}")
                     
                     # Show next steps
@@ -591,7 +770,8 @@ class CollegeFlow:
                 filtered_companies = filtered_companies[filtered_companies["industry"] == industry_filter]
             
             # Display companies
-            for _, company in filtered_companies.iterrows():
+            for company in paginate(filtered_companies, "company_directory",
+                                    reset_on=(search_company, industry_filter)):
                 with st.expander(f"🏢 {company['name']} ({company['industry']})", expanded=False):
                     col1, col2 = st.columns(2)
                     
@@ -647,20 +827,20 @@ class CollegeFlow:
             
             # Industry distribution
             industry_dist = self.college_data["companies"]["industry"].value_counts()
-            fig1 = px.pie(values=industry_dist.values, names=industry_dist.index,
-                         title="Companies by Industry")
+            fig1 = figure_cache.figure("pie", values=industry_dist.values, names=industry_dist.index,
+                                             title="Companies by Industry")
             st.plotly_chart(fig1, use_container_width=True)
             
             # Top hiring companies
             top_companies = self.college_data["companies"].sort_values("total_hires", ascending=False).head(10)
-            fig2 = px.bar(top_companies, x="name", y="total_hires",
-                         title="Top 10 Companies by Hires",
-                         color="total_hires")
+            fig2 = figure_cache.figure("bar", top_companies, x="name", y="total_hires",
+                                             title="Top 10 Companies by Hires",
+                                             color="total_hires")
             st.plotly_chart(fig2, use_container_width=True)
             
             # Package distribution by industry
-            fig3 = px.box(self.college_data["companies"], x="industry", y="avg_package",
-                         title="Package Distribution by Industry")
+            fig3 = figure_cache.figure("box", self.college_data["companies"], x="industry", y="avg_package",
+                                             title="Package Distribution by Industry")
             st.plotly_chart(fig3, use_container_width=True)
     
     def step4_drive_scheduling(self):
@@ -783,16 +963,18 @@ class CollegeFlow:
                         st.write(f"**Venue:** {venue}")
                         st.write(f"**Registration Deadline:** {registration_deadline.strftime('%d %b %Y')}")
                         st.write(f"**Expected Students:** {expected_students}")
+                        st.write(f"**Eligible Students:** {self.eligibility_index().count_for(new_drive.iloc[0])}")
         
         with tab2:
             st.subheader("Upcoming & Active Drives")
             
-            # Filter drives
-            today = datetime.now().strftime("%Y-%m-%d")
-            upcoming_drives = self.college_data["drives"][
-                (self.college_data["drives"]["status"] == "Scheduled") |
-                (self.college_data["drives"]["date"] >= today)
-            ]
+            # Drives from today on, plus overdue ones still marked Scheduled
+            calendar = self.calendar()
+            today = datetime.combine(datetime.now().date(), datetime.min.time())
+            upcoming_drives = [
+                event["data"] for event in calendar.between(None, today, kinds={"drive"})
+                if event["status"] == "Scheduled"
+            ] + [event["data"] for event in calendar.between(today, kinds={"drive"})]
             
             completed_drives = self.college_data["drives"][
                 self.college_data["drives"]["status"] == "Completed"
@@ -800,8 +982,8 @@ class CollegeFlow:
             
             # Display upcoming drives
             st.write(f"**📅 Upcoming Drives ({len(upcoming_drives)})**")
-            if not upcoming_drives.empty:
-                for _, drive in upcoming_drives.sort_values("date").iterrows():
+            if upcoming_drives:
+                for drive in paginate(upcoming_drives, "upcoming_drives"):
                     days_until = (datetime.strptime(drive["date"], "%Y-%m-%d") - datetime.now()).days
                     
                     with st.expander(f"{drive['company']} - {drive['date']} ({days_until} days)", expanded=False):
@@ -819,6 +1001,7 @@ class CollegeFlow:
                             st.write(f"**Deadline:** {drive.get('registration_deadline', 'N/A')}")
                             st.write(f"**Registered:** {drive['registered']}/{drive.get('expected_students', 150)}")
                             st.write(f"**Vacancies:** {drive.get('vacancies', 10)}")
+                            st.write(f"**Eligible Students:** {self.eligibility_index().count_for(drive)}")
                             st.write(f"**Status:** {drive['status']}")
                         
                         # Action buttons
@@ -837,6 +1020,7 @@ class CollegeFlow:
                                     self.college_data["drives"]["drive_id"] == drive['drive_id'], 
                                     'status'
                                 ] = 'Completed'
+                                self._calendar_synced = None
                                 st.success(f"Drive marked as completed!")
                                 st.rerun()
             else:
@@ -848,51 +1032,81 @@ class CollegeFlow:
                 summary_data = completed_drives[['company', 'date', 'registered', 'selected']].copy()
                 summary_data['selection_rate'] = (summary_data['selected'] / summary_data['registered'] * 100).round(1)
                 st.dataframe(summary_data, use_container_width=True)
+            
+            # Campus calendar: range queries over drives, deadlines and interviews
+            st.write("**🗓️ Campus Calendar**")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                calendar_view = st.selectbox("Show", ["This Week", "Next Week", "Today", "Next 30 Days"],
+                                             key="calendar_view")
+            with col2:
+                resource_kind = st.selectbox("For", ["Everyone", "Company", "Student"], key="calendar_resource_kind")
+            with col3:
+                resource = None
+                if resource_kind == "Company":
+                    resource = ("company", st.selectbox("Company", self.college_data["companies"]["name"].tolist(),
+                                                        key="calendar_company"))
+                elif resource_kind == "Student":
+                    resource = ("student", st.selectbox("Student ID", self.college_data["students"]["student_id"].tolist(),
+                                                        key="calendar_student"))
+            
+            start = today
+            if calendar_view == "This Week":
+                start = today - timedelta(days=today.weekday())
+            elif calendar_view == "Next Week":
+                start = today - timedelta(days=today.weekday()) + timedelta(days=7)
+            end = start + timedelta(days={"Today": 1, "Next 30 Days": 30}.get(calendar_view, 7))
+            
+            events = calendar.between(start, end, resource=resource)
+            if events:
+                st.dataframe(calendar.frame(events), width='stretch', hide_index=True)
+            else:
+                st.info("Nothing on the calendar for this period")
+            
+            if resource_kind == "Student":
+                clashes = calendar.overlaps(resource)
+                for first, second in clashes:
+                    st.warning(f"⚠️ Overlap: {first['title']} ({first['start']:%d %b %H:%M}) and "
+                               f"{second['title']} ({second['start']:%d %b %H:%M})")
+            
+            st.download_button(
+                label="📅 Export Calendar (ICS)",
+                data=calendar.to_ics(events, name=f"{self.college_data['college_name']} - {calendar_view}"),
+                file_name=f"campus_calendar_{start.strftime('%Y%m%d')}.ics",
+                mime="text/calendar"
+            )
         
         with tab3:
             st.subheader("Drive Analytics")
             
+            # Counters are maintained by the calendar index as drives change
+            drive_stats = self.calendar().drive_stats()
+            
             # Drive statistics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                total_drives = len(self.college_data["drives"])
-                st.metric("Total Drives", total_drives)
+                st.metric("Total Drives", int(drive_stats["drives"].sum()))
             with col2:
-                completed = len(self.college_data["drives"][self.college_data["drives"]["status"] == "Completed"])
-                st.metric("Completed", completed)
+                st.metric("Completed", int(drive_stats["completed"].sum()))
             with col3:
-                total_registered = self.college_data["drives"]["registered"].sum()
-                st.metric("Total Registered", total_registered)
+                st.metric("Total Registered", int(drive_stats["registered"].sum()))
             with col4:
-                total_selected = self.college_data["drives"]["selected"].sum()
-                st.metric("Total Selected", total_selected)
+                st.metric("Total Selected", int(drive_stats["selected"].sum()))
             
             # Selection rate by company
-            if not self.college_data["drives"].empty:
-                drive_stats = self.college_data["drives"].groupby("company").agg({
-                    "drive_id": "count",
-                    "registered": "sum",
-                    "selected": "sum"
-                }).reset_index()
-                drive_stats["selection_rate"] = (drive_stats["selected"] / drive_stats["registered"] * 100).round(1)
-                
-                fig1 = px.bar(drive_stats, x="company", y="selection_rate",
-                             title="Selection Rate by Company",
-                             color="selection_rate")
+            if not drive_stats.empty:
+                fig1 = figure_cache.figure("bar", drive_stats, x="company", y="selection_rate",
+                                                 title="Selection Rate by Company",
+                                                 color="selection_rate")
                 st.plotly_chart(fig1, use_container_width=True)
             
             # Monthly drive trend
-            months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-            drives_per_month = [2, 3, 4, 3, 5, 4, 2, 1, 3, 4, 5, 3]  # Sample data
+            trend_data = self.calendar().monthly_counts("drive").reset_index()
+            trend_data.columns = ['Month', 'Drives']
             
-            trend_data = pd.DataFrame({
-                'Month': months,
-                'Drives': drives_per_month
-            })
-            
-            fig2 = px.line(trend_data, x='Month', y='Drives',
-                          title="Monthly Drive Trend",
-                          markers=True)
+            fig2 = figure_cache.figure("line", trend_data, x='Month', y='Drives',
+                                              title="Monthly Drive Trend",
+                                              markers=True)
             st.plotly_chart(fig2, use_container_width=True)
     
     def step5_student_company_matching(self):
@@ -911,6 +1125,12 @@ class CollegeFlow:
                     ["Skills-based", "CGPA-weighted", "Hybrid (Skills + CGPA)", "Company-specific"])
                 
                 min_match_score = st.slider("Minimum Match Score", 0, 100, 70)
+                
+                matching_mode = st.radio("Matching Mode",
+                    ["Top matches per student", "Optimal assignment (respects vacancies)"])
+                
+                if matching_mode == "Top matches per student":
+                    matches_per_student = st.number_input("Matches per Student", 1, 20, 3)
             
             with col2:
                 companies_to_match = st.multiselect("Select Companies to Match",
@@ -922,14 +1142,26 @@ class CollegeFlow:
                      "Civil Engineering", "Information Technology", "All"],
                     default=["Computer Science", "Information Technology"])
             
+            if matching_mode != "Top matches per student":
+                # Vacancies come from each company's scheduled drives and can be adjusted here
+                drives = self.college_data["drives"]
+                scheduled = drives[drives["status"] == "Scheduled"]
+                drive_vacancies = scheduled.get("vacancies", pd.Series(10, index=scheduled.index)).fillna(10)
+                vacancies = drive_vacancies.groupby(scheduled["company"]).sum()
+                
+                st.write("**Vacancies per Company:**")
+                capacity_df = st.data_editor(
+                    pd.DataFrame({
+                        "company": companies_to_match,
+                        "vacancies": [int(vacancies.get(c, 0)) for c in companies_to_match]
+                    }),
+                    disabled=["company"],
+                    hide_index=True,
+                    key="matching_vacancies"
+                )
+            
             if st.button("🔍 Run AI Matching", type="primary", width='stretch'):
                 with st.spinner("Running AI matching algorithm..."):
-                    # Simulate AI matching
-                    import time
-                    time.sleep(2)
-                    
-                    # Generate sample matches
-                    matches = []
                     students = self.college_data["students"][
                         self.college_data["students"]["placement_status"] == "Not Placed"
                     ]
@@ -937,53 +1169,87 @@ class CollegeFlow:
                     if departments_to_include and "All" not in departments_to_include:
                         students = students[students["department"].isin(departments_to_include)]
                     
-                    for _, student in students.head(20).iterrows():
-                        for company in companies_to_match[:3]:
-                            # Calculate match score (simplified)
-                            cgpa_score = min(student["cgpa"] * 10, 30)  # Max 30 points for CGPA
-                            skills_score = 40  # Assuming average skills
-                            department_match = 20 if student["department"] in ["Computer Science", "IT"] else 15
-                            backlogs_penalty = student["backlogs"] * 5
-                            
-                            match_score = cgpa_score + skills_score + department_match - backlogs_penalty
-                            match_score = min(100, max(0, match_score))
-                            
-                            if match_score >= min_match_score:
-                                matches.append({
-                                    "student_id": student["student_id"],
-                                    "student_name": student["name"],
-                                    "department": student["department"],
-                                    "cgpa": student["cgpa"],
-                                    "company": company,
-                                    "match_score": match_score,
-                                    "recommended_role": "Software Engineer" if student["department"] in ["CS", "IT"] else "Engineer",
-                                    "reason": f"Strong {student['department']} background with CGPA {student['cgpa']}"
-                                })
+                    companies = self.college_data["companies"][
+                        self.college_data["companies"]["name"].isin(companies_to_match)
+                    ]
                     
-                    matches_df = pd.DataFrame(matches)
+                    # Scores come from the session matcher, which is patched as companies register
+                    # and students are placed rather than recomputed on every run
+                    matcher = self.matcher(match_algorithm)
                     
-                    if not matches_df.empty:
-                        st.success(f"Found {len(matches_df)} potential matches!")
-                        
-                        # Display matches
-                        st.subheader("Top Matches")
-                        matches_df = matches_df.sort_values("match_score", ascending=False)
-                        st.dataframe(matches_df, use_container_width=True)
-                        
-                        # Export matches
-                        csv = matches_df.to_csv(index=False)
-                        st.download_button(
-                            label="📥 Download Matches",
-                            data=csv,
-                            file_name=f"student_matches_{datetime.now().strftime('%Y%m%d')}.csv",
-                            mime="text/csv"
-                        )
-                        
-                        # Send recommendations
-                        if st.button("📧 Send Recommendations to Students"):
-                            st.success("Recommendations sent to students!")
+                    if matching_mode == "Top matches per student":
+                        matches_df = matcher.top_matches(min_score=min_match_score, top_k=matches_per_student,
+                                                         student_ids=students["student_id"],
+                                                         companies=companies_to_match)
                     else:
-                        st.warning("No matches found with current criteria")
+                        engine = MatchingEngine(students, companies, match_algorithm)
+                        capacities = capacity_df.set_index("company")["vacancies"].reindex(
+                            engine.companies["name"]).fillna(0).astype(int).to_numpy()
+                        matches_df, assignment = engine.assign(
+                            capacities, min_score=min_match_score,
+                            scores=matcher.score_block(students["student_id"], engine.companies["name"]))
+                        
+                        col1, col2, col3, col4 = st.columns(4)
+                        with col1:
+                            st.metric("Students Assigned", f"{len(matches_df)} / {len(students)}")
+                        with col2:
+                            st.metric("Vacancies Filled", f"{len(matches_df)} / {int(capacities.sum())}")
+                        with col3:
+                            st.metric("Avg Match Score",
+                                      f"{assignment['scores'].mean():.1f}" if len(matches_df) else "-")
+                        with col4:
+                            st.metric("Solve Time", f"{assignment['solve_time_ms']:.0f} ms",
+                                      help=f"Method: {assignment['method']}")
+                    
+                    # Persist the run so results, sending and analytics survive reruns
+                    run_id = uuid.uuid4().hex
+                    if not matches_df.empty:
+                        components = MatchingEngine(self.college_data["students"], self.college_data["companies"],
+                                                    match_algorithm).components_for(matches_df)
+                        get_db_manager().save_matches(pd.concat([matches_df, components], axis=1), run_id,
+                                                match_algorithm, ALGORITHM_VERSION,
+                                                college_id=self.college_data["college_id"],
+                                                match_mode=matching_mode)
+                    st.session_state.match_run_id = run_id
+            
+            run_id = st.session_state.get("match_run_id")
+            if run_id:
+                saved = get_db_manager().get_matches(run_id=run_id)
+                
+                if not saved.empty:
+                    st.success(f"Found {len(saved)} potential matches!")
+                    st.caption(f"Run {run_id[:8]} · {saved['algorithm'].iloc[0]} "
+                               f"v{saved['algorithm_version'].iloc[0]} · {saved['created_at'].iloc[0]}")
+                    
+                    # Display matches
+                    st.subheader("Top Matches")
+                    matches_df = saved[["student_id", "student_name", "department", "cgpa", "company_name",
+                                        "match_score", "recommended_role", "reason", "status"]].rename(
+                        columns={"company_name": "company"})
+                    st.dataframe(matches_df, use_container_width=True)
+                    
+                    with st.expander("Score Breakdown"):
+                        st.dataframe(saved[["student_name", "company_name", "match_score", "cgpa_score",
+                                            "skills_score", "department_score", "backlog_penalty"]],
+                                     use_container_width=True)
+                    
+                    # Export matches
+                    csv = matches_df.to_csv(index=False)
+                    st.download_button(
+                        label="📥 Download Matches",
+                        data=csv,
+                        file_name=f"student_matches_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv"
+                    )
+                    
+                    # Send recommendations
+                    pending = int((saved["status"] == "Recommended").sum())
+                    if st.button("📧 Send Recommendations to Students", disabled=pending == 0):
+                        sent = get_db_manager().mark_matches_sent(run_id)
+                        st.success(f"Recommendations sent for {sent} matches!")
+                        st.rerun()
+                else:
+                    st.warning("No matches found with current criteria")
         
         with tab2:
             st.subheader("Manual Student-Company Matching")
@@ -1036,48 +1302,46 @@ class CollegeFlow:
         with tab3:
             st.subheader("Matching Analytics")
             
+            analytics = get_db_manager().get_match_analytics(self.college_data["college_id"])
+            
             # Match success rate
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Total Matches Made", "127")
+                st.metric("Total Matches Made", analytics["total_matches"],
+                          help=f"{analytics['matched_students']} students")
             with col2:
-                st.metric("Match Success Rate", "68%")
+                st.metric("Match Success Rate", f"{analytics['success_rate']:.0f}%",
+                          help="Matched students placed with a company they were matched to")
             with col3:
-                st.metric("Avg Time to Match", "14 days")
-            
-            # Department-wise match success
-            dept_data = {
-                'Department': ['CS', 'IT', 'EE', 'ME', 'CE'],
-                'Matches': [45, 38, 22, 15, 7],
-                'Success Rate': [75, 70, 65, 60, 55]
-            }
-            
-            dept_df = pd.DataFrame(dept_data)
-            
-            fig1 = px.bar(dept_df, x='Department', y='Success Rate',
-                         title="Match Success Rate by Department",
-                         color='Success Rate')
-            st.plotly_chart(fig1, use_container_width=True)
+                days = analytics["avg_days_to_match"]
+                st.metric("Avg Time to Match", "-" if days is None else f"{days:.0f} days")
             
-            # Company-wise matches
-            company_data = {
-                'Company': ['Google', 'Microsoft', 'Amazon', 'TCS', 'Infosys'],
-                'Matches': [25, 22, 20, 35, 25],
-                'Acceptance Rate': [85, 82, 80, 75, 78]
-            }
-            
-            company_df = pd.DataFrame(company_data)
-            
-            fig2 = px.scatter(company_df, x='Matches', y='Acceptance Rate',
-                             size='Acceptance Rate', color='Company',
-                             title="Company-wise Match Performance")
-            st.plotly_chart(fig2, use_container_width=True)
+            if analytics["total_matches"] == 0:
+                st.info("No matches recorded yet. Run AI Matching to start tracking outcomes.")
+            else:
+                # Department-wise match success
+                fig1 = figure_cache.figure("bar", analytics["by_department"], x='department', y='success_rate',
+                                                 title="Match Success Rate by Department",
+                                                 labels={'department': 'Department', 'success_rate': 'Success Rate'},
+                                                 hover_data=['matches', 'placed'],
+                                                 color='success_rate')
+                st.plotly_chart(fig1, use_container_width=True)
+                
+                # Company-wise matches
+                fig2 = figure_cache.figure("scatter", analytics["by_company"], x='matches', y='success_rate',
+                                                     size='students', color='company',
+                                                     labels={'matches': 'Matches', 'success_rate': 'Success Rate'},
+                                                     hover_data=['placed', 'avg_score'],
+                                                     title="Company-wise Match Performance")
+                st.plotly_chart(fig2, use_container_width=True)
     
     def step6_interview_management(self):
         """Step 6: Interview Management"""
         st.info("Schedule and track student interviews")
         
-        tab1, tab2, tab3 = st.tabs(["📅 Schedule Interview", "📋 Interview Calendar", "📊 Interview Analytics"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["📅 Schedule Interview", "🗓️ Auto Scheduler",
+                                                "📋 Interview Calendar", "📊 Interview Analytics",
+                                                "📦 Bulk Operations"])
         
         with tab1:
             st.subheader("Schedule New Interview")
@@ -1113,6 +1377,8 @@ class CollegeFlow:
                     
                     interview_time = st.time_input("Interview Time*", datetime.strptime("10:00", "%H:%M"))
                     
+                    duration = st.number_input("Duration (minutes)*", 15, 240, 60, 15)
+                    
                     interview_mode = st.selectbox("Interview Mode*",
                         ["Online", "Offline", "Phone"])
                 
@@ -1131,22 +1397,32 @@ class CollegeFlow:
                 job_role = st.text_input("Job Role", "Software Engineer")
                 notes = st.text_area("Additional Notes", placeholder="Any special instructions...")
                 
-                if st.form_submit_button("✅ Schedule Interview"):
-                    # Generate interview ID
-                    interview_id = f"I{len(self.college_data['interviews']) + 1000:04d}"
-                    
+                submitted = st.form_submit_button("✅ Schedule Interview")
+                
+                # Refuse double bookings of the student, interviewer or venue
+                conflicts = []
+                if submitted:
+                    start = datetime.combine(interview_date, interview_time)
+                    conflicts = InterviewScheduler(self.college_data["interviews"].frame).conflicts(
+                        student_id, start, start + timedelta(minutes=duration),
+                        interviewer=interviewer_name, venue=venue if interview_mode == "Offline" else None)
+                    for kind, name, busy_start, busy_end in conflicts:
+                        st.error(f"{kind.title()} {name} is already booked "
+                                 f"{busy_start.strftime('%d %b %H:%M')}–{busy_end.strftime('%H:%M')}")
+                
+                if submitted and not conflicts:
                     # Get student name
                     student_name = selected_student.split("(")[0].strip()
                     
-                    # Add to interviews dataframe
-                    new_interview = pd.DataFrame([{
-                        "interview_id": interview_id,
+                    # Add to the interviews store
+                    interview_id = self.college_data["interviews"].add({
                         "student_id": student_id,
                         "student_name": student_name,
                         "company": company,
                         "round": interview_round,
                         "date": interview_date.strftime("%Y-%m-%d"),
                         "time": interview_time.strftime("%H:%M"),
+                        "duration": float(duration),
                         "mode": interview_mode,
                         "meeting_link": meeting_link if interview_mode in ["Online", "Phone"] else "",
                         "venue": venue if interview_mode == "Offline" else "",
@@ -1156,12 +1432,7 @@ class CollegeFlow:
                         "status": "Scheduled",
                         "result": "Pending",
                         "notes": notes
-                    }])
-                    
-                    self.college_data["interviews"] = pd.concat(
-                        [self.college_data["interviews"], new_interview], 
-                        ignore_index=True
-                    )
+                    })
                     
                     st.success(f"✅ Interview scheduled for {student_name} with {company}!")
                     
@@ -1182,6 +1453,103 @@ class CollegeFlow:
                             st.write(f"**Link:** {meeting_link}")
         
         with tab2:
+            st.subheader("Auto-Schedule a Drive Day")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                auto_company = st.selectbox("Company", self.college_data["companies"]["name"].tolist(),
+                                            key="auto_company")
+                auto_role = st.text_input("Job Role", "Software Engineer", key="auto_role")
+                
+                candidates = self.college_data["students"][
+                    self.college_data["students"]["placement_status"].isin(["Not Placed", "Intern"])
+                ]
+                departments = st.multiselect("Candidate Departments",
+                    sorted(candidates["department"].unique()),
+                    default=sorted(candidates["department"].unique()), key="auto_departments")
+                candidates = candidates[candidates["department"].isin(departments)]
+                st.caption(f"{len(candidates)} candidates")
+            
+            with col2:
+                first_day = st.date_input("First Day", datetime.now().date() + timedelta(days=7), key="auto_first_day")
+                last_day = st.date_input("Last Day", first_day, key="auto_last_day")
+                day_start, day_end = st.select_slider("Daily Hours",
+                    [f"{h:02d}:00" for h in range(7, 22)], value=("09:00", "18:00"), key="auto_hours")
+                lunch_break = st.checkbox("Lunch break 13:00–14:00", True, key="auto_lunch")
+                gap_minutes = st.number_input("Gap between a student's rounds (minutes)", 0, 120, 15, 5,
+                                              key="auto_gap")
+            
+            st.write("**Rounds (in order):**")
+            rounds_df = st.data_editor(
+                pd.DataFrame(DEFAULT_ROUNDS, columns=["round", "minutes"]),
+                num_rows="dynamic", hide_index=True, key="auto_rounds"
+            )
+            
+            st.write("**Interview Panels:**")
+            panels_df = st.data_editor(
+                pd.DataFrame({
+                    "name": [f"Panel {i}" for i in range(1, 7)] + ["HR Panel 1", "HR Panel 2"],
+                    "rounds": [""] * 6 + ["HR Round"] * 2,
+                    "venue": [f"Room {100 + i}" for i in range(1, 7)] + ["", ""]
+                }),
+                num_rows="dynamic", hide_index=True, key="auto_panels"
+            )
+            st.caption("Leave rounds empty for a panel that takes every round, and venue empty for online panels")
+            
+            if st.button("🗓️ Generate Timetable", type="primary", width='stretch'):
+                with st.spinner("Building conflict-free timetable..."):
+                    panels = [
+                        {"name": p["name"], "venue": p["venue"],
+                         "rounds": [r.strip() for r in str(p["rounds"] or "").split(",") if r.strip()]}
+                        for p in panels_df.fillna("").to_dict("records")
+                    ]
+                    rounds = [(r["round"], r["minutes"]) for r in rounds_df.dropna().to_dict("records")]
+                    windows = daily_windows(first_day, last_day, day_start, day_end,
+                                            *(("13:00", "14:00") if lunch_break else (None, None)))
+                    
+                    # Seeded with existing interviews, so no one is double-booked against them either
+                    timetable, unscheduled, stats = InterviewScheduler(self.college_data["interviews"].frame).schedule(
+                        candidates.rename(columns={"name": "student_name"})[["student_id", "student_name"]],
+                        rounds, panels, windows, gap_minutes=gap_minutes,
+                        company=auto_company, job_role=auto_role)
+                    st.session_state.auto_timetable = (timetable, unscheduled, stats)
+            
+            if "auto_timetable" in st.session_state:
+                timetable, unscheduled, stats = st.session_state.auto_timetable
+                
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Interviews Scheduled", stats["scheduled"])
+                with col2:
+                    st.metric("Could Not Fit", stats["unscheduled"])
+                with col3:
+                    st.metric("Last Interview Ends",
+                              stats["last_end"].strftime("%d %b %H:%M") if stats["last_end"] is not None else "-")
+                with col4:
+                    st.metric("Solve Time", f"{stats['solve_time_ms']:.0f} ms")
+                
+                if not timetable.empty:
+                    st.dataframe(timetable.drop(columns=["status", "result"]), width='stretch', height=400)
+                if not unscheduled.empty:
+                    with st.expander(f"⚠️ {len(unscheduled)} rounds not scheduled"):
+                        st.dataframe(unscheduled, width='stretch')
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("✅ Save to Interview Calendar", disabled=timetable.empty, width='stretch'):
+                        # One batch append to the interviews store
+                        self.college_data["interviews"].add_many(timetable.drop(columns=["end_time"]))
+                        del st.session_state.auto_timetable
+                        st.success(f"✅ {len(timetable)} interviews added to the calendar!")
+                with col2:
+                    st.download_button(
+                        label="📥 Download Timetable",
+                        data=timetable.to_csv(index=False),
+                        file_name=f"interview_timetable_{auto_company}_{first_day.strftime('%Y%m%d')}.csv",
+                        mime="text/csv"
+                    )
+        
+        with tab3:
             st.subheader("Interview Calendar")
             
             # Filter options
@@ -1194,7 +1562,7 @@ class CollegeFlow:
                 company_filter = st.selectbox("Company", ["All"] + self.college_data["companies"]["name"].tolist())
             
             # Filter interviews
-            filtered_interviews = self.college_data["interviews"].copy()
+            filtered_interviews = self.college_data["interviews"].frame.copy()
             
             if status_filter != "All":
                 filtered_interviews = filtered_interviews[filtered_interviews["status"] == status_filter]
@@ -1224,7 +1592,8 @@ class CollegeFlow:
             if not filtered_interviews.empty:
                 st.write(f"**Found {len(filtered_interviews)} interviews**")
                 
-                for _, interview in filtered_interviews.sort_values(["date", "time"]).iterrows():
+                for interview in paginate(filtered_interviews.sort_values(["date", "time"]), "interview_list",
+                                          reset_on=(view_type, status_filter, company_filter)):
                     # Determine status color
                     status_color = {
                         "Scheduled": "🟡",
@@ -1257,10 +1626,9 @@ class CollegeFlow:
                         col1, col2, col3 = st.columns(3)
                         with col1:
                             if interview['status'] == 'Scheduled' and st.button("✅ Mark Complete", key=f"complete_{interview['interview_id']}", width='stretch'):
-                                self.college_data["interviews"].loc[
-                                    self.college_data["interviews"]["interview_id"] == interview['interview_id'],
-                                    'status'
-                                ] = 'Completed'
+                                self.college_data["interviews"].update(pd.DataFrame({
+                                    "interview_id": [interview['interview_id']], "status": ["Completed"]
+                                }))
                                 st.rerun()
                         
                         with col2:
@@ -1275,8 +1643,9 @@ class CollegeFlow:
             
             # Quick statistics
             st.subheader("Today's Summary")
-            today_interviews = self.college_data["interviews"][
-                self.college_data["interviews"]["date"] == today.strftime("%Y-%m-%d")
+            interviews = self.college_data["interviews"].frame
+            today_interviews = interviews[
+                interviews["date"] == today.strftime("%Y-%m-%d")
             ]
             
             if not today_interviews.empty:
@@ -1293,22 +1662,24 @@ class CollegeFlow:
                     selected = len(today_interviews[today_interviews["result"] == "Selected"])
                     st.metric("Selected", selected)
         
-        with tab3:
+        with tab4:
             st.subheader("Interview Analytics")
             
+            interviews = self.college_data["interviews"].frame
+            
             # Overall statistics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                total_interviews = len(self.college_data["interviews"])
+                total_interviews = len(interviews)
                 st.metric("Total Interviews", total_interviews)
             with col2:
-                completion_rate = (len(self.college_data["interviews"][
-                    self.college_data["interviews"]["status"] == "Completed"
+                completion_rate = (len(interviews[
+                    interviews["status"] == "Completed"
                 ]) / total_interviews * 100) if total_interviews > 0 else 0
                 st.metric("Completion Rate", f"{completion_rate:.1f}%")
             with col3:
-                selection_rate = (len(self.college_data["interviews"][
-                    self.college_data["interviews"]["result"] == "Selected"
+                selection_rate = (len(interviews[
+                    interviews["result"] == "Selected"
                 ]) / total_interviews * 100) if total_interviews > 0 else 0
                 st.metric("Selection Rate", f"{selection_rate:.1f}%")
             with col4:
@@ -1316,8 +1687,8 @@ class CollegeFlow:
                 st.metric("Per Student", f"{avg_interviews_per_student:.1f}%")
             
             # Company-wise interview performance
-            if not self.college_data["interviews"].empty:
-                company_stats = self.college_data["interviews"].groupby("company").agg({
+            if not interviews.empty:
+                company_stats = interviews.groupby("company").agg({
                     "interview_id": "count",
                     "result": lambda x: (x == "Selected").sum()
                 }).reset_index()
@@ -1327,9 +1698,9 @@ class CollegeFlow:
                 })
                 company_stats["selection_rate"] = (company_stats["selected"] / company_stats["total_interviews"] * 100).round(1)
                 
-                fig1 = px.bar(company_stats, x="company", y="selection_rate",
-                             title="Selection Rate by Company",
-                             color="selection_rate")
+                fig1 = figure_cache.figure("bar", company_stats, x="company", y="selection_rate",
+                                                 title="Selection Rate by Company",
+                                                 color="selection_rate")
                 st.plotly_chart(fig1, use_container_width=True)
             
             # Interview round success rate
@@ -1341,11 +1712,88 @@ class CollegeFlow:
             
             round_df = pd.DataFrame(round_data)
             
-            fig2 = px.scatter(round_df, x='Success Rate', y='Avg Duration',
-                             size='Success Rate', color='Round',
-                             title="Interview Round Analysis")
+            fig2 = figure_cache.figure("scatter", round_df, x='Success Rate', y='Avg Duration',
+                                                 size='Success Rate', color='Round',
+                                                 title="Interview Round Analysis")
             st.plotly_chart(fig2, use_container_width=True)
     
+        with tab5:
+            st.subheader("Bulk Interview Operations")
+            store = self.college_data["interviews"]
+            
+            # CSV upload: schedule, reschedule or record results for many interviews at once
+            st.write("**From CSV:**")
+            col1, col2 = st.columns([1, 2])
+            with col1:
+                bulk_action = st.radio("Action", ["schedule", "reschedule", "results"],
+                    format_func={"schedule": "Schedule new", "reschedule": "Reschedule",
+                                 "results": "Record results"}.get, key="bulk_action")
+                st.download_button(
+                    label="📄 CSV Template",
+                    data=",".join(BULK_COLUMNS[bulk_action]) + "\n",
+                    file_name=f"interviews_{bulk_action}_template.csv",
+                    mime="text/csv"
+                )
+            with col2:
+                bulk_file = st.file_uploader("Upload CSV", type=["csv"], key=f"bulk_file_{bulk_action}")
+            
+            if bulk_file is not None:
+                try:
+                    bulk_rows = read_bulk_csv(bulk_file, bulk_action)
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    st.dataframe(bulk_rows.head(20), width='stretch')
+                    st.caption(f"{len(bulk_rows)} rows")
+                    
+                    if st.button(f"✅ Apply to {len(bulk_rows)} Interviews", type="primary", key="bulk_apply"):
+                        if bulk_action == "schedule":
+                            ids, rejected = store.schedule(bulk_rows)
+                            st.success(f"Scheduled {len(ids)} interviews")
+                            if rejected:
+                                st.warning(f"{len(rejected)} not scheduled")
+                                st.dataframe(pd.DataFrame(rejected, columns=["row", "reason"]), width='stretch')
+                        elif bulk_action == "reschedule":
+                            moved, rejected = store.reschedule(bulk_rows)
+                            st.success(f"Rescheduled {len(moved)} interviews")
+                            if rejected:
+                                st.warning(f"{len(rejected)} not moved")
+                                st.dataframe(pd.DataFrame(rejected, columns=["interview_id", "reason"]), width='stretch')
+                        else:
+                            unknown, applications = store.record_results(bulk_rows)
+                            st.success(f"Recorded {len(bulk_rows) - len(unknown)} results, "
+                                       f"updated {applications} applications")
+                            if unknown:
+                                st.warning(f"Unknown interview IDs: {', '.join(map(str, unknown))}")
+            
+            # Selection grid: edit dates, times and results in place, then apply in bulk
+            st.write("**From the Interview Grid:**")
+            grid_columns = ["interview_id", "student_name", "company", "round", "date", "time", "result"]
+            interviews = store.frame
+            grid = interviews[interviews["status"] == "Scheduled"].reindex(columns=grid_columns)
+            
+            edited = st.data_editor(
+                grid,
+                disabled=["interview_id", "student_name", "company", "round"],
+                column_config={
+                    "result": st.column_config.SelectboxColumn(
+                        "result", options=list(RESULT_APPLICATION_STATUS))
+                },
+                hide_index=True, width='stretch', height=350, key="interview_grid"
+            )
+            
+            if st.button("💾 Apply Grid Changes", key="apply_grid"):
+                moved_mask = (edited["date"] != grid["date"]) | (edited["time"] != grid["time"])
+                result_mask = (edited["result"] != grid["result"]) & (edited["result"] != "Pending")
+                
+                moved, rejected = store.reschedule(edited.loc[moved_mask, ["interview_id", "date", "time"]])
+                unknown, applications = store.record_results(edited.loc[result_mask, ["interview_id", "result"]])
+                
+                st.success(f"Rescheduled {len(moved)}, recorded {int(result_mask.sum()) - len(unknown)} results, "
+                           f"updated {applications} applications")
+                for interview_id, reason in rejected:
+                    st.warning(f"{interview_id} not moved: {reason}")
+    
     def step7_placement_records(self):
         """Step 7: Placement Records Management"""
         st.info("Manage and track all placement records")
@@ -1378,21 +1826,34 @@ class CollegeFlow:
             if company_filter != "All":
                 filtered_placements = filtered_placements[filtered_placements["company"] == company_filter]
             
-            # Display statistics
-            total_placements = len(filtered_placements)
-            total_package = filtered_placements["package"].sum()
-            avg_package = filtered_placements["package"].mean() if total_placements > 0 else 0
-            max_package = filtered_placements["package"].max() if total_placements > 0 else 0
+            # Display statistics (free-text search has no precomputed scope, so it sums the filtered rows)
+            metrics = self.metrics()
+            if search_record:
+                total_placements = len(filtered_placements)
+                total_package = filtered_placements["package"].sum()
+                avg_package = filtered_placements["package"].mean() if total_placements > 0 else 0
+                max_package = filtered_placements["package"].max() if total_placements > 0 else 0
+            else:
+                kpis = metrics.placement_kpis(None if department_filter == "All" else department_filter,
+                                              None if company_filter == "All" else company_filter)
+                total_placements, total_package = kpis["placements"], kpis["total_package"]
+                avg_package, max_package = kpis["avg_package"], kpis["max_package"]
+            # Trends are for the unfiltered totals over the last 30 days of placement history
+            trend = not search_record and department_filter == "All" and company_filter == "All"
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("Total Placements", total_placements)
+                st.metric("Total Placements", total_placements,
+                          _delta(metrics.delta("placements", "placements", days=30), "{:+d}") if trend else None)
             with col2:
-                st.metric("Total Package", f"₹{total_package:.1f}L")
+                st.metric("Total Package", f"₹{total_package:.1f}L",
+                          _delta(metrics.delta("placements", "total_package", days=30), "{:+.1f}L") if trend else None)
             with col3:
-                st.metric("Avg Package", f"₹{avg_package:.1f}L")
+                st.metric("Avg Package", f"₹{avg_package:.1f}L",
+                          _delta(metrics.delta("placements", "avg_package", days=30), "{:+.1f}L") if trend else None)
             with col4:
-                st.metric("Max Package", f"₹{max_package:.1f}L")
+                st.metric("Max Package", f"₹{max_package:.1f}L",
+                          _delta(metrics.delta("placements", "max_package", days=30), "{:+.1f}L") if trend else None)
             
             # Display placement records
             st.subheader("Placement Details")
@@ -1451,10 +1912,12 @@ class CollegeFlow:
                             "status": status
                         }])
                         
-                        self.college_data["placements"] = pd.concat(
+                        self.college_data["placements"] = apply_schema(pd.concat(
                             [self.college_data["placements"], new_placement], 
                             ignore_index=True
-                        )
+                        ), "placements")
+                        self.metrics().placement_recorded(new_placement.iloc[0].to_dict(),
+                                                          at=datetime.combine(placement_date, datetime.min.time()))
                         
                         # Update student record
                         student_idx = self.college_data["students"][
@@ -1462,9 +1925,18 @@ class CollegeFlow:
                         ].index
                         
                         if not student_idx.empty:
-                            self.college_data["students"].loc[student_idx[0], "placement_status"] = "Placed"
-                            self.college_data["students"].loc[student_idx[0], "company"] = company
-                            self.college_data["students"].loc[student_idx[0], "package"] = package
+                            set_values(self.college_data["students"], student_idx[0], "placement_status", "Placed")
+                            set_values(self.college_data["students"], student_idx[0], "company", company)
+                            set_values(self.college_data["students"], student_idx[0], "package", package)
+                            self._indexed_students = None  # placed students leave the eligibility index
+                            getattr(self, "_cubes", {}).pop("students", None)
+                            self.college_data.touch("students")
+                            self._trends = None
+                            self.metrics().student_status_changed(student_id, "Placed", company, package)
+                            for matcher in getattr(self, "_matchers", {}).values():
+                                matcher.remove_student(student_id)
+                        
+                        get_db_manager().record_match_outcome(student_id, company, self.college_data["college_id"])
                         
                         st.success(f"✅ Placement record added for {student_name}!")
         
@@ -1478,8 +1950,8 @@ class CollegeFlow:
             ]
             
             if not pending_offers.empty:
-                for _, offer in pending_offers.iterrows():
-                    with st.expander(f"{offer['student_name']} - {offer['company']} (₹{offer['package']}L)", expanded=False):
+                for offer in paginate(pending_offers, "pending_offers"):
+                    with st.expander(f"{offer['student_name']} - {offer['company']} (₹{offer['package']:g}L)", expanded=False):
                         col1, col2 = st.columns(2)
                         
                         with col1:
@@ -1487,7 +1959,7 @@ class CollegeFlow:
                             st.write(f"**Student:** {offer['student_name']}")
                             st.write(f"**Department:** {offer['department']}")
                             st.write(f"**Job Role:** {offer['job_role']}")
-                            st.write(f"**Package:** ₹{offer['package']}L")
+                            st.write(f"**Package:** ₹{offer['package']:g}L")
                         
                         with col2:
                             st.write("**Status:** Offer Pending")
@@ -1497,19 +1969,25 @@ class CollegeFlow:
                             col1, col2 = st.columns(2)
                             with col1:
                                 if st.button("✅ Accept", key=f"accept_{offer['placement_id']}", width='stretch'):
-                                    self.college_data["placements"].loc[
-                                        self.college_data["placements"]["placement_id"] == offer['placement_id'],
-                                        'status'
-                                    ] = 'Offer Accepted'
+                                    set_values(self.college_data["placements"],
+                                               self.college_data["placements"]["placement_id"] == offer['placement_id'],
+                                               'status', 'Offer Accepted')
+                                    getattr(self, "_cubes", {}).pop("placements", None)
+                                    self.college_data.touch("placements")
+                                    self._trends = None
+                                    self.metrics().offer_status_changed(offer['placement_id'], 'Offer Accepted')
                                     st.success("Offer accepted!")
                                     st.rerun()
                             
                             with col2:
                                 if st.button("❌ Decline", key=f"decline_{offer['placement_id']}", width='stretch'):
-                                    self.college_data["placements"].loc[
-                                        self.college_data["placements"]["placement_id"] == offer['placement_id'],
-                                        'status'
-                                    ] = 'Offer Declined'
+                                    set_values(self.college_data["placements"],
+                                               self.college_data["placements"]["placement_id"] == offer['placement_id'],
+                                               'status', 'Offer Declined')
+                                    getattr(self, "_cubes", {}).pop("placements", None)
+                                    self.college_data.touch("placements")
+                                    self._trends = None
+                                    self.metrics().offer_status_changed(offer['placement_id'], 'Offer Declined')
                                     st.success("Offer declined!")
                                     st.rerun()
             else:
@@ -1547,15 +2025,15 @@ class CollegeFlow:
                     "package": "avg_package"
                 })
                 
-                fig1 = px.line(monthly_stats, x="month", y="placements",
-                              title="Monthly Placement Trend",
-                              markers=True)
+                fig1 = figure_cache.figure("line", monthly_stats, x="month", y="placements",
+                                                  title="Monthly Placement Trend",
+                                                  markers=True)
                 st.plotly_chart(fig1, use_container_width=True)
             
             # Package distribution
-            fig2 = px.histogram(self.college_data["placements"], x="package",
-                               title="Package Distribution",
-                               nbins=20)
+            fig2 = figure_cache.figure("histogram", self.college_data["placements"], x="package",
+                                                   title="Package Distribution",
+                                                   nbins=20)
             st.plotly_chart(fig2, use_container_width=True)
             
             # Top packages
@@ -1570,44 +2048,51 @@ class CollegeFlow:
         
         tab1, tab2, tab3 = st.tabs(["📈 Overall Performance", "🏫 Department Reports", "📋 Custom Reports"])
         
+        students_cube = self.analytics_cube("students")
+        placements_cube = self.analytics_cube("placements")
+        
         with tab1:
             st.subheader("Overall College Performance")
             
             # Key Performance Indicators
             st.write("**🎯 Key Performance Indicators (KPIs)**")
             
+            metrics = self.metrics()
+            kpis = metrics.student_kpis()
+            
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                total_students = len(self.college_data["students"])
+                total_students = kpis["total"]
                 st.metric("Total Students", total_students)
             with col2:
-                placed = len(self.college_data["students"][self.college_data["students"]["placement_status"] == "Placed"])
-                placement_rate = (placed / total_students * 100) if total_students > 0 else 0
-                st.metric("Placement Rate", f"{placement_rate:.1f}%", "+5.2%")
+                placement_rate = kpis["placement_rate"]
+                st.metric("Placement Rate", f"{placement_rate:.1f}%",
+                          _delta(metrics.delta("students", "placement_rate"), "{:+.1f}%"), help=SESSION_DELTA_HELP)
             with col3:
-                avg_package = self.college_data["students"]["package"].mean()
-                st.metric("Avg Package", f"₹{avg_package:.1f}L", "+2.1L")
+                avg_package = kpis["avg_package"]
+                st.metric("Avg Package", f"₹{avg_package:.1f}L",
+                          _delta(metrics.delta("students", "avg_package"), "{:+.1f}L"), help=SESSION_DELTA_HELP)
             with col4:
-                top_package = self.college_data["students"]["package"].max()
-                st.metric("Highest Package", f"₹{top_package:.1f}L")
+                top_package = kpis["max_package"]
+                st.metric("Highest Package", f"₹{top_package:.1f}L",
+                          _delta(metrics.delta("students", "max_package"), "{:+.1f}L"), help=SESSION_DELTA_HELP)
             
             # Year-over-Year Comparison
             st.subheader("📅 Year-over-Year Comparison")
             
-            years = [2021, 2022, 2023, 2024]
-            placement_rates = [65, 72, 78, 82]
-            avg_packages = [10.5, 12.2, 14.5, 16.8]
-            
-            comparison_data = pd.DataFrame({
-                'Year': years,
-                'Placement Rate': placement_rates,
-                'Avg Package': avg_packages
+            # Per graduation year; closed years come from stored snapshots
+            yearly = self.trends().compare("year", ["placement_rate", "avg_package"])
+            comparison_data = yearly.reset_index().rename(columns={
+                'period': 'Year', 'students': 'Students', 'placed': 'Placed',
+                'placement_rate': 'Placement Rate', 'avg_package': 'Avg Package', 'max_package': 'Highest Package',
+                'change_placement_rate': 'Rate Change (pts)', 'change_avg_package': 'Package Change (L)'
             })
             
-            fig1 = px.line(comparison_data, x='Year', y=['Placement Rate', 'Avg Package'],
-                          title="Year-over-Year Performance",
-                          markers=True)
+            fig1 = figure_cache.figure("line", comparison_data, x='Year', y=['Placement Rate', 'Avg Package'],
+                                              title="Year-over-Year Performance",
+                                              markers=True)
             st.plotly_chart(fig1, use_container_width=True)
+            st.dataframe(comparison_data.round(1), use_container_width=True, hide_index=True)
             
             # Placement Distribution by Company Type
             st.subheader("🏢 Placement Distribution by Company Type")
@@ -1620,78 +2105,82 @@ class CollegeFlow:
             
             company_data = []
             for ctype, companies in company_types.items():
-                placements = self.college_data["placements"][
-                    self.college_data["placements"]["company"].isin(companies)
-                ]
+                placements = placements_cube.totals({"company": companies})
                 company_data.append({
                     'Type': ctype,
-                    'Placements': len(placements),
-                    'Avg Package': placements['package'].mean() if not placements.empty else 0
+                    'Placements': placements["count"],
+                    'Avg Package': placements["mean"] if placements["valued"] else 0
                 })
             
             company_df = pd.DataFrame(company_data)
             
             col1, col2 = st.columns(2)
             with col1:
-                fig2 = px.pie(company_df, values='Placements', names='Type',
-                             title="Placements by Company Type")
+                fig2 = figure_cache.figure("pie", company_df, values='Placements', names='Type',
+                                                 title="Placements by Company Type")
                 st.plotly_chart(fig2, use_container_width=True)
             
             with col2:
-                fig3 = px.bar(company_df, x='Type', y='Avg Package',
-                             title="Avg Package by Company Type",
-                             color='Avg Package')
+                fig3 = figure_cache.figure("bar", company_df, x='Type', y='Avg Package',
+                                                 title="Avg Package by Company Type",
+                                                 color='Avg Package')
                 st.plotly_chart(fig3, use_container_width=True)
             
             # Performance Summary
             st.subheader("📊 Performance Summary")
             
-            summary_data = {
-                'Metric': ['Placement Rate', 'Avg Package', 'Highest Package', 
-                          'Internship Rate', 'Multiple Offers', 'Dream Offers'],
-                'Current': [82, 16.8, 42.5, 15, 8, 12],
-                'Target': [85, 18.0, 50.0, 20, 10, 15],
-                'Trend': ['↗️', '↗️', '↗️', '→', '↗️', '↗️']
-            }
-            
-            summary_df = pd.DataFrame(summary_data)
+            # Current values are the KPIs above; trends compare the two latest graduating batches
+            intern_rates = students_cube.rate(["graduation_year"], {"placement_status": "Intern"}).dropna(
+                subset=["graduation_year"]).sort_values("graduation_year")["rate"]
+            changes = [yearly["placement_rate"].diff(), yearly["avg_package"].diff(),
+                       yearly["max_package"].diff(), intern_rates.diff()]
+            intern_rate = kpis["interns"] / total_students * 100 if total_students else 0.0
+            
+            summary_df = pd.DataFrame({
+                'Metric': ['Placement Rate', 'Avg Package', 'Highest Package', 'Internship Rate'],
+                'Current': [round(placement_rate, 1), round(avg_package, 1), round(top_package, 1),
+                            round(intern_rate, 1)],
+                'Target': [85, 18.0, 50.0, 20],
+                'Trend': [_trend(change.iloc[-1] if len(change) else None) for change in changes]
+            })
             st.dataframe(summary_df, use_container_width=True)
         
         with tab2:
             st.subheader("Department-wise Performance Reports")
             
             # Select department
-            departments = self.college_data["students"]["department"].unique()
+            departments = students_cube.values("department")
             selected_dept = st.selectbox("Select Department", departments)
             
             if selected_dept:
                 # Department statistics
-                dept_students = self.college_data["students"][
-                    self.college_data["students"]["department"] == selected_dept
-                ]
-                dept_placements = self.college_data["placements"][
-                    self.college_data["placements"]["department"] == selected_dept
-                ]
+                dept_filter = {"department": selected_dept}
+                dept_stats = students_cube.rate([], {"placement_status": "Placed"}, dept_filter).iloc[0]
+                dept_totals = placements_cube.totals(dept_filter)
+                company_counts = placements_cube.rollup(["company"], dept_filter).sort_values(
+                    "count", ascending=False, kind="stable")
+                top_companies = company_counts.set_index("company")["count"].head(3)
                 
                 col1, col2, col3, col4 = st.columns(4)
                 with col1:
-                    total = len(dept_students)
+                    total = int(dept_stats["count"])
                     st.metric("Total Students", total)
                 with col2:
-                    placed = len(dept_students[dept_students["placement_status"] == "Placed"])
-                    placement_rate = (placed / total * 100) if total > 0 else 0
+                    placement_rate = dept_stats["rate"] if total > 0 else 0
                     st.metric("Placement Rate", f"{placement_rate:.1f}%")
                 with col3:
-                    avg_package = dept_placements["package"].mean() if not dept_placements.empty else 0
+                    avg_package = dept_totals["mean"] if dept_totals["valued"] else 0
                     st.metric("Avg Package", f"₹{avg_package:.1f}L")
                 with col4:
-                    top_companies = dept_placements["company"].value_counts().head(3)
                     st.metric("Top Recruiters", ", ".join(top_companies.index.tolist()) if not top_companies.empty else "N/A")
                 
-                # Top packages in department
+                # Top packages in department (row-level, so read from the placement records)
                 st.subheader(f"🏆 Top Packages in {selected_dept}")
-                if not dept_placements.empty:
-                    top_dept_packages = dept_placements.sort_values("package", ascending=False).head(10)
+                if dept_totals["count"]:
+                    dept_placements = self.college_data["placements"][
+                        self.college_data["placements"]["department"] == selected_dept
+                    ]
+                    top_dept_packages = dept_placements.nlargest(10, "package")
                     st.dataframe(top_dept_packages[["student_name", "company", "job_role", "package"]], 
                                use_container_width=True)
                 else:
@@ -1699,12 +2188,12 @@ class CollegeFlow:
                 
                 # Company-wise distribution
                 st.subheader(f"🏢 Company-wise Placements in {selected_dept}")
-                if not dept_placements.empty:
-                    company_dist = dept_placements["company"].value_counts().reset_index()
+                if not company_counts.empty:
+                    company_dist = company_counts[["company", "count"]]
                     company_dist.columns = ['Company', 'Placements']
                     
-                    fig = px.bar(company_dist, x='Company', y='Placements',
-                                title=f"Placements by Company in {selected_dept}")
+                    fig = figure_cache.figure("bar", company_dist, x='Company', y='Placements',
+                                                    title=f"Placements by Company in {selected_dept}")
                     st.plotly_chart(fig, use_container_width=True)
                 
                 # Generate department report
@@ -1721,7 +2210,7 @@ class CollegeFlow:
                         - **Total Students:** {total}
                         - **Placement Rate:** {placement_rate:.1f}%
                         - **Average Package:** ₹{avg_package:.1f} LPA
-                        - **Highest Package:** ₹{dept_placements['package'].max() if not dept_placements.empty else 0:.1f} LPA
+                        - **Highest Package:** ₹{dept_totals['max'] if dept_totals['valued'] else 0:.1f} LPA
                         
                         ### Top Recruiters
                         {', '.join([f"{company} ({count})" for company, count in top_companies.items()]) if not top_companies.empty else "No data"}
@@ -1743,11 +2232,21 @@ class CollegeFlow:
                      "Trend Analysis", "Comparative Analysis"])
                 
                 time_period = st.selectbox("Time Period",
-                    ["Current Year", "Last Year", "Last 3 Years", "Custom"])
+                    ["Current Year", "Last Year", "Last 3 Years", "Custom"],
+                    help="Graduating batches, counted back from the latest batch on record")
                 
+                latest_year = int(max(students_cube.values("graduation_year"), default=datetime.now().year))
                 if time_period == "Custom":
-                    start_date = st.date_input("Start Date")
-                    end_date = st.date_input("End Date")
+                    start_date = st.date_input("Start Date", datetime(latest_year - 2, 1, 1).date())
+                    end_date = st.date_input("End Date", datetime(latest_year, 12, 31).date())
+                    first_year, last_year = sorted([start_date.year, end_date.year])
+                else:
+                    first_year, last_year = {
+                        "Current Year": (latest_year, latest_year),
+                        "Last Year": (latest_year - 1, latest_year - 1),
+                        "Last 3 Years": (latest_year - 2, latest_year)
+                    }[time_period]
+                graduation_years = tuple(range(first_year, last_year + 1))
             
             with col2:
                 metrics = st.multiselect("Select Metrics",
@@ -1763,77 +2262,182 @@ class CollegeFlow:
             st.subheader("Filters")
             col1, col2, col3 = st.columns(3)
             with col1:
-                department_filter = st.multiselect("Departments", 
-                    list(self.college_data["students"]["department"].unique()))
+                department_filter = st.multiselect("Departments", students_cube.values("department"))
             with col2:
                 company_filter = st.multiselect("Companies",
-                    list(self.college_data["companies"]["name"].unique()))
+                    sorted(set(students_cube.values("company")) | set(placements_cube.values("company"))))
             with col3:
-                package_range = st.slider("Package Range (LPA)", 0.0, 50.0, (0.0, 50.0))
+                package_range = st.slider("Package Range (LPA)", 0.0, 50.0, (0.0, 50.0), step=1.0)
             
             # Generate report
             if st.button("🚀 Generate Custom Report", type="primary", width='stretch'):
-                with st.spinner("Generating report..."):
-                    import time
-                    time.sleep(3)
-                    
-                    st.success("✅ Report generated successfully!")
-                    
-                    # Show report summary
-                    st.subheader("Report Summary")
-                    
-                    summary_data = {
-                        'Report Type': report_type,
-                        'Time Period': time_period,
-                        'Metrics Included': ', '.join(metrics),
-                        'Departments Filtered': ', '.join(department_filter) if department_filter else 'All',
-                        'Companies Filtered': ', '.join(company_filter) if company_filter else 'All',
-                        'Package Range': f"₹{package_range[0]}L - ₹{package_range[1]}L",
-                        'Format': format_type
-                    }
-                    
-                    for key, value in summary_data.items():
-                        st.write(f"**{key}:** {value}")
-                    
-                    # Download options
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.download_button(
-                            label="📥 Download PDF",
-                            data="Sample PDF content",
-                            file_name=f"placement_report_{datetime.now().strftime('%Y%m%d')}.pdf",
-                            mime="application/pdf"
-                        )
-                    with col2:
-                        st.download_button(
-                            label="📥 Download Excel",
-                            data="Sample Excel content",
-                            file_name=f"placement_report_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                            mime="application/vnd.ms-excel"
-                        )
-                    with col3:
-                        st.download_button(
-                            label="📥 Download HTML",
-                            data="<h1>Sample Report</h1>",
-                            file_name=f"placement_report_{datetime.now().strftime('%Y%m%d')}.html",
-                            mime="text/html"
-                        )
+                spec = {
+                    "report_type": report_type, "time_period": time_period,
+                    "graduation_years": graduation_years, "metrics": tuple(metrics),
+                    "departments": tuple(department_filter), "companies": tuple(company_filter),
+                    "package_range": tuple(package_range), "format": format_type
+                }
+                # The worker reads this data version even if the session edits its frames meanwhile
+                students = self.college_data["students"].copy(deep=False)
+                build = lambda: self.custom_report(spec, students_cube, students)
+                report, job_id = None, None
+                if format_type in REPORT_FORMATS:
+                    # Same filters on the same data version reuse the cached file
+                    key = (self.college_data["college_id"], students_cube.version,
+                           *[v for k, v in spec.items() if k != "format"])
+                    job_id = report_engine.submit(key, build, format_type,
+                                                  f"placement_report_{datetime.now().strftime('%Y%m%d')}",
+                                                  preview_tables=["Placement Breakdown"]).job_id
+                else:
+                    report = build()
+                st.session_state.custom_report = {"spec": spec, "report": report, "job_id": job_id}
+            
+            custom = st.session_state.get("custom_report")
+            if custom:
+                spec = custom["spec"]
+                job = report_engine.job(custom["job_id"]) if custom["job_id"] else None
+                report = custom["report"] or (job.report if job is not None else None)
+                
+                # Show report summary
+                st.subheader("Report Summary")
+                
+                summary_data = {
+                    'Report Type': spec["report_type"],
+                    'Time Period': f"{spec['time_period']} ({_batches(spec['graduation_years'])})",
+                    'Metrics Included': ', '.join(spec["metrics"]),
+                    'Departments Filtered': ', '.join(spec["departments"]) if spec["departments"] else 'All',
+                    'Companies Filtered': ', '.join(spec["companies"]) if spec["companies"] else 'All',
+                    'Package Range': f"₹{spec['package_range'][0]}L - ₹{spec['package_range'][1]}L",
+                    'Format': spec["format"]
+                }
+                
+                for key, value in summary_data.items():
+                    st.write(f"**{key}:** {value}")
+                
+                # Download once the background job has rendered the file
+                if custom["job_id"] and job is None:
+                    st.warning("This report has expired from the cache. Generate it again to download.")
+                elif job is not None and job.status == "failed":
+                    st.error(f"Report generation failed: {job.error}")
+                elif job is not None and job.status == "done":
+                    st.success(f"✅ Report generated successfully! ({job.seconds:.1f}s)")
+                    st.download_button(
+                        label=f"📥 Download {job.format}",
+                        data=job.read(),
+                        file_name=job.file_name,
+                        mime=job.mime
+                    )
+                elif job is not None:
+                    st.fragment(self.report_progress, run_every=0.5)(job.job_id)
+                
+                # The preview needs the built report, which a file job has once it has run
+                if report is not None:
+                    tables = dict(report["tables"])
+                    st.dataframe(tables["Placement Breakdown"], width='stretch', hide_index=True)
                     
                     # Preview key findings
                     st.subheader("Key Findings Preview")
                     
+                    findings = report["findings"]
+                    placement_rate = findings["Placement Rate"]
+                    
+                    # College-wide change in average package from the previous graduating batch
+                    yearly = self.trends().compare("year", ["avg_package"])
+                    growth = ""
+                    if len(yearly) >= 2 and pd.notna(yearly["change_avg_package"].iloc[-1]) and yearly["avg_package"].iloc[-2]:
+                        growth = f" (Growth: {yearly['change_avg_package'].iloc[-1] / yearly['avg_package'].iloc[-2] * 100:+.0f}% YoY)"
+                    
                     findings = [
                         f"📈 **Placement Rate:** {placement_rate:.1f}% (Target: 85%)",
-                        f"💰 **Average Package:** ₹{avg_package:.1f}L (Growth: +12% YoY)",
-                        f"🏆 **Highest Package:** ₹{top_package:.1f}L",
-                        f"🏢 **Top Recruiter:** {self.college_data['companies'].iloc[0]['name']}",
-                        f"🎯 **Department Leader:** {self.college_data['students']['department'].value_counts().index[0]}",
-                        f"📊 **Selection Rate:** 68% (Improvement needed in HR rounds)"
+                        f"💰 **Average Package:** ₹{findings['Average Package']:.1f}L{growth}",
+                        f"🏆 **Highest Package:** ₹{findings['Highest Package']:.1f}L",
+                        f"🏢 **Top Recruiter:** {findings['Top Recruiter']}",
+                        f"🎯 **Department Leader:** {findings['Department Leader']}"
                     ]
                     
                     for finding in findings:
                         st.write(finding)
     
+    def report_progress(self, job_id):
+        """Progress of a background report job; reruns the page once it has finished"""
+        job = report_engine.job(job_id)
+        if job is None or job.finished:
+            st.rerun()
+        st.progress(job.progress, text=job.message)
+    
+    def custom_report(self, spec, students_cube, students):
+        """
+        Report content for a Custom Reports spec, read from a students cube
+        and the students frame it was built from (so it can run off the UI
+        thread on a fixed data version).
+        """
+        # Departments and graduating batches narrow the population; companies and packages the offers counted
+        scope = {"department": list(spec["departments"]), "graduation_year": list(spec["graduation_years"])}
+        offers = {**scope, "company": list(spec["companies"])}
+        placed = {"placement_status": "Placed", "company": list(spec["companies"])}
+        package_range = spec["package_range"]
+        
+        overall = students_cube.rate([], placed, scope, package_range).iloc[0]
+        packages = students_cube.totals(offers, package_range)
+        # Placement records carry no graduation year, so recruiters are counted from placed students
+        recruiters = students_cube.rollup(["company"], {**scope, **placed}, package_range).sort_values(
+            "count", ascending=False, kind="stable")
+        departments = students_cube.rate(["department"], placed, scope, package_range).sort_values(
+            "rate", ascending=False, kind="stable")
+        
+        summary = {
+            "Placement Rate": overall["rate"] if overall["count"] else 0,
+            "Average Package": packages["mean"] if packages["valued"] else 0,
+            "Highest Package": packages["max"] if packages["valued"] else 0,
+            "Total Placements": int(overall["matching"]),
+            "Top Recruiter": recruiters["company"].iloc[0] if not recruiters.empty else "N/A",
+            "Department Leader": departments["department"].iloc[0] if not departments.empty else "N/A"
+        }
+        always = {"Top Recruiter", "Department Leader"}
+        
+        breakdown = students_cube.rollup(["department", "company"], offers, package_range)
+        breakdown = breakdown[breakdown["company"].notna()].sort_values(["department", "count"],
+                                                                      ascending=[True, False])
+        tables = [("Placement Breakdown", breakdown[["department", "company", "count", "mean", "max"]].rename(columns={
+            "department": "Department", "company": "Company", "count": "Offers",
+            "mean": "Avg Package", "max": "Highest Package"
+        }).round(2))]
+        if "Department-wise Analysis" in spec["metrics"]:
+            tables.append(("Department-wise Analysis", departments[["department", "count", "matching", "rate", "mean"]].rename(columns={
+                "department": "Department", "count": "Students", "matching": "Placed",
+                "rate": "Placement Rate (%)", "mean": "Avg Package"
+            }).round(2)))
+        if "Company-wise Analysis" in spec["metrics"]:
+            tables.append(("Company-wise Analysis", recruiters[["company", "count", "mean", "max"]].rename(columns={
+                "company": "Company", "count": "Placements", "mean": "Avg Package", "max": "Highest Package"
+            }).round(2)))
+        
+        # Row-level records; the report engine renders them a page at a time
+        records = (students["placement_status"] == "Placed") & students["graduation_year"].isin(spec["graduation_years"])
+        if spec["departments"]:
+            records &= students["department"].isin(spec["departments"])
+        if spec["companies"]:
+            records &= students["company"].isin(spec["companies"])
+        low, high = package_range
+        packages_col = pd.to_numeric(students["package"], errors="coerce")
+        records &= (packages_col >= np.floor(low)) & (packages_col < high)
+        columns = [c for c in ["student_id", "name", "department", "graduation_year", "company", "package"]
+                   if c in students]
+        tables.append(("Placement Records", students.loc[records, columns]))
+        
+        return {
+            "title": f"{spec['report_type']} - {self.college_data['college_name']}",
+            "subtitle": f"Generated on {datetime.now().strftime('%d %B %Y %H:%M')} | "
+                        f"{spec['time_period']} ({_batches(spec['graduation_years'])}) | "
+                        f"Departments: {', '.join(spec['departments']) or 'All'} | "
+                        f"Companies: {', '.join(spec['companies']) or 'All'} | "
+                        f"Package: ₹{package_range[0]}L - ₹{package_range[1]}L",
+            "summary": [(label, value) for label, value in summary.items()
+                        if label in always or label in spec["metrics"]],
+            "tables": tables,
+            "findings": summary
+        }
+    
     def display_workflow_navigation(self, current_step):
         """Display navigation buttons for workflow"""
         col1, col2, col3 = st.columns([1, 2, 1])
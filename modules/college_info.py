@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+from utils.figure_cache import figure_cache
+from utils.schema import apply_schema
 
 class CollegeInfoModule:
     def __init__(self):
@@ -23,7 +24,7 @@ class CollegeInfoModule:
             'top_recruiters': ['Google, Microsoft, Amazon', 'Infosys, TCS, Wipro', 
                              'Google, Amazon, Microsoft, Adobe', 'TCS, Infosys, Cognizant']
         }
-        return pd.DataFrame(data)
+        return apply_schema(pd.DataFrame(data), "colleges")
     
     def display(self):
         """Display college information module"""
@@ -99,16 +100,16 @@ class CollegeInfoModule:
         
         with col1:
             # Placement rate bar chart
-            fig1 = px.bar(self.college_data, x='name', y='placement_rate',
-                         title="Placement Rate by College",
-                         labels={'name': 'College', 'placement_rate': 'Placement Rate (%)'})
+            fig1 = figure_cache.figure("bar", self.college_data, x='name', y='placement_rate',
+                                             title="Placement Rate by College",
+                                             labels={'name': 'College', 'placement_rate': 'Placement Rate (%)'})
             st.plotly_chart(fig1, use_container_width=True)
         
         with col2:
             # Average package bar chart
-            fig2 = px.bar(self.college_data, x='name', y='avg_package',
-                         title="Average Package by College",
-                         labels={'name': 'College', 'avg_package': 'Average Package (LPA)'})
+            fig2 = figure_cache.figure("bar", self.college_data, x='name', y='avg_package',
+                                             title="Average Package by College",
+                                             labels={'name': 'College', 'avg_package': 'Average Package (LPA)'})
             st.plotly_chart(fig2, use_container_width=True)
         
         # Top recruiters word cloud simulation
@@ -0,0 +1,33 @@
+"""
+Lazy construction of the role flows kept in Streamlit session state
+"""
+
+import importlib
+
+# Session state key -> (module, class); a module is imported the first time its flow is needed
+FLOWS = {
+    "workflow_manager": ("modules.workflow_manager", "WorkflowManager"),
+    "student_flow": ("modules.student_flow", "StudentFlow"),
+    "college_flow": ("modules.college_flow", "CollegeFlow"),
+    "recruiter_flow": ("modules.recruiter_flow", "RecruiterFlow")
+}
+
+ROLE_FLOWS = {
+    "👨‍🎓 Student": "student_flow",
+    "🏫 College Admin": "college_flow",
+    "💼 Recruiter": "recruiter_flow"
+}
+
+
+def get_flow(state, name):
+    """The flow stored under ``name`` in ``state``, importing and building it on first use"""
+    if name not in state:
+        module, class_name = FLOWS[name]
+        state[name] = getattr(importlib.import_module(module), class_name)()
+    return state[name]
+
+
+def flow_for_role(state, role):
+    """The flow behind a sidebar role, or None for roles without one (Observer)"""
+    name = ROLE_FLOWS.get(role)
+    return get_flow(state, name) if name else None
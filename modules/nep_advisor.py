@@ -1,9 +1,12 @@
 import streamlit as st
 import pandas as pd
+from utils.skill_bitset import SkillVocabulary, overlap
 
 class NEPAdvisor:
     def __init__(self):
         self.nep_guidelines = self.load_nep_guidelines()
+        self.skill_vocabulary = SkillVocabulary(["Programming", "CAD", "Thermodynamics"])
+        self.engineering_skill_bits = self.skill_vocabulary.encode(["CAD", "Thermodynamics"])
     
     def load_nep_guidelines(self):
         """Load NEP guidelines and major/minor combinations"""
@@ -128,9 +131,11 @@ class NEPAdvisor:
     def analyze_recommendations(self, interests, career_goals, skills):
         """Analyze and generate recommendations"""
         recommendations = []
+        high_skill_bits = self.skill_vocabulary.encode([k for k, v in skills.items() if v == "High"])
+        skill_bits = self.skill_vocabulary.encode(list(skills))
         
         # Sample recommendation logic
-        if "Technology" in interests or "Programming" in [k for k, v in skills.items() if v == "High"]:
+        if "Technology" in interests or self.skill_vocabulary.has(high_skill_bits, "Programming"):
             recommendations.append({
                 "major": "Computer Science",
                 "minor": "Business Management",
@@ -149,7 +154,7 @@ class NEPAdvisor:
                 "match_score": 78
             })
         
-        if "Engineering" in interests or any(s in ["CAD", "Thermodynamics"] for s in skills):
+        if "Engineering" in interests or overlap(skill_bits, self.engineering_skill_bits):
             recommendations.append({
                 "major": "Mechanical Engineering",
                 "minor": "Robotics",
@@ -0,0 +1,79 @@
+"""
+Paginated rendering for long card lists (expanders per row)
+"""
+
+import math
+
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [10, 25, 50]
+
+
+class WindowedSource:
+    """
+    Row count plus row windows of a DataFrame, a list of records, or a
+    ``fetch(start, stop)`` callable (which needs ``count``). Only the rows
+    of a requested window are converted to records.
+    """
+
+    def __init__(self, data, count=None):
+        if callable(data) and count is None:
+            raise ValueError("A fetch callable needs the total row count")
+        self.data = data
+        self.count = len(data) if count is None else count
+
+    def __len__(self):
+        return self.count
+
+    def window(self, start, stop):
+        if isinstance(self.data, pd.DataFrame):
+            return self.data.iloc[start:stop].to_dict("records")
+        if callable(self.data):
+            return list(self.data(start, stop))
+        return list(self.data[start:stop])
+
+
+def paginate(data, key, page_size=10, reset_on=None, count=None):
+    """
+    Draw page controls for ``data`` and return the records of the current
+    page only, for the caller to render.
+
+    ``key`` namespaces the page state and controls, so several lists can
+    share a view. The page is kept across reruns, clamped when the data
+    shrinks, and reset to the first one when ``reset_on`` (e.g. the active
+    filters) changes. Rows should use their own ids in widget keys, which
+    stay stable whichever page a row lands on.
+    """
+    source = data if isinstance(data, WindowedSource) else WindowedSource(data, count)
+    page_key, size_key, filters_key = f"{key}_page", f"{key}_page_size", f"{key}_reset_on"
+
+    if reset_on is not None and st.session_state.get(filters_key) != reset_on:
+        st.session_state[filters_key] = reset_on
+        st.session_state[page_key] = 0
+
+    size = st.session_state.get(size_key, page_size)
+    pages = max(1, math.ceil(len(source) / size))
+    page = min(st.session_state.get(page_key, 0), pages - 1)
+    st.session_state[page_key] = page
+
+    if len(source) > min(PAGE_SIZES + [page_size]):
+        def turn(step):
+            st.session_state[page_key] = st.session_state.get(page_key, 0) + step
+
+        col1, col2, col3, col4 = st.columns([1, 3, 1, 1])
+        with col1:
+            st.button("◀ Prev", key=f"{key}_prev", on_click=turn, args=(-1,),
+                      disabled=page == 0, width='stretch')
+        with col2:
+            st.caption(f"Showing {page * size + 1}–{min((page + 1) * size, len(source))} "
+                       f"of {len(source)} · page {page + 1} of {pages}")
+        with col3:
+            st.button("Next ▶", key=f"{key}_next", on_click=turn, args=(1,),
+                      disabled=page >= pages - 1, width='stretch')
+        with col4:
+            sizes = sorted(set(PAGE_SIZES + [page_size]))
+            st.selectbox("Per page", sizes, index=sizes.index(size), key=size_key,
+                         label_visibility="collapsed")
+
+    return source.window(page * size, (page + 1) * size)
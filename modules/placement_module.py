@@ -1,31 +1,52 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-import plotly.express as px
-import plotly.graph_objects as go
-import joblib
-import os
+import pickle
+from utils.feature_store import FEATURE_NAMES, FeatureStore
+from utils.model_registry import ModelRegistry
+from utils.sensitivity import feature_grid, sensitivity_grid
+from utils.figure_cache import figure_cache
+
+# Input ranges of the predictor widgets, reused for what-if sweeps
+FEATURE_BOUNDS = {
+    'cgpa': (6.0, 10.0),
+    'backlogs': (0, 10),
+    'internships': (0, 10),
+    'projects': (0, 50),
+    'aptitude_score': (0, 100),
+    'coding_score': (0, 100),
+    'communication_score': (0, 100),
+    'extracurricular': (0, 20)
+}
+COUNT_FEATURES = {'backlogs', 'internships', 'projects', 'extracurricular'}
 
 class PlacementModule:
-    def __init__(self):
+    def __init__(self, registry=None):
         self.model = None
+        self.model_version = None
+        self._explainer = None
+        self.registry = registry or ModelRegistry("models/registry")
         self.load_model()
         
-    def load_model(self):
-        """Load or train placement prediction model"""
-        model_path = "models/placement_model.pkl"
+    def load_model(self, version=None):
+        """Load the active (or given) model version, training one if the registry is empty"""
         try:
-            if os.path.exists(model_path):
-                self.model = joblib.load(model_path)
+            if version or self.registry.active_version():
+                self.model, manifest = self.registry.load(version)
+                self.model_version = manifest["version"]
+                self._explainer = None
             else:
                 self.train_model()
-        except:
+        except (OSError, ValueError, KeyError, EOFError, pickle.UnpicklingError):
+            # Missing, corrupt or mismatched model files: fall back to a fresh model
             self.train_model()
     
     def train_model(self):
         """Train placement prediction model"""
+        # sklearn is only needed when the registry has no model yet
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import train_test_split
+        
         # Sample training data
         np.random.seed(42)
         n_samples = 1000
@@ -60,17 +81,81 @@ class PlacementModule:
         df = pd.DataFrame(data)
         
         # Train model
-        X = df.drop('placed', axis=1)
+        X = df[FEATURE_NAMES]
         y = df['placed']
         
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.model.fit(X_train, y_train)
+        model = RandomForestClassifier(n_estimators=100, random_state=42)
+        model.fit(X_train, y_train)
+        
+        # Publish as a new immutable version; a latency regression keeps the current model
+        metrics = {
+            'train_accuracy': round(float(model.score(X_train, y_train)), 4),
+            'test_accuracy': round(float(model.score(X_test, y_test)), 4)
+        }
+        try:
+            manifest = self.registry.publish(model, FEATURE_NAMES, X_test, len(X_train), metrics)
+        except ValueError as e:
+            if self.model is None and self.registry.active_version():
+                self.load_model()
+            elif self.model is None:
+                raise
+            st.warning(f"New model was not published: {e}")
+            return None
         
-        # Create models directory if it doesn't exist
-        os.makedirs("models", exist_ok=True)
-        joblib.dump(self.model, "models/placement_model.pkl")
+        self.model = model
+        self.model_version = manifest['version']
+        self._explainer = None
+        return manifest
+    
+    def predict_matrix(self, matrix):
+        """Placement probabilities for an aligned feature matrix"""
+        input_data = pd.DataFrame(np.asarray(matrix)[:, :len(FEATURE_NAMES)], columns=FEATURE_NAMES)
+        return self.model.predict_proba(input_data)[:, 1]
+    
+    @property
+    def explainer(self):
+        """Path-contribution explainer for the current model (built on first use)"""
+        if self._explainer is None:
+            from utils.explainer import TreeContributionExplainer
+            self._explainer = TreeContributionExplainer(self.model, FEATURE_NAMES)
+        return self._explainer
+    
+    def run_batch_predictions(self, student_ids=None, feature_store=None, db=None, top_k=5):
+        """Predict and explain students from the feature store and save the results"""
+        feature_store = feature_store or FeatureStore(db)
+        student_ids, matrix = feature_store.get_model_matrix(student_ids)
+        
+        if len(student_ids) == 0:
+            return 0
+        
+        probabilities = self.predict_matrix(matrix)
+        key_factors = self.explainer.top_factors(self.explainer.explain(matrix), top_k)
+        
+        predictions = [
+            {
+                'student_id': int(student_id),
+                'placement_probability': round(float(probability) * 100, 2),
+                'key_factors': factors,
+                'model_version': self.model_version
+            }
+            for student_id, probability, factors in zip(student_ids, probabilities, key_factors)
+        ]
+        return feature_store.db.save_placement_predictions(predictions)
+    
+    def predict_students(self, student_ids=None, feature_store=None):
+        """Predict placement probability for students in the feature store"""
+        feature_store = feature_store or FeatureStore()
+        student_ids, matrix = feature_store.get_model_matrix(student_ids)
+        
+        if len(student_ids) == 0:
+            return pd.DataFrame(columns=['student_id', 'placement_probability'])
+        
+        return pd.DataFrame({
+            'student_id': student_ids,
+            'placement_probability': self.predict_matrix(matrix)
+        })
     
     def display(self):
         """Display placement module interface"""
@@ -87,6 +172,7 @@ class PlacementModule:
     
     def placement_predictor(self):
         """Interactive placement prediction tool"""
+        import plotly.express as px
         st.subheader("Predict Placement Probability")
         
         col1, col2 = st.columns(2)
@@ -108,10 +194,7 @@ class PlacementModule:
             input_data = pd.DataFrame([[
                 cgpa, backlogs, internships, projects,
                 aptitude_score, coding_score, communication_score, extracurricular
-            ]], columns=[
-                'cgpa', 'backlogs', 'internships', 'projects',
-                'aptitude_score', 'coding_score', 'communication_score', 'extracurricular'
-            ])
+            ]], columns=FEATURE_NAMES)
             
             # Get prediction
             try:
@@ -157,17 +240,123 @@ class PlacementModule:
                 4. 🎤 Prepare for behavioral interviews
                 """)
             
-            # Feature importance
+            # Per-prediction feature contributions
             st.subheader("📊 Key Factors in Prediction")
-            if hasattr(self.model, 'feature_importances_'):
-                importance = pd.DataFrame({
-                    'Feature': self.model.feature_names_in_,
-                    'Importance': self.model.feature_importances_
-                }).sort_values('Importance', ascending=False)
+            if hasattr(self.model, 'estimators_'):
+                contributions = self.explainer.explain(input_data.to_numpy())[0]
+                factors = pd.DataFrame({
+                    'Feature': FEATURE_NAMES,
+                    'Contribution': contributions * 100
+                })
+                factors['Effect'] = np.where(factors['Contribution'] >= 0, 'Raises chance', 'Lowers chance')
+                factors = factors.reindex(factors['Contribution'].abs().sort_values(ascending=False).index)
                 
-                fig = px.bar(importance.head(5), x='Importance', y='Feature', 
-                            orientation='h', title="Top 5 Placement Factors")
+                fig = px.bar(factors.head(5), x='Contribution', y='Feature', color='Effect',
+                            orientation='h', title="Top 5 Factors for This Prediction (percentage points)",
+                            color_discrete_map={'Raises chance': 'green', 'Lowers chance': 'red'})
                 st.plotly_chart(fig, use_container_width=True)
+                st.caption(f"Baseline probability: {self.explainer.bias:.1%} • Model {self.model_version}")
+        
+        self.what_if_analysis([
+            cgpa, backlogs, internships, projects,
+            aptitude_score, coding_score, communication_score, extracurricular
+        ])
+        self.model_registry_panel()
+    
+    def what_if_analysis(self, base_vector):
+        """Sweep one or two features around the current inputs"""
+        import plotly.express as px
+        with st.expander("🔍 What-if Analysis", expanded=False):
+            st.write("See how your placement chance changes as one or two factors change")
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                features = st.multiselect("Factors to vary (max 2)", FEATURE_NAMES,
+                    default=['cgpa'], max_selections=2, key="whatif_features")
+            with col2:
+                threshold = st.slider("Target Probability", 0.05, 0.95, 0.70, 0.05, key="whatif_threshold")
+            with col3:
+                resolution = st.slider("Grid Resolution", 10, 100, 50, 10, key="whatif_resolution")
+            
+            if not features:
+                st.info("Select at least one factor to vary")
+                return
+            
+            ranges = {
+                feature: feature_grid(*FEATURE_BOUNDS[feature], resolution, integer=feature in COUNT_FEATURES)
+                for feature in features
+            }
+            result = sensitivity_grid(self.predict_matrix, base_vector, FEATURE_NAMES, ranges, threshold)
+            
+            if len(features) == 1:
+                sweep = pd.DataFrame({features[0]: result['axes'][0], 'Probability': result['surface']})
+                fig = px.line(sweep, x=features[0], y='Probability',
+                             title=f"Placement Probability vs {features[0]}")
+                fig.add_hline(y=threshold, line_dash="dash", line_color="red")
+            else:
+                fig = px.imshow(result['surface'], x=result['axes'][1], y=result['axes'][0],
+                               labels={'x': features[1], 'y': features[0], 'color': 'Probability'},
+                               origin='lower', aspect='auto', color_continuous_scale='RdYlGn',
+                               zmin=0, zmax=1, title="Placement Probability Surface")
+            st.plotly_chart(fig, use_container_width=True)
+            
+            change = result['min_change']
+            if change is None:
+                st.warning(f"No combination in this range reaches {threshold:.0%}")
+            elif not any(change['deltas'].values()):
+                st.success(f"Your current profile already reaches {threshold:.0%} "
+                           f"({result['base_probability']:.1%})")
+            else:
+                moves = ", ".join(
+                    f"**{feature}** {round(change['values'][feature], 2):g} ({round(delta, 2):+g})"
+                    for feature, delta in change['deltas'].items() if delta
+                )
+                st.info(f"Smallest change to reach {threshold:.0%}: {moves} → {change['probability']:.1%}")
+    
+    def model_registry_panel(self):
+        """Show published model versions with activate/rollback controls"""
+        with st.expander("🗂️ Model Versions", expanded=False):
+            versions = self.registry.list_versions()
+            if not versions:
+                st.info("No published model versions")
+                return
+            
+            active = self.registry.active_version()
+            rows = []
+            for version in reversed(versions):
+                manifest = self.registry.get_manifest(version)
+                rows.append({
+                    'Version': version,
+                    'Active': '✅' if version == active else '',
+                    'Created': manifest['created_at'],
+                    'Training Rows': manifest['training_rows'],
+                    'Test Accuracy': manifest['metrics'].get('test_accuracy'),
+                    'p99 Latency (ms)': manifest['benchmark']['p99_ms'],
+                    'Load Time (ms)': manifest['load_time_ms'],
+                    'sklearn': manifest['sklearn_version']
+                })
+            st.dataframe(pd.DataFrame(rows), use_container_width=True)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                selected_version = st.selectbox("Version", list(reversed(versions)), key="registry_version")
+                if st.button("Activate", key="registry_activate"):
+                    self.registry.activate(selected_version)
+                    self.load_model(selected_version)
+                    st.success(f"Model {selected_version} is now active")
+            with col2:
+                if st.button("↩️ Roll Back", key="registry_rollback"):
+                    try:
+                        version = self.registry.rollback()
+                        self.load_model(version)
+                        st.success(f"Rolled back to {version}")
+                    except ValueError as e:
+                        st.error(str(e))
+            with col3:
+                if st.button("🔁 Retrain & Publish", key="registry_retrain"):
+                    manifest = self.train_model()
+                    if manifest:
+                        st.success(f"Published {manifest['version']}")
     
     def analytics_dashboard(self):
         """Display placement analytics dashboard"""
@@ -204,22 +393,22 @@ class PlacementModule:
         col1, col2 = st.columns(2)
         
         with col1:
-            fig1 = px.bar(analytics_data.sort_values('Placements', ascending=False).head(10),
-                         x='Company', y='Placements',
-                         title="Top 10 Companies by Placements")
+            fig1 = figure_cache.figure("bar", analytics_data.sort_values('Placements', ascending=False).head(10),
+                                             x='Company', y='Placements',
+                                             title="Top 10 Companies by Placements")
             st.plotly_chart(fig1, use_container_width=True)
         
         with col2:
-            fig2 = px.bar(analytics_data.sort_values('Avg_Package', ascending=False).head(10),
-                         x='Company', y='Avg_Package',
-                         title="Top 10 Companies by Package")
+            fig2 = figure_cache.figure("bar", analytics_data.sort_values('Avg_Package', ascending=False).head(10),
+                                             x='Company', y='Avg_Package',
+                                             title="Top 10 Companies by Package")
             st.plotly_chart(fig2, use_container_width=True)
         
         # Company difficulty analysis
         st.subheader("Company Difficulty Analysis")
         difficulty_counts = analytics_data['Difficulty'].value_counts()
-        fig3 = px.pie(values=difficulty_counts.values, names=difficulty_counts.index,
-                     title="Company Difficulty Distribution")
+        fig3 = figure_cache.figure("pie", values=difficulty_counts.values, names=difficulty_counts.index,
+                                         title="Company Difficulty Distribution")
         st.plotly_chart(fig3, use_container_width=True)
     
     def company_portal(self):
@@ -264,6 +453,7 @@ class PlacementModule:
         st.write("Post job openings for students")
         
         with st.form("job_posting"):
+            company_name = st.text_input("Company Name*")
             job_title = st.text_input("Job Title*")
             
             col1, col2 = st.columns(2)
@@ -289,4 +479,25 @@ class PlacementModule:
             job_description = st.text_area("Job Description*", height=150)
             
             if st.form_submit_button("Post Job Opening"):
+                if not (company_name and job_title and location and job_description):
+                    st.error("Please fill in all required fields (*)")
+                    return
+                
+                from database.db_manager import get_db_manager
+                from utils.incremental_matching import database_matcher
+                db = get_db_manager()
+                # Loaded (or built) before posting, so the new job is added as one column
+                matcher = database_matcher(db)
+                job_id = db.create_job_posting(db.get_or_create_company(company_name), job_title, job_description,
+                                               job_type, location, salary, salary, vacancies, cgpa_min,
+                                               backlogs_allowed, required_skills)
                 st.success(f"Job '{job_title}' posted successfully!")
+                
+                eligible = db.get_eligibility_index().count(min_cgpa=cgpa_min, max_backlogs=backlogs_allowed)
+                st.info(f"{eligible} unplaced students currently meet these CGPA and backlog cutoffs.")
+                
+                candidates = matcher.top_students(job_id, n=10)
+                if not candidates.empty:
+                    st.write("**Best matching students:**")
+                    st.dataframe(candidates[["student_name", "department", "cgpa", "match_score", "reason"]],
+                                 use_container_width=True, hide_index=True)
@@ -2,10 +2,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from utils.eligibility_index import EligibilityIndex
+from modules.paginated_list import paginate
 
 class PMInternshipAI:
     def __init__(self):
         self.internship_data = self.load_internship_data()
+        self.cgpa_index = EligibilityIndex(self.internship_data, cgpa_column='eligibility_cgpa',
+                                           backlog_column=None, department_column=None)
         self.skills_required = {
             "Technical": ["SQL", "Data Analysis", "A/B Testing", "Metrics Definition", 
                          "API Understanding", "Basic Coding"],
@@ -70,19 +74,19 @@ class PMInternshipAI:
         with col3:
             stipend_filter = st.slider("Minimum Stipend (₹)", 0, 100000, 50000, 5000)
         
-        # Apply filters
-        filtered_data = self.internship_data.copy()
+        # Apply filters, starting from the internships open to this CGPA
+        filtered_data = self.cgpa_index.select(max_cgpa=cgpa_filter)
         
         if "All" not in location_filter and location_filter:
             filtered_data = filtered_data[filtered_data['location'].isin(location_filter)]
         
-        filtered_data = filtered_data[filtered_data['eligibility_cgpa'] <= cgpa_filter]
         filtered_data = filtered_data[filtered_data['stipend'] >= stipend_filter]
         
         # Display internships
         st.subheader(f"Found {len(filtered_data)} Internships")
         
-        for _, internship in filtered_data.iterrows():
+        for internship in paginate(filtered_data, "pm_internships",
+                                   reset_on=(tuple(location_filter), cgpa_filter, stipend_filter)):
             with st.expander(f"**{internship['role']} at {internship['company']}**"):
                 col1, col2 = st.columns(2)
                 with col1:
@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
+from utils.feature_store import profile_to_vector
+from utils.ai_helpers import placement_probability_from_matrix
 
 class StudentFlow:
     def __init__(self):
@@ -290,20 +292,16 @@ class StudentFlow:
         st.info("Predict your placement probability")
         
         profile = self.student_data.get("profile", {})
-        
-        # Simple prediction based on CGPA
-        cgpa = profile.get("cgpa", 7.0)
-        if cgpa >= 8.5:
-            probability = "85-95%"
+        # Same feature-store row and scoring the batch predictors use
+        score = placement_probability_from_matrix(profile_to_vector(profile)[None, :])[0]
+        probability = f"{score:.0%}"
+        if score >= 0.85:
             recommendation = "🎉 Excellent! High chance of placement in top companies"
-        elif cgpa >= 7.5:
-            probability = "70-85%"
+        elif score >= 0.7:
             recommendation = "📈 Good potential with proper preparation"
-        elif cgpa >= 6.5:
-            probability = "50-70%"
+        elif score >= 0.5:
             recommendation = "📚 Needs focused effort and skill improvement"
         else:
-            probability = "30-50%"
             recommendation = "🎯 Requires immediate action on academics and skills"
         
         st.metric("Placement Probability", probability)
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from utils.schema import apply_schema
 
 class StudentInfoModule:
     def __init__(self):
@@ -23,7 +24,7 @@ class StudentInfoModule:
             'placement_company': ['Google', 'Microsoft', None, 'Amazon', None],
             'resume_link': ['resume1.pdf', 'resume2.pdf', 'resume3.pdf', 'resume4.pdf', 'resume5.pdf']
         }
-        return pd.DataFrame(data)
+        return apply_schema(pd.DataFrame(data), "student_profiles")
     
     def display(self):
         """Display student information module"""
@@ -146,7 +147,8 @@ class StudentInfoModule:
                 })
                 
                 # Use pd.concat instead of append (append is deprecated)
-                self.students_df = pd.concat([self.students_df, new_student], ignore_index=True)
+                self.students_df = apply_schema(pd.concat([self.students_df, new_student], ignore_index=True),
+                                                "student_profiles")
                 st.success(f"Student {name} added successfully!")
                 st.rerun()
     
@@ -210,7 +212,8 @@ class StudentInfoModule:
             pivot_table = numeric_data.pivot_table(
                 values='cgpa', 
                 index='department', 
-                aggfunc=['mean', 'count', 'min', 'max']
+                aggfunc=['mean', 'count', 'min', 'max'],
+                observed=True
             )
             
             # Flatten column names
@@ -230,7 +233,7 @@ class StudentInfoModule:
         except Exception as e:
             st.warning(f"Could not create detailed analysis: {str(e)}")
             # Fallback: simple department-CGPA table
-            simple_table = self.students_df[['department', 'cgpa']].groupby('department').agg({
+            simple_table = self.students_df[['department', 'cgpa']].groupby('department', observed=True).agg({
                 'cgpa': ['mean', 'count']
             }).round(2)
             st.dataframe(simple_table, use_container_width=True)
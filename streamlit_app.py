@@ -9,10 +9,8 @@ except ImportError as e:
     DB_AVAILABLE = False
     st.warning(f"Database module not available: {e}")
 
-from modules.workflow_manager import WorkflowManager
-from modules.student_flow import StudentFlow
-from modules.college_flow import CollegeFlow
-from modules.recruiter_flow import RecruiterFlow
+# Flows (and their heavy imports) are built only when their role is first selected
+from modules.flow_registry import flow_for_role, get_flow
 
 # Page configuration
 st.set_page_config(
@@ -23,17 +21,7 @@ st.set_page_config(
 )
 
 # Initialize session state
-if 'workflow_manager' not in st.session_state:
-    st.session_state.workflow_manager = WorkflowManager()
-
-if 'student_flow' not in st.session_state:
-    st.session_state.student_flow = StudentFlow()
-
-if 'college_flow' not in st.session_state:
-    st.session_state.college_flow = CollegeFlow()
-
-if 'recruiter_flow' not in st.session_state:
-    st.session_state.recruiter_flow = RecruiterFlow()
+workflow_manager = get_flow(st.session_state, 'workflow_manager')
 
 if 'selected_role' not in st.session_state:
     st.session_state.selected_role = None
@@ -82,30 +70,32 @@ with st.sidebar:
     
     # Show workflow based on selected role
     if st.session_state.selected_role == "👨‍🎓 Student":
-        st.session_state.workflow_manager.display_student_workflow()
+        workflow_manager.display_student_workflow()
     elif st.session_state.selected_role == "🏫 College Admin":
-        st.session_state.workflow_manager.display_college_workflow()
+        workflow_manager.display_college_workflow()
     elif st.session_state.selected_role == "💼 Recruiter":
-        st.session_state.workflow_manager.display_recruiter_workflow()
+        workflow_manager.display_recruiter_workflow()
     else:
-        st.session_state.workflow_manager.display_observer_dashboard()
+        workflow_manager.display_observer_dashboard()
 
 # Main content
+flow = flow_for_role(st.session_state, st.session_state.selected_role)
+
 if st.session_state.selected_role == "👨‍🎓 Student":
     current_step = st.session_state.get('current_step_student', 1)
-    st.session_state.student_flow.current_step = current_step
-    st.session_state.student_flow.display()
+    flow.current_step = current_step
+    flow.display()
     
 elif st.session_state.selected_role == "🏫 College Admin":
     current_step = st.session_state.get('current_step_college', 1)
-    st.session_state.college_flow.current_step = current_step
-    st.session_state.college_flow.display()
+    flow.current_step = current_step
+    flow.display()
     
 elif st.session_state.selected_role == "💼 Recruiter":
-    st.session_state.recruiter_flow.display()
+    flow.display()
     
 else:
-    st.session_state.workflow_manager.display_observer_view()
+    workflow_manager.display_observer_view()
 
 # Footer
 st.divider()
@@ -2,6 +2,11 @@
 AI helper functions for the campus placement platform
 """
 
+import numpy as np
+import pandas as pd
+
+from utils.feature_store import FEATURE_DEFAULTS, FEATURE_INDEX, STORE_COLUMNS, profile_to_vector
+
 def analyze_resume_text(resume_text):
     """
     Analyze resume text for improvements
@@ -24,37 +29,80 @@ def analyze_resume_text(resume_text):
     
     return analysis
 
-def predict_placement_probability(student_data):
+def placement_probability_from_matrix(matrix):
     """
-    Predict placement probability based on student data
+    Placement probability per row of a feature-store matrix (STORE_COLUMNS
+    layout, e.g. from FeatureStore.get_feature_matrix)
     """
-    # Simple prediction logic (replace with ML model in production)
-    score = 0
-    
-    # CGPA contribution
-    cgpa = student_data.get('cgpa', 7.0)
-    score += min(cgpa * 7.5, 30)  # Max 30 points for CGPA
+    def column(name):
+        return matrix[:, FEATURE_INDEX[name]]
     
-    # Internships contribution
-    internships = student_data.get('internships', 0)
-    score += internships * 10  # 10 points per internship
+    # Simple scoring (replace with ML model in production)
+    score = (
+        np.minimum(column('cgpa') * 7.5, 30) +         # Max 30 points for CGPA
+        column('internships') * 10 +                   # 10 points per internship
+        np.minimum(column('projects') * 5, 20) +       # Max 20 points for projects
+        np.minimum(column('skill_count') * 3, 15) -    # Max 15 points for skills
+        column('backlogs') * 5                         # Backlogs penalty
+    )
     
-    # Projects contribution
-    projects = student_data.get('projects', 0)
-    score += min(projects * 5, 20)  # Max 20 points for projects
-    
-    # Skills contribution
-    skills = student_data.get('skills', [])
-    score += min(len(skills) * 3, 15)  # Max 15 points for skills
-    
-    # Backlogs penalty
-    backlogs = student_data.get('backlogs', 0)
-    score -= backlogs * 5
+    # Normalize to probability
+    return np.clip(score, 0, 100) / 100
+
+def predict_placement_probability(student_data):
+    """
+    Predict placement probability based on student data, read through the
+    feature store's profile mapping
+    """
+    return float(placement_probability_from_matrix(profile_to_vector(student_data)[None, :])[0])
+
+def _column(data, name, default, n):
+    """Column from a DataFrame/mapping as a Series, with missing values set to default"""
+    if name in data:
+        column = pd.Series(data[name]).reset_index(drop=True)
+        return column.where(column.notna(), default)
+    return pd.Series([default] * n)
+
+def _row_count(data):
+    if isinstance(data, pd.DataFrame):
+        return len(data)
+    return max((len(v) for v in data.values()), default=0)
+
+def _skill_counts(skills):
+    """Number of skills per row, from lists or comma-separated strings"""
+    return skills.map(lambda s: len([x for x in s.split(',') if x.strip()]) if isinstance(s, str)
+                      else len(s) if isinstance(s, (list, tuple, np.ndarray)) else 0)
+
+def _feature_matrix(data):
+    """Feature-store matrix for a DataFrame or mapping of columns, row for row"""
+    n = _row_count(data)
+    matrix = np.tile([FEATURE_DEFAULTS[c] for c in STORE_COLUMNS], (n, 1)).astype(np.float64)
+    for name in STORE_COLUMNS:
+        if name in data:
+            matrix[:, FEATURE_INDEX[name]] = _column(data, name, FEATURE_DEFAULTS[name], n).to_numpy(dtype=np.float64)
     
-    # Normalize to percentage
-    probability = max(0, min(100, score)) / 100
+    # Profiles carry skill lists rather than a count
+    if 'skill_count' not in data:
+        for name in ('skills', 'technical_skills'):
+            if name in data:
+                matrix[:, FEATURE_INDEX['skill_count']] = _skill_counts(_column(data, name, '', n)).to_numpy()
+                break
+    return matrix
+
+def predict_placement_probability_batch(data):
+    """
+    Vectorized predict_placement_probability.
     
-    return probability
+    ``data`` is a feature-store matrix, or a DataFrame or mapping of column
+    name -> array with any of the store columns plus skills (lists) or
+    technical_skills (comma-separated), which is mapped onto the store
+    layout first. Returns a float array of probabilities, one per row,
+    matching the scalar function row for row. Missing columns and missing
+    values take the feature store defaults.
+    """
+    if isinstance(data, np.ndarray):
+        return placement_probability_from_matrix(data)
+    return placement_probability_from_matrix(_feature_matrix(data))
 
 def get_career_recommendations(student_profile):
     """
@@ -87,3 +135,56 @@ def get_career_recommendations(student_profile):
     recommendations.sort(key=lambda x: x['match'], reverse=True)
     
     return recommendations[:3]  # Return top 3
+
+_CAREER_OPTIONS = [
+    ("Data Science", 85, "Python skills are essential for Data Science roles"),
+    ("Software Development", 80, "Python is widely used in software development"),
+    ("Product Management", 75, "High academic performance suitable for PM roles")
+]
+
+# Option indices for each (python skills, cgpa >= 8.0) combination, in
+# descending match order; -1 pads unused ranks
+_CAREER_COMBINATIONS = np.array([
+    [-1, -1, -1],
+    [2, -1, -1],
+    [0, 1, -1],
+    [0, 1, 2]
+])
+
+def get_career_recommendations_batch(data):
+    """
+    Vectorized get_career_recommendations.
+    
+    ``data`` is a DataFrame or mapping with technical_skills and cgpa
+    columns. Returns a long DataFrame with one row per recommendation:
+    ``row`` (position of the input row), ``rank``, ``career``, ``match`` and
+    ``reason``, in the same order the scalar function returns them. Skill
+    lists are joined before matching (the scalar version expects a string).
+    """
+    n = _row_count(data)
+    
+    skills = _column(data, 'technical_skills', '', n)
+    is_list = skills.map(type).isin([list, tuple])
+    if is_list.any():
+        skills = skills.copy()
+        skills[is_list] = skills[is_list].str.join(', ')
+    
+    has_python = (
+        skills.astype(str).str.lower().str.contains('python', regex=False).to_numpy() &
+        skills.astype(bool).to_numpy()
+    )
+    high_cgpa = _column(data, 'cgpa', 0, n).to_numpy(dtype=np.float64) >= 8.0
+    
+    options = _CAREER_COMBINATIONS[has_python.astype(np.int8) * 2 + high_cgpa.astype(np.int8)]
+    rows, ranks = np.nonzero(options >= 0)
+    picked = options[rows, ranks]
+    
+    careers, matches, reasons = (np.array(values, dtype=object) for values in zip(*_CAREER_OPTIONS))
+    
+    return pd.DataFrame({
+        'row': rows,
+        'rank': ranks,
+        'career': careers[picked],
+        'match': matches[picked].astype(np.int64),
+        'reason': reasons[picked]
+    })
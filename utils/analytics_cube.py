@@ -0,0 +1,161 @@
+"""
+Pre-aggregated analytics cube over student and placement records
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+STUDENT_DIMENSIONS = ["department", "company", "graduation_year", "placement_status", "package_bucket"]
+PLACEMENT_DIMENSIONS = ["department", "company", "status", "package_bucket"]
+
+MEASURES = ["count", "valued", "total", "min", "max"]
+
+_versions = itertools.count(1)
+
+
+class AnalyticsCube:
+    """
+    Counts plus sum/min/max of a value (package) for every combination of
+    dimension values that occurs in a frame, built with one groupby and
+    kept as integer codes per dimension.
+
+    Any filter combination is then a mask over the cells and a rollup of
+    what is left, so reports cost O(cells) instead of a pass over the rows.
+    Values are bucketed into ``bucket_width`` wide ``package_bucket`` cells
+    (lower edge, NaN when there is no value), which is the resolution of
+    value-range filters; min and max stay exact.
+    """
+
+    def __init__(self, frame, dimensions=STUDENT_DIMENSIONS, value="package", bucket_width=1.0):
+        # Unique per build, so it identifies the data version in cache keys
+        self.version = next(_versions)
+        self.bucket_width = bucket_width
+        values = pd.to_numeric(frame[value], errors="coerce") if value in frame \
+            else pd.Series(np.nan, index=frame.index)
+
+        rows = pd.DataFrame({
+            name: (np.floor(values / bucket_width) * bucket_width if name == "package_bucket" else frame[name])
+            for name in dimensions if name == "package_bucket" or name in frame
+        })
+        self.dimensions = list(rows.columns)
+        rows["value"] = values
+
+        self.cells = rows.groupby(self.dimensions, dropna=False, sort=False, observed=True).agg(
+            count=("value", "size"),
+            valued=("value", "count"),
+            total=("value", "sum"),
+            min=("value", "min"),
+            max=("value", "max")
+        ).reset_index()
+
+        # Integer codes per dimension (-1 for missing) so slices and rollups stay in numpy
+        self._codes, self._levels = {}, {}
+        for name in self.dimensions:
+            self._codes[name], self._levels[name] = pd.factorize(self.cells[name], use_na_sentinel=True)
+        self._measures = {name: self.cells[name].to_numpy(dtype=float) for name in MEASURES}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def values(self, dimension):
+        """Distinct non-missing values of a dimension, sorted"""
+        return sorted(self._levels[dimension].tolist())
+
+    def _mask(self, filters=None, value_range=None):
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dimension, wanted in (filters or {}).items():
+            if not isinstance(wanted, (list, tuple, set, np.ndarray, pd.Index)):
+                wanted = [wanted]
+            elif len(wanted) == 0:
+                continue
+            wanted_codes = self._levels[dimension].get_indexer(list(wanted))
+            mask &= np.isin(self._codes[dimension], wanted_codes[wanted_codes >= 0])
+
+        if value_range is not None:
+            low, high = value_range
+            buckets = self.cells["package_bucket"].to_numpy(dtype=float)
+            with np.errstate(invalid="ignore"):
+                mask &= (buckets >= np.floor(low / self.bucket_width) * self.bucket_width) & (buckets < high)
+        return mask
+
+    def slice(self, filters=None, value_range=None):
+        """
+        Cells matching ``filters`` ({dimension: value or list of values};
+        an empty list means no filter) and, if given, with a value bucket
+        inside ``value_range`` (low, high).
+        """
+        return self.cells[self._mask(filters, value_range)]
+
+    def _groups(self, by, mask):
+        """(group keys, group number per masked cell, code sizes) for grouping cells by dimensions"""
+        if not by:
+            return np.zeros(1, dtype=np.int64), np.zeros(int(mask.sum()), dtype=np.int64), []
+        # Shift codes so missing values (-1) form their own group
+        codes = [self._codes[name][mask] + 1 for name in by]
+        sizes = [len(self._levels[name]) + 1 for name in by]
+        keys, group = np.unique(np.ravel_multi_index(codes, sizes), return_inverse=True)
+        return keys, group, sizes
+
+    def _labels(self, result, by, keys, sizes):
+        """Insert the dimension values of each group as leading columns"""
+        for position, (name, codes) in enumerate(zip(by, np.unravel_index(keys, sizes) if by else [])):
+            levels = self._levels[name]
+            result.insert(position, name, pd.Series([levels[c - 1] if c else np.nan for c in codes], dtype=object))
+        return result
+
+    def rollup(self, by=(), filters=None, value_range=None):
+        """
+        Measures of the matching cells grouped by ``by`` (a list of
+        dimensions, or empty for one grand-total row), with the mean value.
+        """
+        by = list(by)
+        mask = self._mask(filters, value_range)
+        keys, group, sizes = self._groups(by, mask)
+        n = len(keys)
+
+        measures = {name: values[mask] for name, values in self._measures.items()}
+        lows, highs = np.full(n, np.nan), np.full(n, np.nan)
+        has_value = ~np.isnan(measures["min"])
+        np.fmin.at(lows, group[has_value], measures["min"][has_value])
+        np.fmax.at(highs, group[has_value], measures["max"][has_value])
+
+        result = pd.DataFrame({
+            "count": np.bincount(group, measures["count"], n).astype("int64"),
+            "valued": np.bincount(group, measures["valued"], n).astype("int64"),
+            "total": np.bincount(group, measures["total"], n),
+            "min": lows,
+            "max": highs
+        })
+        result["mean"] = result["total"] / np.where(result["valued"] > 0, result["valued"], np.nan)
+        return self._labels(result, by, keys, sizes)
+
+    def totals(self, filters=None, value_range=None):
+        """The grand-total rollup as a dict"""
+        row = self.rollup((), filters, value_range).iloc[0]
+        return {**row.to_dict(), "count": int(row["count"]), "valued": int(row["valued"])}
+
+    def rate(self, by, matching, filters=None, value_range=None):
+        """
+        Share (%) of each ``by`` group's rows that also match ``matching``
+        (filters like {"placement_status": "Placed"}), e.g. placement rate
+        per department, with the mean value of the matching rows.
+        ``filters`` narrow both sides; ``value_range`` only the matching side.
+        """
+        by = list(by)
+        base = self._mask(filters)
+        # The matching cells are a subset of the base cells, so one grouping serves both
+        hits = self._mask({**(filters or {}), **matching}, value_range)[base]
+        keys, group, sizes = self._groups(by, base)
+        n = len(keys)
+
+        count = self._measures["count"][base]
+        valued = np.bincount(group, self._measures["valued"][base] * hits, n)
+        result = pd.DataFrame({
+            "count": np.bincount(group, count, n).astype("int64"),
+            "matching": np.bincount(group, count * hits, n).astype("int64")
+        })
+        result["mean"] = np.bincount(group, self._measures["total"][base] * hits, n) / np.where(valued > 0, valued, np.nan)
+        result["rate"] = result["matching"] / result["count"].where(result["count"] > 0) * 100
+        return self._labels(result, by, keys, sizes)
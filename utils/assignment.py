@@ -0,0 +1,122 @@
+"""
+Vacancy-constrained assignment of students to companies over a score matrix
+"""
+
+import time
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # pragma: no cover - scipy is optional
+    linear_sum_assignment = None
+
+# Largest students x slots cost matrix handed to the Hungarian solver
+MAX_HUNGARIAN_CELLS = 25_000_000
+
+
+def expand_slots(capacities):
+    """Company index of every vacancy slot"""
+    capacities = np.asarray(capacities, dtype=np.int64).clip(min=0)
+    return np.repeat(np.arange(len(capacities)), capacities)
+
+
+def _hungarian(scores, allowed, capacities):
+    """Optimal assignment on the students x slots matrix"""
+    students = np.flatnonzero(allowed.any(axis=1))
+
+    # A company never needs more slots than it has eligible students
+    slot_capacity = np.minimum(capacities, allowed[students].sum(axis=0))
+    slot_company = expand_slots(slot_capacity)
+    if len(students) == 0 or len(slot_company) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Disallowed pairs are worth nothing and are dropped afterwards, which
+    # keeps the optimum over the allowed pairs
+    value = np.where(allowed[students], scores[students], 0.0)
+    rows, slots = linear_sum_assignment(value[:, slot_company], maximize=True)
+
+    companies = slot_company[slots]
+    keep = allowed[students[rows], companies]
+    return students[rows[keep]], companies[keep]
+
+
+def _greedy(scores, allowed, capacities):
+    """
+    Round-based greedy: every unassigned student proposes to their best
+    company that still has room, and each company accepts its highest
+    scoring proposals up to its remaining vacancies.
+    """
+    n_students, n_companies = scores.shape
+    available = allowed & (capacities > 0)[None, :]
+    remaining = capacities.copy()
+    assigned = np.full(n_students, -1, dtype=np.int64)
+
+    while True:
+        proposers = np.flatnonzero((assigned < 0) & available.any(axis=1))
+        if len(proposers) == 0:
+            break
+
+        choice = np.where(available[proposers], scores[proposers], -np.inf).argmax(axis=1)
+        order = np.lexsort((-scores[proposers, choice], choice))
+        proposers, choice = proposers[order], choice[order]
+
+        # Rank of each proposal within its company, best first
+        first = np.searchsorted(choice, choice, side="left")
+        accept = np.arange(len(choice)) - first < remaining[choice]
+
+        assigned[proposers[accept]] = choice[accept]
+        remaining -= np.bincount(choice[accept], minlength=n_companies)
+        available[proposers[~accept], choice[~accept]] = False
+        available[:, remaining <= 0] = False
+
+    students = np.flatnonzero(assigned >= 0)
+    return students, assigned[students]
+
+
+def assign_students(scores, capacities, min_score=0, method="auto",
+                    max_cells=MAX_HUNGARIAN_CELLS):
+    """
+    Give each student at most one company, and each company at most its
+    capacity, maximising the total score of pairs scoring >= min_score.
+
+    ``method`` is "hungarian", "greedy" or "auto" (Hungarian when scipy is
+    installed and the expanded matrix fits in ``max_cells``). Returns a dict
+    with the assigned ``students`` and ``companies`` index arrays, their
+    ``scores``, the ``total_score``, the ``method`` used and
+    ``solve_time_ms``.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    capacities = np.asarray(capacities, dtype=np.int64).clip(min=0)
+    if scores.ndim != 2 or scores.shape[1] != len(capacities):
+        raise ValueError("Need one capacity per score matrix column")
+
+    allowed = scores >= min_score
+
+    if method == "auto":
+        cells = int(allowed.any(axis=1).sum()) * int(capacities.sum())
+        method = "hungarian" if linear_sum_assignment is not None and cells <= max_cells else "greedy"
+    if method == "hungarian" and linear_sum_assignment is None:
+        raise ValueError("The Hungarian method needs scipy")
+    if method not in ("hungarian", "greedy"):
+        raise ValueError(f"Unknown assignment method: {method}")
+
+    start = time.perf_counter()
+    if method == "hungarian":
+        students, companies = _hungarian(scores, allowed, capacities)
+    else:
+        students, companies = _greedy(scores, allowed, capacities)
+    solve_time_ms = (time.perf_counter() - start) * 1000
+
+    order = np.argsort(-scores[students, companies], kind="stable")
+    students, companies = students[order], companies[order]
+    picked = scores[students, companies]
+
+    return {
+        "students": students,
+        "companies": companies,
+        "scores": picked,
+        "total_score": float(picked.sum()),
+        "method": method,
+        "solve_time_ms": solve_time_ms
+    }
@@ -0,0 +1,343 @@
+"""
+Time-indexed campus calendar: drives, registration deadlines and interviews
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+DEFAULT_INTERVIEW_MINUTES = 60
+
+# CollegeFlow frame -> its row id column
+SOURCES = {
+    "drives": "drive_id",
+    "interviews": "interview_id"
+}
+
+
+def _when(date, clock=None):
+    """datetime from a YYYY-MM-DD date and optional HH:MM time, or None"""
+    if date is None or pd.isna(date) or not str(date).strip():
+        return None
+    try:
+        day = datetime.strptime(str(date)[:10], "%Y-%m-%d")
+    except ValueError:
+        return None
+    if clock is not None and not pd.isna(clock) and str(clock).strip():
+        try:
+            moment = datetime.strptime(str(clock).strip()[:5], "%H:%M")
+            return day.replace(hour=moment.hour, minute=moment.minute)
+        except ValueError:
+            pass
+    return day
+
+
+def _value(row, name, default=None):
+    value = row.get(name, default)
+    return default if value is None or (not isinstance(value, (list, tuple)) and pd.isna(value)) else value
+
+
+def _ics_text(value):
+    return (str(value).replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+class CalendarIndex:
+    """
+    Events kept sorted by start time, globally and per resource (company,
+    student, interviewer, venue), so range queries are a bisect plus the
+    events returned.
+
+    Overlap queries search starts from ``start - longest event``, which is
+    exact because no event can reach further back than that. Source frames
+    are synced by row hash, so only new, changed or removed rows touch the
+    index, the analytics counters and the cached ICS blocks.
+    """
+
+    def __init__(self):
+        self.events = {}
+        self._order = []
+        self._by_resource = defaultdict(list)
+        self._longest = timedelta(0)
+        self._row_hashes = {}
+
+        self.version = 0
+        self._removed = {}
+        self._ics_blocks = {}
+
+        self._monthly = Counter()
+        self._companies = defaultdict(Counter)
+
+    def __len__(self):
+        return len(self.events)
+
+    # === MAINTENANCE ===
+
+    def add(self, uid, kind, title, start, end, resources=(), status=None, data=None):
+        """Add or replace an event"""
+        sequence = 0
+        if uid in self.events:
+            sequence = self.events[uid]["sequence"] + 1
+            self.remove(uid, tombstone=False)
+
+        self.version += 1
+        event = {
+            "uid": uid, "kind": kind, "title": title, "start": start, "end": max(end, start),
+            "resources": tuple(resources), "status": status, "data": data or {},
+            "sequence": sequence, "version": self.version
+        }
+        self.events[uid] = event
+        self._removed.pop(uid, None)
+
+        key = (start, uid)
+        insort(self._order, key)
+        for resource in event["resources"]:
+            insort(self._by_resource[resource], key)
+        self._longest = max(self._longest, event["end"] - start)
+        self._count(event, 1)
+        return event
+
+    def remove(self, uid, tombstone=True):
+        """Drop an event; returns False if unknown"""
+        event = self.events.pop(uid, None)
+        if event is None:
+            return False
+
+        key = (event["start"], uid)
+        del self._order[bisect_left(self._order, key)]
+        for resource in event["resources"]:
+            keys = self._by_resource[resource]
+            del keys[bisect_left(keys, key)]
+        self._ics_blocks.pop(uid, None)
+        self._count(event, -1)
+
+        if tombstone:
+            self.version += 1
+            self._removed[uid] = {**event, "status": "Cancelled", "sequence": event["sequence"] + 1,
+                                  "version": self.version}
+        return True
+
+    def _count(self, event, sign):
+        """Keep the analytics counters in step with the events"""
+        self._monthly[(event["kind"], event["start"].strftime("%Y-%m"))] += sign
+        if event["kind"] == "drive":
+            company = self._companies[event["data"].get("company")]
+            company["drives"] += sign
+            company["completed"] += sign * (event["status"] == "Completed")
+            company["registered"] += sign * int(_value(event["data"], "registered", 0))
+            company["selected"] += sign * int(_value(event["data"], "selected", 0))
+
+    def sync(self, source, frame):
+        """
+        Bring the events built from a CollegeFlow frame ("drives" or
+        "interviews") in line with it. Returns the number of rows that
+        changed.
+        """
+        id_column = SOURCES[source]
+        if frame.empty:
+            hashes = {}
+        else:
+            ids = frame[id_column].astype(str).to_numpy()
+            values = pd.util.hash_pandas_object(frame.astype(str), index=False).to_numpy()
+            hashes = dict(zip(ids, values))
+
+        known = self._row_hashes.get(source, {})
+        changed = [row_id for row_id, value in hashes.items() if known.get(row_id) != value]
+        removed = [row_id for row_id in known if row_id not in hashes]
+
+        if changed:
+            rows = frame[frame[id_column].astype(str).isin(changed)].to_dict("records")
+            builder = self._drive_events if source == "drives" else self._interview_events
+            for row in rows:
+                events = builder(row)
+                # Replacing in place keeps UIDs and bumps their ICS SEQUENCE
+                kept = {event["uid"] for event in events}
+                for uid in self._source_uids(source, str(row[id_column])):
+                    if uid not in kept:
+                        self.remove(uid)
+                for event in events:
+                    self.add(**event)
+        for row_id in removed:
+            for uid in self._source_uids(source, row_id):
+                self.remove(uid)
+
+        self._row_hashes[source] = hashes
+        return len(changed) + len(removed)
+
+    @staticmethod
+    def _source_uids(source, row_id):
+        if source == "drives":
+            return [f"drive-{row_id}", f"deadline-{row_id}"]
+        return [f"interview-{row_id}"]
+
+    @staticmethod
+    def _drive_events(row):
+        drive_id, company = str(row["drive_id"]), _value(row, "company", "")
+        start = _when(_value(row, "date"), _value(row, "time"))
+        if start is None:
+            return []
+
+        day_end = start.replace(hour=0, minute=0) + timedelta(days=1)
+        resources = [("company", company)]
+        if _value(row, "venue"):
+            resources.append(("venue", row["venue"]))
+
+        events = [{
+            "uid": f"drive-{drive_id}", "kind": "drive", "title": f"{company} campus drive",
+            "start": start, "end": day_end, "resources": resources,
+            "status": _value(row, "status"), "data": row
+        }]
+        deadline = _when(_value(row, "registration_deadline"))
+        if deadline is not None:
+            events.append({
+                "uid": f"deadline-{drive_id}", "kind": "deadline",
+                "title": f"{company} drive registration closes",
+                "start": deadline, "end": deadline + timedelta(days=1),
+                "resources": [("company", company)], "status": _value(row, "status"), "data": row
+            })
+        return events
+
+    @staticmethod
+    def _interview_events(row):
+        start = _when(_value(row, "date"), _value(row, "time"))
+        if start is None:
+            return []
+
+        minutes = float(_value(row, "duration", DEFAULT_INTERVIEW_MINUTES))
+        resources = [("student", str(row["student_id"])), ("company", _value(row, "company", ""))]
+        for kind in ("interviewer", "venue"):
+            if _value(row, kind):
+                resources.append((kind, str(row[kind])))
+
+        return [{
+            "uid": f"interview-{row['interview_id']}", "kind": "interview",
+            "title": f"{_value(row, 'round', 'Interview')}: {_value(row, 'student_name', row['student_id'])} "
+                     f"with {_value(row, 'company', '')}",
+            "start": start, "end": start + timedelta(minutes=minutes),
+            "resources": resources, "status": _value(row, "status"), "data": row
+        }]
+
+    # === QUERIES ===
+
+    def between(self, start=None, end=None, kinds=None, resource=None):
+        """
+        Events overlapping [start, end), sorted by start. Either bound may be
+        None; ``resource`` is a (kind, name) pair such as ("student", "S1001").
+        """
+        keys = self._order if resource is None else self._by_resource.get(resource, [])
+        lo = 0 if start is None else bisect_left(keys, (start - self._longest,))
+        hi = len(keys) if end is None else bisect_left(keys, (end,))
+
+        events = []
+        for _, uid in keys[lo:hi]:
+            event = self.events[uid]
+            if start is not None and event["end"] <= start:
+                continue
+            if kinds is None or event["kind"] in kinds:
+                events.append(event)
+        return events
+
+    def day(self, date, **filters):
+        start = datetime.combine(date, datetime.min.time())
+        return self.between(start, start + timedelta(days=1), **filters)
+
+    def week(self, date, **filters):
+        """Events in the Monday-Sunday week containing date"""
+        start = datetime.combine(date - timedelta(days=date.weekday()), datetime.min.time())
+        return self.between(start, start + timedelta(days=7), **filters)
+
+    def overlaps(self, resource, kinds=None):
+        """Pairs of a resource's events that overlap in time"""
+        events = self.between(resource=resource, kinds=kinds)
+        pairs = []
+        # Sorted by start, so a sweep with the still-open events finds every pair
+        active = []
+        for event in events:
+            active = [a for a in active if a["end"] > event["start"]]
+            pairs.extend((a, event) for a in active)
+            active.append(event)
+        return pairs
+
+    def frame(self, events):
+        """Display rows for a list of events"""
+        return pd.DataFrame([{
+            "kind": e["kind"],
+            "title": e["title"],
+            "start": e["start"],
+            "end": e["end"],
+            "status": e["status"],
+            "resources": ", ".join(name for _, name in e["resources"] if name)
+        } for e in events], columns=["kind", "title", "start", "end", "status", "resources"])
+
+    # === ANALYTICS ===
+
+    def monthly_counts(self, kind="drive"):
+        """Events per YYYY-MM month, from the running counters"""
+        counts = {month: n for (k, month), n in self._monthly.items() if k == kind and n}
+        return pd.Series(counts, dtype="int64").sort_index().rename_axis("month").rename("count")
+
+    def drive_stats(self):
+        """Drives, completed drives, registered and selected students per company"""
+        stats = pd.DataFrame.from_dict(
+            {company: dict(counts) for company, counts in self._companies.items() if counts["drives"] > 0},
+            orient="index", columns=["drives", "completed", "registered", "selected"]
+        ).fillna(0).astype("int64").rename_axis("company").reset_index()
+        stats["selection_rate"] = (stats["selected"] / stats["registered"].where(stats["registered"] > 0) * 100).round(1)
+        return stats
+
+    # === ICS EXPORT ===
+
+    def _ics_block(self, event):
+        """VEVENT text, cached per event until it changes"""
+        cached = self._ics_blocks.get(event["uid"])
+        if cached is not None and cached[0] == event["version"]:
+            return cached[1]
+
+        all_day = event["kind"] == "deadline" or (
+            event["kind"] == "drive" and not _value(event["data"], "time"))
+        if all_day:
+            dates = [f"DTSTART;VALUE=DATE:{event['start']:%Y%m%d}", f"DTEND;VALUE=DATE:{event['end']:%Y%m%d}"]
+        else:
+            dates = [f"DTSTART:{event['start']:%Y%m%dT%H%M%S}", f"DTEND:{event['end']:%Y%m%dT%H%M%S}"]
+
+        location = next((name for kind, name in event["resources"] if kind == "venue"), None)
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{event['uid']}@campus-placement",
+            f"DTSTAMP:{datetime.now():%Y%m%dT%H%M%S}",
+            *dates,
+            f"SUMMARY:{_ics_text(event['title'])}",
+            f"SEQUENCE:{event['sequence']}",
+            f"STATUS:{'CANCELLED' if event['status'] == 'Cancelled' else 'CONFIRMED'}"
+        ]
+        if location:
+            lines.append(f"LOCATION:{_ics_text(location)}")
+        lines.append("END:VEVENT")
+
+        block = "\r\n".join(lines)
+        if event["uid"] in self.events:
+            self._ics_blocks[event["uid"]] = (event["version"], block)
+        return block
+
+    def to_ics(self, events=None, since=None, name="Campus Placements"):
+        """
+        iCalendar text for some events (default: all). With ``since`` (a
+        previous ``version``), only events changed after it plus
+        cancellations of removed ones, for clients to merge by UID/SEQUENCE.
+        """
+        if events is None:
+            events = [self.events[uid] for _, uid in self._order]
+        if since is not None:
+            events = [e for e in events if e["version"] > since]
+            events += [e for e in self._removed.values() if e["version"] > since]
+
+        return "\r\n".join([
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Campus Placement//Calendar//EN",
+            f"X-WR-CALNAME:{_ics_text(name)}",
+            *(self._ics_block(e) for e in events),
+            "END:VCALENDAR"
+        ]) + "\r\n"
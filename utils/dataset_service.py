@@ -0,0 +1,201 @@
+"""
+Process-wide college datasets shared by every session, with per-session copy-on-write overlays
+"""
+
+import os
+import threading
+import time
+import weakref
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+
+import joblib
+import pandas as pd
+
+DEFAULT_SNAPSHOT_DIR = "data/snapshots"
+
+# Bump when generated tables change shape or dtypes, so older snapshots are not loaded
+SNAPSHOT_FORMAT = 2
+
+# Snapshots hold sample data dated relative to the day it was generated
+SNAPSHOT_MAX_AGE = timedelta(days=1)
+
+# Sessions get shallow copies of the shared frames; pandas 3.0 always uses Copy-on-Write
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def _buffer_addresses(series):
+    """Addresses of the memory buffers behind a column"""
+    values = series.array
+    if hasattr(values, "__arrow_array__"):
+        return {buffer.address for chunk in values.__arrow_array__().chunks
+                for buffer in chunk.buffers() if buffer is not None}
+    array = series.to_numpy(copy=False)
+    return {array.__array_interface__["data"][0]}
+
+
+def _frame(value):
+    """The DataFrame behind a dataset entry (plain frame or a store with .frame)"""
+    value = getattr(value, "frame", value)
+    return value if isinstance(value, pd.DataFrame) else None
+
+
+class SessionDataset(MutableMapping):
+    """
+    One session's view of a shared college dataset, used like the
+    college_data dict.
+
+    Frames start as shallow copies of the shared ones. pandas Copy-on-Write
+    (always on from pandas 3.0, enabled by this module on older versions)
+    copies only the blocks a session modifies, and reassigned entries live
+    in this session only, so the shared data is never changed. ``changed``
+    names the entries the session has reassigned or marked with touch(),
+    and ``version`` stamps the shared data it was made from.
+    """
+
+    def __init__(self, base, college_id, label=None, version=None):
+        self._data = {
+            name: value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+            for name, value in base.items()
+        }
+        self._base = base
+        self.college_id = college_id
+        self.label = label or f"session-{id(self):x}"
+        self.version = version
+        self.changed = set()
+
+    def __getitem__(self, name):
+        return self._data[name]
+
+    def __setitem__(self, name, value):
+        self._data[name] = value
+        self.changed.add(name)
+
+    def __delitem__(self, name):
+        del self._data[name]
+        self.changed.add(name)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def touch(self, name):
+        """Record an in-place change to an entry"""
+        self.changed.add(name)
+
+    def shared(self, name):
+        """The shared value of an entry, whatever this session has done to it"""
+        return self._base[name]
+
+    def memory_usage(self):
+        """Bytes per frame owned by this session vs still shared with the base dataset"""
+        usage = {}
+        for name, value in self._data.items():
+            frame, base = _frame(value), _frame(self._base.get(name))
+            if frame is None:
+                continue
+
+            owned = shared = 0
+            for column in frame.columns:
+                size = int(frame[column].memory_usage(deep=True, index=False))
+                if base is not None and column in base and \
+                        _buffer_addresses(frame[column]) & _buffer_addresses(base[column]):
+                    shared += size
+                else:
+                    owned += size
+            usage[name] = {"owned_bytes": owned, "shared_bytes": shared}
+        return usage
+
+
+class DatasetService:
+    """
+    Loads each college's data once per process, from a snapshot file when
+    one younger than ``max_age`` exists or else from a loader (saving a
+    snapshot for the next start), and hands sessions SessionDataset views
+    of it.
+    """
+
+    def __init__(self, snapshot_dir=DEFAULT_SNAPSHOT_DIR, max_age=SNAPSHOT_MAX_AGE):
+        self.snapshot_dir = snapshot_dir
+        self.max_age = max_age
+        self._bases = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._sessions = weakref.WeakValueDictionary()
+
+    def snapshot_path(self, college_id):
+        return os.path.join(self.snapshot_dir, f"college_{college_id}.v{SNAPSHOT_FORMAT}.joblib")
+
+    def _snapshot_fresh(self, path):
+        """Whether a snapshot exists and was written within max_age"""
+        if not os.path.exists(path):
+            return False
+        return datetime.now() - datetime.fromtimestamp(os.path.getmtime(path)) < self.max_age
+
+    def base(self, college_id, loader):
+        """The shared dataset for a college, loading it on first use"""
+        with self._lock:
+            if college_id not in self._bases:
+                path = self.snapshot_path(college_id)
+                if self._snapshot_fresh(path):
+                    data = joblib.load(path)
+                    saved = True
+                else:
+                    data = loader(college_id)
+                    saved = self.save_snapshot(college_id, data)
+                self._bases[college_id] = data
+                # The snapshot's write time stamps this data for anything derived from it
+                self._versions[college_id] = int(os.path.getmtime(path) if saved else time.time())
+            return self._bases[college_id]
+
+    def version(self, college_id):
+        """Stamp of a loaded college dataset, shared by every process that loads the same snapshot"""
+        return self._versions.get(college_id)
+
+    def save_snapshot(self, college_id, data):
+        """Write a college's dataset atomically; failures only cost the next start a reload. Returns whether it was written"""
+        path = self.snapshot_path(college_id)
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            joblib.dump(data, path + ".tmp")
+            os.replace(path + ".tmp", path)
+        except OSError:
+            return False
+        return True
+
+    def refresh(self, college_id):
+        """Forget a college's dataset and snapshot; existing sessions keep their view"""
+        with self._lock:
+            self._bases.pop(college_id, None)
+            self._versions.pop(college_id, None)
+            if os.path.exists(self.snapshot_path(college_id)):
+                os.remove(self.snapshot_path(college_id))
+
+    def session(self, college_id, loader, label=None):
+        """A new session view of a college's dataset"""
+        dataset = SessionDataset(self.base(college_id, loader), college_id, label, self.version(college_id))
+        self._sessions[id(dataset)] = dataset
+        return dataset
+
+    def memory_report(self):
+        """Shared bytes per college and owned/shared bytes per live session"""
+        rows = []
+        for college_id, data in self._bases.items():
+            size = sum(int(f.memory_usage(deep=True).sum()) for f in map(_frame, data.values()) if f is not None)
+            rows.append({"scope": "shared", "college_id": college_id, "owned_bytes": size, "shared_bytes": 0})
+
+        for dataset in list(self._sessions.values()):
+            usage = dataset.memory_usage()
+            rows.append({
+                "scope": dataset.label,
+                "college_id": dataset.college_id,
+                "owned_bytes": sum(u["owned_bytes"] for u in usage.values()),
+                "shared_bytes": sum(u["shared_bytes"] for u in usage.values())
+            })
+        return pd.DataFrame(rows, columns=["scope", "college_id", "owned_bytes", "shared_bytes"])
+
+
+dataset_service = DatasetService()
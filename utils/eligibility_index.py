@@ -0,0 +1,113 @@
+"""
+In-memory eligibility index: rows sorted by CGPA within (department, backlogs) buckets
+"""
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+# eligible_departments values meaning "no restriction"
+ANY_DEPARTMENT = {"All", "All Departments"}
+
+
+def _departments(value):
+    """Department filter as a set, or None for no restriction"""
+    if value is None or (not isinstance(value, (list, tuple, set)) and pd.isna(value)):
+        return None
+    if isinstance(value, str):
+        value = value.split(",")
+    departments = {str(d).strip() for d in value if str(d).strip()}
+    if not departments or departments & ANY_DEPARTMENT:
+        return None
+    return departments
+
+
+class EligibilityIndex:
+    """
+    Answers "which rows have CGPA in a range, at most N backlogs and one of
+    these departments" with a bisect per bucket instead of a frame scan.
+
+    Either bucket column may be None (or absent from the frame), in which
+    case every row falls in one bucket for it. Positions returned are row
+    positions in the indexed frame, usable with ``frame.iloc``.
+    """
+
+    def __init__(self, frame, cgpa_column="cgpa", backlog_column="backlogs",
+                 department_column="department"):
+        self.frame = frame
+        self.cgpa_column = cgpa_column
+
+        n = len(frame)
+        cgpa = frame[cgpa_column].to_numpy(dtype=np.float64)
+        backlogs = (frame[backlog_column].fillna(0).to_numpy(dtype=np.int64)
+                    if backlog_column and backlog_column in frame else np.zeros(n, dtype=np.int64))
+        departments = (frame[department_column].astype(str).to_numpy()
+                       if department_column and department_column in frame else np.full(n, ""))
+
+        order = np.lexsort((cgpa, backlogs, departments))
+        self._buckets = {}
+        if n:
+            departments, backlogs, cgpa = departments[order], backlogs[order], cgpa[order]
+            changes = np.flatnonzero((departments[1:] != departments[:-1]) | (backlogs[1:] != backlogs[:-1])) + 1
+            bounds = np.concatenate(([0], changes, [n]))
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                self._buckets[(str(departments[start]), int(backlogs[start]))] = (
+                    cgpa[start:end].tolist(),
+                    order[start:end]
+                )
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _ranges(self, min_cgpa=None, max_cgpa=None, max_backlogs=None, departments=None):
+        """(positions, lo, hi) slices of every matching bucket"""
+        departments = _departments(departments)
+
+        for (department, backlog), (values, positions) in self._buckets.items():
+            if max_backlogs is not None and backlog > max_backlogs:
+                continue
+            if departments is not None and department not in departments:
+                continue
+            lo = 0 if min_cgpa is None else bisect_left(values, min_cgpa)
+            hi = len(values) if max_cgpa is None else bisect_right(values, max_cgpa)
+            if hi > lo:
+                yield positions, lo, hi
+
+    def count(self, min_cgpa=None, max_cgpa=None, max_backlogs=None, departments=None):
+        """Number of matching rows"""
+        return sum(hi - lo for _, lo, hi in self._ranges(min_cgpa, max_cgpa, max_backlogs, departments))
+
+    def positions(self, min_cgpa=None, max_cgpa=None, max_backlogs=None, departments=None):
+        """Sorted row positions of matching rows"""
+        slices = [positions[lo:hi] for positions, lo, hi
+                  in self._ranges(min_cgpa, max_cgpa, max_backlogs, departments)]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(slices))
+
+    def select(self, min_cgpa=None, max_cgpa=None, max_backlogs=None, departments=None):
+        """Matching rows of the indexed frame, in their original order"""
+        return self.frame.iloc[self.positions(min_cgpa, max_cgpa, max_backlogs, departments)]
+
+    @staticmethod
+    def _criteria(criteria):
+        """Query arguments from a job or drive dict (min_cgpa, max_backlogs, eligible_departments)"""
+        def value(name):
+            v = criteria.get(name)
+            return None if v is None or (not isinstance(v, (list, tuple, set)) and pd.isna(v)) else v
+
+        min_cgpa, max_backlogs = value("min_cgpa"), value("max_backlogs")
+        return {
+            "min_cgpa": None if min_cgpa is None else float(min_cgpa),
+            "max_backlogs": None if max_backlogs is None else int(max_backlogs),
+            "departments": value("eligible_departments")
+        }
+
+    def count_for(self, criteria):
+        """Eligible count for a job posting or drive"""
+        return self.count(**self._criteria(criteria))
+
+    def select_for(self, criteria):
+        """Eligible rows for a job posting or drive"""
+        return self.select(**self._criteria(criteria))
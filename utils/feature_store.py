@@ -0,0 +1,123 @@
+"""
+Per-student feature store for the placement predictors
+"""
+
+import numpy as np
+import pandas as pd
+
+# Model input columns, in the order every predictor expects them
+FEATURE_NAMES = [
+    'cgpa', 'backlogs', 'internships', 'projects',
+    'aptitude_score', 'coding_score', 'communication_score', 'extracurricular'
+]
+
+# Extra columns kept alongside the model features
+STORE_COLUMNS = FEATURE_NAMES + ['skill_count', 'application_count']
+
+# Values used when a student has no data for a column
+FEATURE_DEFAULTS = {
+    'cgpa': 7.0,
+    'backlogs': 0,
+    'internships': 0,
+    'projects': 0,
+    'aptitude_score': 75.0,
+    'coding_score': 75.0,
+    'communication_score': 75.0,
+    'extracurricular': 0,
+    'skill_count': 0,
+    'application_count': 0
+}
+
+FEATURE_INDEX = {name: i for i, name in enumerate(STORE_COLUMNS)}
+
+_DEFAULT_ROW = np.array([FEATURE_DEFAULTS[c] for c in STORE_COLUMNS], dtype=np.float64)
+
+
+def profile_to_vector(profile):
+    """
+    Map a profile dict (form data, sample rows) onto one store row
+    """
+    vector = _DEFAULT_ROW.copy()
+
+    for name in STORE_COLUMNS:
+        value = profile.get(name)
+        if value is not None and not pd.isna(value):
+            vector[FEATURE_INDEX[name]] = float(value)
+
+    # Profiles carry skill lists rather than a count
+    if profile.get('skill_count') is None:
+        skills = profile.get('skills', profile.get('technical_skills'))
+        if isinstance(skills, str):
+            skills = [s for s in skills.split(',') if s.strip()]
+        if skills:
+            vector[FEATURE_INDEX['skill_count']] = len(skills)
+
+    return vector
+
+
+def profiles_to_matrix(profiles):
+    """
+    Stack several profile dicts into an aligned feature matrix
+    """
+    if not profiles:
+        return np.empty((0, len(STORE_COLUMNS)))
+    return np.vstack([profile_to_vector(p) for p in profiles])
+
+
+def model_features(matrix):
+    """
+    Slice the model input columns out of a store matrix
+    """
+    return matrix[:, :len(FEATURE_NAMES)]
+
+
+class FeatureStore:
+    def __init__(self, db=None):
+        if db is None:
+            from database.db_manager import db_manager as db
+        self.db = db
+
+    def refresh(self, student_ids=None):
+        """Recompute derived features for some or all students"""
+        self.db.refresh_student_features(student_ids)
+
+    def update_scores(self, student_id, **scores):
+        """Record assessment scores for a student"""
+        self.db.update_student_features(student_id, **scores)
+
+    def get_feature_matrix(self, student_ids=None):
+        """
+        Return (student_ids, matrix) with one row per requested student.
+
+        Rows follow the order of ``student_ids``; students without a feature
+        row, and missing values, get FEATURE_DEFAULTS.
+        """
+        frame = self.db.get_student_features(
+            None if student_ids is None else [int(s) for s in student_ids]
+        )
+
+        if student_ids is None:
+            student_ids = frame['student_id'].to_numpy()
+        student_ids = np.asarray(student_ids, dtype=np.int64)
+
+        matrix = np.tile(_DEFAULT_ROW, (len(student_ids), 1))
+        if frame.empty:
+            return student_ids, matrix
+
+        values = frame[STORE_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = np.where(np.isnan(values), _DEFAULT_ROW, values)
+
+        # Align the fetched rows with the requested order
+        order = np.argsort(frame['student_id'].to_numpy())
+        sorted_ids = frame['student_id'].to_numpy()[order]
+        positions = np.searchsorted(sorted_ids, student_ids)
+        positions = np.clip(positions, 0, len(sorted_ids) - 1)
+        found = sorted_ids[positions] == student_ids
+        matrix[found] = values[order[positions[found]]]
+
+        return student_ids, matrix
+
+    def get_model_matrix(self, student_ids=None):
+        """Same as get_feature_matrix, restricted to the model input columns"""
+        student_ids, matrix = self.get_feature_matrix(student_ids)
+        return student_ids, model_features(matrix)
@@ -0,0 +1,208 @@
+"""
+Cache of Plotly Express figures keyed by chart spec and data, with downsampling of large inputs
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Chart kinds whose points may be thinned out; histograms and boxes need every row
+DOWNSAMPLED_KINDS = {"scatter", "line"}
+
+# px arguments naming columns that split the data into separately drawn traces
+GROUP_ARGS = ["color", "symbol", "line_dash", "line_group", "facet_row", "facet_col", "animation_frame"]
+
+
+def _is_array(value):
+    return isinstance(value, (pd.DataFrame, pd.Series, pd.Index, np.ndarray))
+
+
+def _fingerprint(value):
+    """Stable digest of a chart argument: frames and arrays by content, containers recursively, the rest by repr"""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        try:
+            hashes = pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index))
+        except TypeError:
+            # Unhashable cells (e.g. lists of skills) are hashed by their text
+            hashes = pd.util.hash_pandas_object(value.astype(str), index=not isinstance(value, pd.Index))
+        digest.update(hashes.to_numpy().tobytes())
+        digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+    elif isinstance(value, np.ndarray):
+        digest.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else repr(value.tolist()).encode())
+        digest.update(str(value.dtype).encode())
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            digest.update(_fingerprint(value[key]).encode())
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            digest.update(_fingerprint(item).encode())
+    else:
+        digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def _columns(data, spec):
+    """The columns of ``data`` that the spec refers to, in frame order"""
+    named = set()
+    for value in spec.values():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        named.update(v for v in values if isinstance(v, str))
+        if isinstance(value, dict):
+            named.update(k for k in value if isinstance(k, str))
+    return [column for column in data.columns if column in named]
+
+
+# === DOWNSAMPLING ===
+
+def _numeric(series):
+    """float array for numeric or datetime series, None for anything else"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype("int64").to_numpy(dtype=float)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=float)
+    return None
+
+
+def lttb(x, y, threshold):
+    """
+    Positions of ``threshold`` points picked by Largest-Triangle-Three-Buckets,
+    which keeps the visual shape of a series: per bucket, the point forming
+    the largest triangle with the previous pick and the next bucket's mean.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    picks = [0]
+    for i in range(threshold - 2):
+        start, stop = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_x, next_y = x[stop:next_stop].mean(), y[stop:next_stop].mean()
+        prev = picks[-1]
+        area = np.abs((x[prev] - next_x) * (y[start:stop] - y[prev]) -
+                      (x[prev] - x[start:stop]) * (next_y - y[prev]))
+        picks.append(start + int(np.argmax(area)))
+    picks.append(n - 1)
+    return np.asarray(picks)
+
+
+def grid_sample(x, y, points):
+    """Positions of the first point in each occupied cell of a grid of about ``points`` cells"""
+    side = max(int(np.sqrt(points)), 1)
+    cells = []
+    for axis in (x, y):
+        low, high = np.nanmin(axis), np.nanmax(axis)
+        scale = side / (high - low) if high > low else 0.0
+        cells.append(np.minimum(((axis - low) * scale).astype(int), side - 1))
+    _, first = np.unique(cells[0] * side + cells[1], return_index=True)
+    return np.sort(first)
+
+
+def downsample(data, kind, spec, max_points):
+    """
+    Rows of ``data`` to draw for a scatter or line chart of more than
+    ``max_points`` rows: LTTB per line, or one point per grid cell for
+    scatters, with the point budget split across traces and y columns.
+    Non-numeric axes are treated as trace keys. Returns ``data`` itself
+    when small enough or when the spec fits a trendline.
+    """
+    # A fitted trendline must see every point
+    if kind not in DOWNSAMPLED_KINDS or len(data) <= max_points or spec.get("trendline"):
+        return data
+    x = spec.get("x")
+    ys = spec.get("y") if isinstance(spec.get("y"), (list, tuple)) else [spec.get("y")]
+    if not isinstance(x, str) or x not in data or not all(isinstance(y, str) and y in data for y in ys):
+        return data
+
+    xs = _numeric(data[x])
+    keys = [spec[name] for name in GROUP_ARGS if isinstance(spec.get(name), str) and spec[name] in data]
+    if xs is None:
+        keys.append(x)
+    groups = data.groupby(keys, sort=False, dropna=False, observed=True).indices.values() if keys else [np.arange(len(data))]
+    budget = max(max_points // (max(len(groups), 1) * len(ys)), 3)
+
+    keep = []
+    for rows in groups:
+        for y in ys:
+            values = _numeric(data[y].iloc[rows])
+            if values is None:
+                return data
+            position = xs[rows] if xs is not None else np.arange(len(rows), dtype=float)
+            valid = ~(np.isnan(position) | np.isnan(values))
+            rows_valid = rows[valid]
+            if len(rows_valid) <= budget:
+                keep.append(rows_valid)
+            elif kind == "line":
+                keep.append(rows_valid[lttb(position[valid], values[valid], budget)])
+            else:
+                keep.append(rows_valid[grid_sample(position[valid], values[valid], budget)])
+    return data.iloc[np.unique(np.concatenate(keep))] if keep else data
+
+
+class FigureCache:
+    """
+    Plotly Express figures keyed by (chart kind, spec, data version), kept
+    as figure JSON in an LRU shared by all sessions. Reruns with unchanged
+    data rebuild the figure from its JSON instead of running px again;
+    scatter and line inputs over ``max_points`` rows are downsampled first.
+
+    The data version is a content hash of the referenced columns unless
+    the caller passes ``version`` (e.g. an analytics cube's version).
+    Every call returns a new figure, so callers may modify it.
+    """
+
+    def __init__(self, max_entries=128, max_points=4000):
+        self.max_entries = max_entries
+        self.max_points = max_points
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._figures)
+
+    def figure(self, kind, data=None, version=None, **spec):
+        """``px.<kind>(data, **spec)``, rebuilt from the cached JSON when there is one"""
+        if isinstance(data, pd.DataFrame):
+            columns = _columns(data, spec)
+            # Keep the whole frame when the spec refers to columns only through arrays or defaults
+            if columns:
+                data = data[columns]
+        key = (kind, _fingerprint(spec), version if version is not None else _fingerprint(data))
+
+        import plotly.io as pio
+
+        with self._lock:
+            cached = self._figures.get(key)
+            if cached is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if cached is not None:
+            return pio.from_json(cached)
+
+        import plotly.express as px
+
+        if isinstance(data, pd.DataFrame) and not any(_is_array(v) for v in spec.values()):
+            data = downsample(data, kind, spec, self.max_points)
+        figure = getattr(px, kind)(data, **spec) if data is not None else getattr(px, kind)(**spec)
+
+        with self._lock:
+            self._figures[key] = figure.to_json()
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,311 @@
+"""
+Persisted match scores with per-student top-k lists, patched as students and companies change
+"""
+
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from utils.matching_engine import DEFAULT_ALGORITHM, MatchingEngine, top_k_columns
+
+DEFAULT_STATE_PATH = "models/matching_state.joblib"
+
+# Database-backed matchers of this process, by (database path, state path)
+_database_matchers = {}
+_database_lock = threading.Lock()
+
+
+class IncrementalMatcher:
+    """
+    Holds the full (students x companies) score matrix and each student's
+    best ``top_k`` companies.
+
+    A changed student recomputes one row, a new or changed company one
+    column, and a placed student is masked out; the top-k lists are patched
+    for the affected rows only. Scores only depend on the (student, company)
+    pair, so patched state always equals a full rebuild.
+    """
+
+    def __init__(self, students, companies, algorithm=DEFAULT_ALGORITHM, top_k=5,
+                 student_key="student_id", company_key="name"):
+        self.algorithm = algorithm
+        self.top_k = top_k
+        self.student_key = student_key
+        self.company_key = company_key
+
+        self.students = students.reset_index(drop=True)
+        self.companies = companies.reset_index(drop=True)
+        self.active = np.ones(len(self.students), dtype=bool)
+
+        self.scores = MatchingEngine(self.students, self.companies, algorithm).score_matrix()
+        self.top_index = np.full((len(self.students), top_k), -1, dtype=np.int64)
+        self.top_score = np.full((len(self.students), top_k), -np.inf, dtype=np.float32)
+        self._rebuild_top_k(np.arange(len(self.students)))
+
+    # === SCORING ===
+
+    def _engine(self, students, companies):
+        return MatchingEngine(students, companies, self.algorithm)
+
+    def _rebuild_top_k(self, rows):
+        """Recompute the top-k lists of some rows from their full score rows"""
+        if len(rows) == 0:
+            return
+        index, score = top_k_columns(self.scores[rows], self.top_k)
+        self.top_index[rows] = -1
+        self.top_score[rows] = -np.inf
+        self.top_index[rows, :index.shape[1]] = index
+        self.top_score[rows, :index.shape[1]] = score
+
+    def _push_column(self, column, values, candidates=None):
+        """Insert one company's scores into every top-k list it beats"""
+        last_score, last_index = self.top_score[:, -1], self.top_index[:, -1]
+        better = (values > last_score) | ((values == last_score) & ((column < last_index) | (last_index < 0)))
+        if candidates is not None:
+            better &= candidates
+        if not better.any():
+            return
+
+        rows = np.flatnonzero(better)
+        merged_index = np.column_stack([self.top_index[rows], np.full(len(rows), column)])
+        merged_score = np.column_stack([self.top_score[rows], values[rows]])
+        # Empty slots (-1) sort last; ties go to the lower column index
+        tie_break = np.where(merged_index < 0, np.iinfo(np.int64).max, merged_index)
+        flat = np.lexsort((tie_break.ravel(), -merged_score.ravel(), np.repeat(np.arange(len(rows)), self.top_k + 1)))
+        order = flat.reshape(len(rows), self.top_k + 1)[:, :self.top_k] % (self.top_k + 1)
+
+        self.top_index[rows] = np.take_along_axis(merged_index, order, axis=1)
+        self.top_score[rows] = np.take_along_axis(merged_score, order, axis=1)
+
+    def _position(self, frame, key, value):
+        matches = np.flatnonzero(frame[key].to_numpy() == value)
+        return int(matches[0]) if len(matches) else None
+
+    # === CHANGES ===
+
+    def upsert_student(self, student):
+        """Add or replace a student (dict or Series) and rescore its row"""
+        student = pd.Series(student)
+        row = self._position(self.students, self.student_key, student[self.student_key])
+        values = self._engine(pd.DataFrame([student]), self.companies).score_matrix()[0]
+
+        if row is None:
+            self.students = pd.concat([self.students, pd.DataFrame([student])], ignore_index=True)
+            self.scores = np.vstack([self.scores, values[None, :]])
+            self.top_index = np.vstack([self.top_index, np.full((1, self.top_k), -1, dtype=np.int64)])
+            self.top_score = np.vstack([self.top_score, np.full((1, self.top_k), -np.inf, dtype=np.float32)])
+            self.active = np.append(self.active, True)
+            row = len(self.students) - 1
+        else:
+            for column, value in student.items():
+                if column not in self.students:
+                    self.students[column] = None
+                self.students.at[row, column] = value
+            self.scores[row] = values
+            self.active[row] = True
+
+        self._rebuild_top_k(np.array([row]))
+        return row
+
+    def remove_student(self, student_id):
+        """Stop matching a student (e.g. once placed); returns False if unknown"""
+        row = self._position(self.students, self.student_key, student_id)
+        if row is None:
+            return False
+        self.active[row] = False
+        return True
+
+    def upsert_company(self, company):
+        """Add or replace a company (dict or Series) and rescore its column"""
+        company = pd.Series(company)
+        column = self._position(self.companies, self.company_key, company[self.company_key])
+        values = self._engine(self.students, pd.DataFrame([company])).score_matrix()[:, 0]
+
+        if column is None:
+            self.companies = pd.concat([self.companies, pd.DataFrame([company])], ignore_index=True)
+            self.scores = np.column_stack([self.scores, values])
+            column = len(self.companies) - 1
+            self._push_column(column, values)
+        else:
+            for name, value in company.items():
+                if name not in self.companies:
+                    self.companies[name] = None
+                self.companies.at[column, name] = value
+            self.scores[:, column] = values
+
+            # Lists holding this company may now need a different one
+            holding = (self.top_index == column).any(axis=1)
+            self._rebuild_top_k(np.flatnonzero(holding))
+            self._push_column(column, values, candidates=~holding)
+
+        return column
+
+    # === RESULTS ===
+
+    def score_block(self, student_ids, company_keys):
+        """Stored scores for the given students (rows) and companies (columns), in that order"""
+        rows = pd.Index(self.students[self.student_key]).get_indexer(list(student_ids))
+        cols = pd.Index(self.companies[self.company_key]).get_indexer(list(company_keys))
+        if (rows < 0).any() or (cols < 0).any():
+            raise ValueError("Unknown student or company in score_block")
+        return self.scores[np.ix_(rows, cols)]
+
+    def top_matches(self, min_score=0, top_k=None, student_ids=None, companies=None):
+        """
+        Best matches per active student, in the MatchingEngine.top_matches
+        format. The stored lists answer unfiltered queries with top_k up to
+        the configured size; other queries select from the stored scores.
+        """
+        top_k = top_k or self.top_k
+        if companies is not None and set(self.companies[self.company_key]) <= set(companies):
+            companies = None
+
+        rows = np.flatnonzero(self.active)
+        if student_ids is not None:
+            rows = rows[self.students[self.student_key].iloc[rows].isin(list(student_ids)).to_numpy()]
+
+        if top_k <= self.top_k:
+            index, score = self.top_index[rows, :top_k], self.top_score[rows, :top_k]
+            if companies is not None:
+                # A stored list holding top_k of the wanted companies (or every company it
+                # could) is already that subset's top_k; only the other rows are reselected
+                wanted = np.append(self.companies[self.company_key].isin(list(companies)).to_numpy(), False)
+                stored = self.top_index[rows]
+                hits = wanted[stored]
+                complete = (hits.sum(axis=1) >= top_k) | (stored[:, -1] < 0)
+                order = np.argsort(~hits, axis=1, kind="stable")[:, :top_k]
+                index = np.where(np.take_along_axis(hits, order, axis=1), np.take_along_axis(stored, order, axis=1), -1)
+                score = np.take_along_axis(self.top_score[rows], order, axis=1)
+
+                cols_subset = np.flatnonzero(wanted[:-1])
+                rescan = rows[~complete]
+                best, best_score = top_k_columns(self.scores[np.ix_(rescan, cols_subset)], top_k)
+                index[~complete, :best.shape[1]] = cols_subset[best]
+                index[~complete, best.shape[1]:] = -1
+                score[~complete, :best.shape[1]] = best_score
+            rows = np.repeat(rows, index.shape[1])
+            cols, picked = index.ravel(), score.ravel()
+        else:
+            cols_subset = np.arange(len(self.companies))
+            if companies is not None:
+                cols_subset = cols_subset[self.companies[self.company_key].isin(list(companies)).to_numpy()]
+            best, score = top_k_columns(self.scores[np.ix_(rows, cols_subset)], top_k)
+            rows = np.repeat(rows, best.shape[1])
+            cols, picked = cols_subset[best].ravel(), score.ravel()
+
+        keep = (cols >= 0) & (picked >= min_score)
+        rows, cols, picked = rows[keep], cols[keep], picked[keep]
+        order = np.lexsort((cols, rows, -picked))
+        rows, cols, picked = rows[order], cols[order], picked[order]
+
+        # Render through an engine over just the rows and columns involved
+        student_rows, student_pos = np.unique(rows, return_inverse=True)
+        company_cols, company_pos = np.unique(cols, return_inverse=True)
+        engine = self._engine(self.students.iloc[student_rows], self.companies.iloc[company_cols])
+        return engine._match_frame(student_pos.ravel(), company_pos.ravel(), picked)
+
+    def top_students(self, company, n=10, min_score=0):
+        """The ``n`` best active students for one company (by company key), best first"""
+        column = self._position(self.companies, self.company_key, company)
+        if column is None:
+            return self._engine(self.students.iloc[:0], self.companies.iloc[:0])._match_frame(
+                np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([]))
+        values = np.where(self.active, self.scores[:, column], -np.inf)
+        rows = np.argsort(-values, kind="stable")[:n]
+        rows = rows[values[rows] >= min_score]
+        engine = self._engine(self.students.iloc[rows], self.companies.iloc[[column]])
+        return engine._match_frame(np.arange(len(rows)), np.zeros(len(rows), dtype=np.int64), values[rows])
+
+    # === PERSISTENCE ===
+
+    def save(self, path=DEFAULT_STATE_PATH):
+        """Write the matcher state atomically"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        joblib.dump(self.__dict__, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_STATE_PATH):
+        """Matcher saved by save(), or None if there is no saved state"""
+        if not os.path.exists(path):
+            return None
+        matcher = cls.__new__(cls)
+        matcher.__dict__.update(joblib.load(path))
+        return matcher
+
+
+def build_from_database(db=None, algorithm=DEFAULT_ALGORITHM, top_k=5):
+    """Full matcher over the database's unplaced students and active job postings"""
+    if db is None:
+        from database.db_manager import db_manager as db
+    return IncrementalMatcher(db.get_matching_students(), db.get_matching_jobs(),
+                              algorithm=algorithm, top_k=top_k, company_key="job_id")
+
+
+def sync_with_database(matcher, db=None, path=DEFAULT_STATE_PATH):
+    """
+    Register DatabaseManager listeners that patch ``matcher`` on every job,
+    profile, skill or placement change and persist it to ``path``.
+    Returns the {event: callback} mapping so callers can detach them.
+    """
+    if db is None:
+        from database.db_manager import db_manager as db
+
+    def on_job_posted(job_id):
+        jobs = db.get_matching_jobs([job_id])
+        if not jobs.empty:
+            matcher.upsert_company(jobs.iloc[0])
+            matcher.save(path)
+
+    def on_student_updated(student_id):
+        students = db.get_matching_students([student_id])
+        if students.empty:
+            matcher.remove_student(student_id)
+        else:
+            matcher.upsert_student(students.iloc[0])
+        matcher.save(path)
+
+    def on_student_placed(student_id):
+        if matcher.remove_student(student_id):
+            matcher.save(path)
+
+    callbacks = {
+        'job_posted': on_job_posted,
+        'student_updated': on_student_updated,
+        'student_placed': on_student_placed
+    }
+    for event, callback in callbacks.items():
+        db.add_listener(event, callback)
+    return callbacks
+
+
+def _matches_database(matcher, db):
+    """Whether a saved matcher covers exactly the database's unplaced students and active jobs"""
+    students = set(matcher.students[matcher.student_key][matcher.active].astype(int))
+    jobs = set(matcher.companies[matcher.company_key].astype(int))
+    return (students == set(db.get_matching_students()["student_id"].astype(int)) and
+            jobs == set(db.get_matching_jobs()["job_id"].astype(int)))
+
+
+def database_matcher(db=None, algorithm=DEFAULT_ALGORITHM, path=DEFAULT_STATE_PATH):
+    """
+    The process's matcher over the database, kept current and saved by
+    sync_with_database. Loads the state at ``path`` on first use, and
+    rebuilds it when it is missing, for another algorithm, or no longer
+    covers the database's students and job postings.
+    """
+    if db is None:
+        from database.db_manager import db_manager as db
+    key = (db.db_path, path)
+    with _database_lock:
+        if key not in _database_matchers:
+            matcher = IncrementalMatcher.load(path)
+            if matcher is None or matcher.algorithm != algorithm or not _matches_database(matcher, db):
+                matcher = build_from_database(db, algorithm)
+                matcher.save(path)
+            sync_with_database(matcher, db, path)
+            _database_matchers[key] = matcher
+        return _database_matchers[key]
@@ -0,0 +1,270 @@
+"""
+Conflict-free interview timetabling with per-resource interval indexes
+"""
+
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+DEFAULT_DURATION_MINUTES = 60
+
+DEFAULT_ROUNDS = [("Aptitude Test", 60), ("Technical Round 1", 45), ("HR Round", 30)]
+
+
+class ResourceCalendar:
+    """
+    Busy time of one resource (student, interviewer or venue) as sorted,
+    disjoint intervals. Overlapping or touching bookings are merged, which
+    keeps every query a bisect: a new booking conflicts with the union
+    exactly when it conflicts with some booking.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def busy(self, start, end):
+        """Busy intervals overlapping [start, end)"""
+        i = max(bisect_right(self.starts, start) - 1, 0)
+        overlapping = []
+        while i < len(self.starts) and self.starts[i] < end:
+            if self.ends[i] > start:
+                overlapping.append((self.starts[i], self.ends[i]))
+            i += 1
+        return overlapping
+
+    def is_free(self, start, end):
+        i = bisect_right(self.starts, start) - 1
+        if i >= 0 and self.ends[i] > start:
+            return False
+        return i + 1 >= len(self.starts) or self.starts[i + 1] >= end
+
+    def next_free(self, start, duration):
+        """Earliest t >= start with [t, t + duration) free"""
+        t = start
+        i = bisect_right(self.starts, t) - 1
+        if i >= 0 and self.ends[i] > t:
+            t = self.ends[i]
+        i += 1
+        # Intervals are disjoint and sorted, so each one is looked at once
+        while i < len(self.starts) and self.starts[i] < t + duration:
+            t = self.ends[i]
+            i += 1
+        return t
+
+    def add(self, start, end):
+        """Book [start, end), merging with any overlapping or touching bookings"""
+        i = bisect_left(self.ends, start)
+        j = bisect_right(self.starts, end)
+        if i < j:
+            start = min(start, self.starts[i])
+            end = max(end, self.ends[j - 1])
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+
+
+class InterviewScheduler:
+    """
+    Books interviews without double-booking any student, interviewer or
+    venue. Seed it with the existing interviews, then check single bookings
+    with conflicts() or build a whole drive timetable with schedule().
+    """
+
+    def __init__(self, interviews=None, default_minutes=DEFAULT_DURATION_MINUTES):
+        self.default_minutes = default_minutes
+        self.calendars = {}
+        if interviews is not None and not interviews.empty:
+            self.add_interviews(interviews)
+
+    def _calendar(self, resource):
+        if resource not in self.calendars:
+            self.calendars[resource] = ResourceCalendar()
+        return self.calendars[resource]
+
+    @staticmethod
+    def _resources(student_id, interviewer=None, venue=None):
+        resources = [("student", str(student_id))]
+        if not pd.isna(interviewer) and interviewer:
+            resources.append(("interviewer", str(interviewer)))
+        if not pd.isna(venue) and venue:
+            resources.append(("venue", str(venue)))
+        return resources
+
+    def add_interviews(self, interviews):
+        """Index interviews in the CollegeFlow store format (date, time, optional duration)"""
+        active = interviews[interviews.get("status", pd.Series("Scheduled", index=interviews.index)) != "Cancelled"]
+        starts = pd.to_datetime(active["date"] + " " + active["time"], errors="coerce")
+        minutes = active["duration"] if "duration" in active else pd.Series(index=active.index, dtype=float)
+        minutes = minutes.fillna(self.default_minutes)
+
+        for interview, start, duration in zip(active.to_dict("records"), starts, minutes):
+            if pd.isna(start):
+                continue
+            start = start.to_pydatetime()
+            self.book(interview["student_id"], start, start + timedelta(minutes=float(duration)),
+                      interview.get("interviewer"), interview.get("venue"))
+
+    def book(self, student_id, start, end, interviewer=None, venue=None):
+        for resource in self._resources(student_id, interviewer, venue):
+            self._calendar(resource).add(start, end)
+
+    def conflicts(self, student_id, start, end, interviewer=None, venue=None):
+        """(resource kind, name, busy start, busy end) for every clash with a proposed booking"""
+        clashes = []
+        for kind, name in self._resources(student_id, interviewer, venue):
+            calendar = self.calendars.get((kind, name))
+            if calendar is not None:
+                clashes.extend((kind, name, s, e) for s, e in calendar.busy(start, end))
+        return clashes
+
+    def _earliest(self, resources, start, duration, windows):
+        """Earliest start >= start inside a window with every resource free, or None"""
+        t = start
+        while True:
+            t = windows.fit(t, duration)
+            if t is None:
+                return None
+            candidate = t
+            for resource in resources:
+                calendar = self.calendars.get(resource)
+                if calendar is not None:
+                    candidate = calendar.next_free(candidate, duration)
+            if candidate == t:
+                return t
+            t = candidate
+
+    def schedule(self, candidates, rounds, interviewers, windows, gap_minutes=0,
+                 company=None, job_role=None):
+        """
+        Greedy earliest-finish timetable. Every candidate goes through
+        ``rounds`` ([(round name, minutes)]) in order, each round starting
+        at least ``gap_minutes`` after the previous one ends; each interview
+        takes the qualified interviewer who can start it soonest.
+
+        ``candidates`` needs student_id and student_name (company and
+        job_role columns override the arguments). ``interviewers`` is a
+        list of dicts with name and optional rounds, venue and mode.
+        ``windows`` is a list of (start, end) datetimes.
+
+        Returns (scheduled interviews, unscheduled (student, round) rows,
+        stats dict).
+        """
+        started = time.perf_counter()
+        windows = _Windows(windows)
+        gap = timedelta(minutes=gap_minutes)
+        panels = [
+            {
+                "name": str(p["name"]),
+                "rounds": set(p.get("rounds") or []),
+                "venue": p.get("venue") or None,
+                "mode": p.get("mode") or ("Offline" if p.get("venue") else "Online")
+            }
+            for p in interviewers if p.get("name")
+        ]
+
+        candidates = candidates.to_dict("records")
+        ready = {str(c["student_id"]): windows.first for c in candidates}
+        scheduled, unscheduled = [], []
+        # With no windows every candidate starts unready, which is not an earlier round's fault
+        not_ready = "No interview windows available" if windows.first is None else "Earlier round not scheduled"
+
+        # Round by round, so every candidate's first round is packed before anyone's second
+        for round_name, minutes in rounds:
+            duration = timedelta(minutes=float(minutes))
+            qualified = [p for p in panels if not p["rounds"] or round_name in p["rounds"]]
+
+            for candidate in candidates:
+                student_id = str(candidate["student_id"])
+                if ready[student_id] is None:
+                    unscheduled.append({"student_id": student_id, "student_name": candidate.get("student_name"),
+                                        "round": round_name, "reason": not_ready})
+                    continue
+
+                best = None
+                for panel in qualified:
+                    resources = self._resources(student_id, panel["name"], panel["venue"])
+                    start = self._earliest(resources, ready[student_id], duration, windows)
+                    if start is not None and (best is None or start < best[0]):
+                        best = (start, panel)
+
+                if best is None:
+                    ready[student_id] = None
+                    unscheduled.append({"student_id": student_id, "student_name": candidate.get("student_name"),
+                                        "round": round_name,
+                                        "reason": "No interviewer" if not qualified else "No free slot in windows"})
+                    continue
+
+                start, panel = best
+                end = start + duration
+                self.book(student_id, start, end, panel["name"], panel["venue"])
+                ready[student_id] = end + gap
+
+                scheduled.append({
+                    "student_id": candidate["student_id"],
+                    "student_name": candidate.get("student_name"),
+                    "company": candidate.get("company", company),
+                    "round": round_name,
+                    "date": start.strftime("%Y-%m-%d"),
+                    "time": start.strftime("%H:%M"),
+                    "end_time": end.strftime("%H:%M"),
+                    "duration": float(minutes),
+                    "mode": panel["mode"],
+                    "venue": panel["venue"] or "",
+                    "interviewer": panel["name"],
+                    "job_role": candidate.get("job_role", job_role),
+                    "status": "Scheduled",
+                    "result": "Pending"
+                })
+
+        scheduled = pd.DataFrame(scheduled)
+        stats = {
+            "scheduled": len(scheduled),
+            "unscheduled": len(unscheduled),
+            "last_end": (pd.to_datetime(scheduled["date"] + " " + scheduled["end_time"]).max()
+                         if not scheduled.empty else None),
+            "solve_time_ms": (time.perf_counter() - started) * 1000
+        }
+        return scheduled, pd.DataFrame(unscheduled, columns=["student_id", "student_name", "round", "reason"]), stats
+
+
+class _Windows:
+    """Sorted, merged availability windows"""
+
+    def __init__(self, windows):
+        calendar = ResourceCalendar()
+        for start, end in windows:
+            if end > start:
+                calendar.add(start, end)
+        self.starts, self.ends = calendar.starts, calendar.ends
+        self.first = self.starts[0] if self.starts else None
+
+    def fit(self, t, duration):
+        """Earliest start >= t with [start, start + duration) inside one window"""
+        i = max(bisect_right(self.starts, t) - 1, 0)
+        while i < len(self.starts):
+            start = max(t, self.starts[i])
+            if start + duration <= self.ends[i]:
+                return start
+            i += 1
+        return None
+
+
+def daily_windows(first_day, last_day, day_start="09:00", day_end="17:00", break_start=None, break_end=None):
+    """(start, end) windows for each day in a date range, split around an optional break"""
+    windows = []
+    day = first_day
+    while day <= last_day:
+        def at(clock):
+            return datetime.combine(day, datetime.strptime(clock, "%H:%M").time())
+
+        if break_start and break_end:
+            windows.extend([(at(day_start), at(break_start)), (at(break_end), at(day_end))])
+        else:
+            windows.append((at(day_start), at(day_end)))
+        day += timedelta(days=1)
+    return windows
@@ -0,0 +1,241 @@
+"""
+Interview records with buffered appends and bulk schedule/reschedule/result operations
+"""
+
+from datetime import timedelta
+
+import pandas as pd
+
+from utils.interview_scheduler import InterviewScheduler
+
+# Application status an interview result moves the linked application to
+RESULT_APPLICATION_STATUS = {
+    "Pending": "Interview",
+    "On Hold": "Interview",
+    "Selected": "Selected",
+    "Rejected": "Rejected"
+}
+
+BULK_COLUMNS = {
+    "schedule": ["student_id", "student_name", "company", "round", "date", "time", "duration",
+                 "mode", "venue", "interviewer", "job_role", "application_id"],
+    "reschedule": ["interview_id", "date", "time", "duration", "interviewer", "venue"],
+    "results": ["interview_id", "result", "notes"]
+}
+
+
+class InterviewStore:
+    """
+    The interviews table of a CollegeFlow session.
+
+    New rows go to a list buffer and are folded into the frame with one
+    concat the next time it is read, so appends are amortized O(1) however
+    many arrive between reads. Bulk updates are applied per column over
+    all matching rows at once. ``version`` goes up with every append or
+    update, so readers can tell when derived state is stale.
+    """
+
+    def __init__(self, frame=None):
+        self._frame = frame.reset_index(drop=True) if frame is not None else pd.DataFrame()
+        self._pending = []
+        self.version = 0
+        ids = pd.to_numeric(self._frame.get("interview_id", pd.Series(dtype=str)).astype(str).str[1:],
+                            errors="coerce")
+        self._next_id = int(max(ids.max() + 1, 1000)) if ids.notna().any() else 1000
+
+    def __len__(self):
+        return len(self._frame) + len(self._pending)
+
+    @property
+    def frame(self):
+        """All interviews as a DataFrame (do not modify in place; use update())"""
+        if self._pending:
+            self._frame = pd.concat([self._frame, pd.DataFrame(self._pending)], ignore_index=True)
+            self._pending = []
+        return self._frame
+
+    # === APPENDS ===
+
+    def add(self, interview):
+        """Buffer one interview; returns its interview_id"""
+        return self.add_many([interview])[0]
+
+    def add_many(self, interviews):
+        """Buffer many interviews (list of dicts or DataFrame); returns their interview_ids"""
+        if isinstance(interviews, pd.DataFrame):
+            interviews = interviews.to_dict("records")
+
+        ids = []
+        for interview in interviews:
+            interview = {"status": "Scheduled", "result": "Pending", **interview}
+            if not interview.get("interview_id"):
+                interview["interview_id"] = f"I{self._next_id:04d}"
+                self._next_id += 1
+            ids.append(interview["interview_id"])
+            self._pending.append(interview)
+        self.version += 1
+        return ids
+
+    # === BULK UPDATES ===
+
+    def _positions(self, interview_ids):
+        """Row positions of interview_ids in the frame, -1 where unknown"""
+        return pd.Index(self.frame["interview_id"].astype(str)).get_indexer(pd.Series(interview_ids).astype(str))
+
+    def update(self, updates):
+        """
+        Set columns for many interviews at once. ``updates`` is a DataFrame
+        with interview_id plus the columns to set; missing values leave a
+        cell unchanged. Returns the interview_ids that were not found.
+        """
+        frame = self.frame
+        positions = self._positions(updates["interview_id"])
+        found = positions >= 0
+
+        for column in updates.columns.drop("interview_id"):
+            values = updates[column].to_numpy()[found]
+            rows = positions[found]
+            given = pd.notna(values)
+            if column not in frame:
+                frame[column] = None
+            if given.any():
+                if not (pd.api.types.is_numeric_dtype(frame[column]) and pd.api.types.is_numeric_dtype(values.dtype)):
+                    frame[column] = frame[column].astype(object)
+                frame.iloc[rows[given], frame.columns.get_loc(column)] = values[given]
+
+        self.version += 1
+        return updates["interview_id"][~found].tolist()
+
+    def reschedule(self, updates, check_conflicts=True, default_minutes=60):
+        """
+        Move many interviews (interview_id, date, time and optionally
+        duration, interviewer, venue). With ``check_conflicts`` every move is
+        checked against all other interviews and the moves accepted before
+        it; clashing moves are skipped.
+
+        Returns (applied interview_ids, [(interview_id, clash description)]).
+        """
+        frame = self.frame
+        updates = updates.reset_index(drop=True)
+        positions = self._positions(updates["interview_id"])
+        rejected = [(i, "Unknown interview") for i in updates["interview_id"][positions < 0]]
+        updates, positions = updates[positions >= 0], positions[positions >= 0]
+
+        current = frame.iloc[positions].reset_index(drop=True)
+        merged = current.copy()
+        for column in updates.columns.drop("interview_id"):
+            given = updates[column].notna().to_numpy()
+            if column not in merged:
+                merged[column] = None
+            merged[column] = merged[column].astype(object)
+            merged.loc[given, column] = updates[column].to_numpy()[given]
+
+        accepted = pd.Series(True, index=merged.index)
+        if check_conflicts:
+            others = frame.drop(index=frame.index[positions])
+            accepted, clashes = _clash_free(merged, others, merged["interview_id"], default_minutes)
+            rejected.extend(clashes)
+
+        moved = updates.reset_index(drop=True)[accepted.to_numpy()]
+        self.update(moved.assign(status="Scheduled"))
+        return moved["interview_id"].tolist(), rejected
+
+    def schedule(self, interviews, check_conflicts=True, default_minutes=60):
+        """
+        Add many new interviews (the bulk "schedule" columns). With
+        ``check_conflicts`` every row is checked against the existing
+        interviews and the rows accepted before it; clashing rows are skipped.
+
+        Returns (new interview_ids, [(row number, clash description)]) with
+        rows numbered from 1 in upload order.
+        """
+        interviews = interviews.reset_index(drop=True)
+        accepted = pd.Series(True, index=interviews.index)
+        rejected = []
+        if check_conflicts:
+            accepted, rejected = _clash_free(interviews, self.frame, interviews.index + 1, default_minutes)
+        return self.add_many(interviews[accepted.to_numpy()]), rejected
+
+    def record_results(self, results, db=None):
+        """
+        Record results (interview_id, result and optional notes) for many
+        interviews, marking them Completed. Interviews linked to an
+        application_id move their applications to the matching status in
+        one database transaction. Returns (unknown ids, applications updated).
+        """
+        results = results.copy()
+        if "status" not in results:
+            results["status"] = "Completed"
+        unknown = self.update(results)
+
+        frame = self.frame
+        if "application_id" not in frame:
+            return unknown, 0
+
+        positions = self._positions(results["interview_id"])
+        linked = frame.iloc[positions[positions >= 0]]
+        linked = linked[linked["application_id"].notna()]
+        updates = [
+            {"application_id": int(row["application_id"]),
+             "status": RESULT_APPLICATION_STATUS.get(row["result"], "Interview"),
+             "notes": row.get("notes") if pd.notna(row.get("notes")) else None}
+            for row in linked.to_dict("records")
+        ]
+        if not updates:
+            return unknown, 0
+
+        if db is None:
+            from database.db_manager import db_manager as db
+        return unknown, db.update_application_statuses(updates)
+
+
+def _clash_free(rows, others, labels, default_minutes):
+    """
+    Check rows (student_id, date, time and optionally duration, interviewer,
+    venue) against ``others`` and the rows accepted before them. Returns
+    (accepted mask, [(label, clash description)]).
+    """
+    scheduler = InterviewScheduler(others, default_minutes=default_minutes)
+    starts = pd.to_datetime(rows["date"].astype(str) + " " + rows["time"].astype(str), errors="coerce")
+    minutes = pd.to_numeric(rows["duration"], errors="coerce") if "duration" in rows \
+        else pd.Series(float("nan"), index=rows.index)
+    minutes = minutes.fillna(default_minutes)
+
+    accepted = pd.Series(True, index=rows.index)
+    rejected = []
+    for i, label in zip(rows.index, labels):
+        row = rows.loc[i]
+        if pd.isna(starts[i]):
+            accepted[i] = False
+            rejected.append((label, "Invalid date or time"))
+            continue
+        start = starts[i].to_pydatetime()
+        end = start + timedelta(minutes=float(minutes[i]))
+        clashes = scheduler.conflicts(row["student_id"], start, end, row.get("interviewer"), row.get("venue"))
+        if clashes:
+            accepted[i] = False
+            kind, name, busy_start, busy_end = clashes[0]
+            rejected.append((label, f"{kind} {name} busy {busy_start:%d %b %H:%M}-{busy_end:%H:%M}"))
+        else:
+            scheduler.book(row["student_id"], start, end, row.get("interviewer"), row.get("venue"))
+    return accepted, rejected
+
+
+def read_bulk_csv(file, action):
+    """
+    Interview rows for a bulk action ("schedule", "reschedule" or "results")
+    from an uploaded CSV. Raises ValueError naming any missing columns.
+    """
+    frame = pd.read_csv(file, dtype=str).dropna(how="all")
+    required = {"schedule": ["student_id", "company", "date", "time"],
+                "reschedule": ["interview_id", "date", "time"],
+                "results": ["interview_id", "result"]}[action]
+    missing = [c for c in required if c not in frame]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    frame = frame[[c for c in BULK_COLUMNS[action] if c in frame]]
+    for column in ("duration", "application_id"):
+        if column in frame:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    return frame
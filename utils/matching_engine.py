@@ -0,0 +1,219 @@
+"""
+Vectorized student-company matching
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.assignment import assign_students
+from utils.skill_bitset import SkillVocabulary, count, overlap_matrix
+
+# Component multipliers for each matching algorithm. Unweighted components
+# are worth CGPA 30, skills 40 and department fit 20 points.
+ALGORITHM_WEIGHTS = {
+    "Skills-based": {"cgpa": 0.5, "skills": 1.375, "department": 1.0, "backlogs": 1.0},
+    "CGPA-weighted": {"cgpa": 1.5, "skills": 0.625, "department": 1.0, "backlogs": 1.0},
+    "Hybrid (Skills + CGPA)": {"cgpa": 1.0, "skills": 1.0, "department": 1.0, "backlogs": 1.0},
+    "Company-specific": {"cgpa": 1.0, "skills": 0.75, "department": 1.5, "backlogs": 1.0}
+}
+
+DEFAULT_ALGORITHM = "Hybrid (Skills + CGPA)"
+
+# Stored with persisted matches; bump when scoring changes
+ALGORITHM_VERSION = "1.0"
+
+SOFTWARE_DEPARTMENTS = ["Computer Science", "Information Technology"]
+
+# preferred_departments values meaning "no preference"
+ANY_DEPARTMENT = {"All", "All Departments"}
+
+
+def _as_list(value):
+    """Normalise a list cell (list, comma string or missing) to a list"""
+    if isinstance(value, (list, tuple, set, np.ndarray)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(',') if v.strip()]
+    return []
+
+
+def top_k_columns(block, k):
+    """
+    Column indices and scores of the k best entries in each row, best first.
+    Ties go to the lower column index, so results never depend on how the
+    matrix was built.
+    """
+    n_rows, n_cols = block.shape
+    k = min(k, n_cols)
+    if k == 0 or n_rows == 0:
+        return np.empty((n_rows, k), dtype=np.int64), np.empty((n_rows, k), dtype=block.dtype)
+
+    threshold = -np.partition(-block, k - 1, axis=1)[:, k - 1:k]
+    greater = block > threshold
+    equal = block == threshold
+    need = k - greater.sum(axis=1, keepdims=True)
+    chosen = greater | (equal & (np.cumsum(equal, axis=1) <= need))
+
+    rows, cols = np.nonzero(chosen)
+    scores = block[rows, cols]
+    order = np.lexsort((cols, -scores, rows))
+    return cols[order].reshape(n_rows, k), scores[order].reshape(n_rows, k)
+
+
+class MatchingEngine:
+    """
+    Scores every student against every company in one pass.
+
+    ``students`` needs student_id, name, department, cgpa, backlogs and
+    skills (list or comma string); ``companies`` needs name and may carry
+    required_skills and preferred_departments.
+    """
+
+    def __init__(self, students, companies, algorithm=DEFAULT_ALGORITHM):
+        if algorithm not in ALGORITHM_WEIGHTS:
+            raise ValueError(f"Unknown matching algorithm: {algorithm}")
+
+        self.students = students.reset_index(drop=True)
+        self.companies = companies.reset_index(drop=True)
+        self.algorithm = algorithm
+        self.weights = ALGORITHM_WEIGHTS[algorithm]
+
+        required = self._column(self.companies, "required_skills")
+        skills = self._column(self.students, "skills")
+
+        # Only required skills can score, so student-only skills get no bit
+        self.vocabulary = SkillVocabulary().update(required)
+        self.student_skills = self.vocabulary.encode_many(skills)
+        self.company_skills = self.vocabulary.encode_many(required)
+        self.required_counts = count(self.company_skills)
+
+        self.cgpa = self.students["cgpa"].to_numpy(dtype=np.float32)
+        self.backlogs = self.students["backlogs"].fillna(0).to_numpy(dtype=np.float32)
+        self.department_fit = self._department_fit()
+
+    @staticmethod
+    def _column(frame, name):
+        if name in frame:
+            return frame[name].tolist()
+        return [None] * len(frame)
+
+    def _department_fit(self):
+        """(n_students x n_companies) bool, True where the company prefers the student's department"""
+        departments, codes = np.unique(self.students["department"].astype(str).to_numpy(), return_inverse=True)
+        preferred = [
+            [d for d in _as_list(cell) if d not in ANY_DEPARTMENT]
+            for cell in self._column(self.companies, "preferred_departments")
+        ]
+
+        # Companies without a preference accept every department
+        lookup = np.array([
+            [not p or d in p for p in preferred]
+            for d in departments
+        ], dtype=bool).reshape(len(departments), len(self.companies))
+        return lookup[codes.ravel()]
+
+    def skill_overlap(self):
+        """
+        Fraction of each company's required skills a student has, shape
+        (n_students x n_companies). Companies with no requirements score 1.
+        """
+        matched = overlap_matrix(self.student_skills, self.company_skills).astype(np.float32)
+        required = self.required_counts.astype(np.float32)
+        return np.where(required > 0, matched / np.maximum(required, 1), np.float32(1.0))
+
+    def score_matrix(self):
+        """(n_students x n_companies) match scores clipped to 0-100"""
+        w = self.weights
+
+        cgpa_score = np.minimum(self.cgpa * 10, 30)[:, None] * w["cgpa"]
+        skills_score = self.skill_overlap() * (40 * w["skills"])
+        department_score = np.where(self.department_fit, 20, 15).astype(np.float32) * w["department"]
+        backlogs_penalty = (self.backlogs * 5)[:, None] * w["backlogs"]
+
+        scores = cgpa_score + skills_score + department_score - backlogs_penalty
+        return np.clip(scores, 0, 100, out=scores)
+
+    def components(self, rows, cols):
+        """
+        Score breakdown (cgpa_score, skills_score, department_score,
+        backlog_penalty) for (student row, company column) pairs. Before
+        clipping, match score = the three scores minus the penalty.
+        """
+        w = self.weights
+        rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+
+        matched = count(self.student_skills[rows] & self.company_skills[cols]).astype(np.float32)
+        required = self.required_counts[cols].astype(np.float32)
+        overlap = np.where(required > 0, matched / np.maximum(required, 1), np.float32(1.0))
+
+        breakdown = {
+            "cgpa_score": np.minimum(self.cgpa[rows] * 10, 30) * w["cgpa"],
+            "skills_score": overlap * (40 * w["skills"]),
+            "department_score": np.where(self.department_fit[rows, cols], 20, 15) * w["department"],
+            "backlog_penalty": self.backlogs[rows] * 5 * w["backlogs"]
+        }
+        return pd.DataFrame({k: np.round(np.asarray(v, dtype=np.float64), 2) for k, v in breakdown.items()})
+
+    def components_for(self, matches):
+        """Score breakdown for the rows of a top_matches/assign frame, aligned with it"""
+        rows = pd.Index(self.students["student_id"]).get_indexer(matches["student_id"])
+        cols = pd.Index(self.companies["name"]).get_indexer(matches["company"])
+        if (rows < 0).any() or (cols < 0).any():
+            raise ValueError("Matches refer to students or companies outside this engine")
+        return self.components(rows, cols).set_index(matches.index)
+
+    def top_matches(self, min_score=0, top_k=3, scores=None):
+        """
+        The best ``top_k`` companies per student scoring at least
+        ``min_score`` (all of them when top_k is None), best first.
+        """
+        scores = self.score_matrix() if scores is None else scores
+        n_students, n_companies = scores.shape
+
+        if top_k is None or top_k >= n_companies:
+            candidates = np.tile(np.arange(n_companies), (n_students, 1))
+        else:
+            candidates, _ = top_k_columns(scores, top_k)
+
+        rows = np.repeat(np.arange(n_students), candidates.shape[1])
+        cols = candidates.ravel()
+        picked = scores[rows, cols]
+
+        keep = picked >= min_score
+        rows, cols, picked = rows[keep], cols[keep], picked[keep]
+
+        order = np.lexsort((cols, rows, -picked))
+        return self._match_frame(rows[order], cols[order], picked[order])
+
+    def assign(self, capacities, min_score=0, method="auto", scores=None):
+        """
+        One company per student within each company's vacancies, maximising
+        total match score. Returns (matches DataFrame, assignment result).
+        """
+        scores = self.score_matrix() if scores is None else scores
+        result = assign_students(scores, capacities, min_score=min_score, method=method)
+        frame = self._match_frame(result["students"], result["companies"], result["scores"])
+        return frame, result
+
+    def _match_frame(self, rows, cols, picked):
+        """Display rows for (student, company, score) triples"""
+        students = self.students.iloc[rows].reset_index(drop=True)
+        matched = count(self.student_skills[rows] & self.company_skills[cols])
+        required = self.required_counts[cols]
+
+        cgpa_text = students["cgpa"].astype(str)
+        reason = "Strong " + students["department"].astype(str) + " background with CGPA " + cgpa_text
+        reason = reason.where(required == 0, reason + ", has " + pd.Series(matched).astype(str) +
+                              "/" + pd.Series(required).astype(str) + " required skills")
+
+        return pd.DataFrame({
+            "student_id": students["student_id"],
+            "student_name": students["name"],
+            "department": students["department"],
+            "cgpa": students["cgpa"],
+            "company": self.companies["name"].to_numpy()[cols],
+            "match_score": np.round(np.asarray(picked, dtype=np.float64), 1),
+            "recommended_role": np.where(students["department"].isin(SOFTWARE_DEPARTMENTS),
+                                         "Software Engineer", "Engineer"),
+            "reason": reason
+        })
@@ -0,0 +1,245 @@
+"""
+Placement KPIs kept up to date from placement, offer and student status events
+"""
+
+import heapq
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+
+class MaxTracker:
+    """Running maximum of a multiset with removals, via a heap with lazy deletion"""
+
+    def __init__(self):
+        self._heap = []
+        self._removed = Counter()
+
+    def add(self, value):
+        heapq.heappush(self._heap, -value)
+
+    def remove(self, value):
+        self._removed[value] += 1
+
+    def max(self):
+        while self._heap and self._removed[-self._heap[0]]:
+            self._removed[-self._heap[0]] -= 1
+            heapq.heappop(self._heap)
+        return -self._heap[0] if self._heap else None
+
+
+class ScopeStats:
+    """Counters for one scope (everything, a department, a company, ...)"""
+
+    def __init__(self):
+        self.count = 0
+        self.valued = 0
+        self.total = 0.0
+        self.statuses = Counter()
+        self.top = MaxTracker()
+
+    def apply(self, status, value, sign):
+        self.count += sign
+        self.statuses[status] += sign
+        if value is not None:
+            self.valued += sign
+            self.total += sign * value
+            if sign > 0:
+                self.top.add(value)
+            else:
+                self.top.remove(value)
+
+    @property
+    def mean(self):
+        return self.total / self.valued if self.valued else 0.0
+
+
+def _number(value):
+    value = pd.to_numeric(value, errors="coerce")
+    return None if pd.isna(value) else float(value)
+
+
+class MetricsStore:
+    """
+    Student and placement KPIs for a CollegeFlow session, maintained from
+    events instead of recomputed from the frames.
+
+    Each record sits in a few scopes (all, its department, and its status
+    or company and the department pairing of those), each with counters, a
+    running package sum and a max-heap, so every event is O(log n) and
+    every snapshot O(1).
+    Headline KPIs are appended to a history on each event. Placement
+    history is replayed from placement dates, so its deltas span real
+    time; student history starts when the store is built, so student
+    deltas are changes within the session.
+    """
+
+    def __init__(self, students=None, placements=None, history_size=2048):
+        self.history_size = history_size
+        self._students = {}
+        self._placements = {}
+        self._student_scopes = defaultdict(ScopeStats)
+        self._placement_scopes = defaultdict(ScopeStats)
+        self._history = {"students": [], "placements": []}
+        # Timestamps of each history, kept alongside it for bisecting
+        self._times = {"students": [], "placements": []}
+
+        if students is not None:
+            for student in students.to_dict("records"):
+                self._apply_student(student["student_id"], student, 1)
+            self._record("students")
+        if placements is not None and not placements.empty:
+            dates = pd.to_datetime(placements["placement_date"], errors="coerce")
+            for placement, at in sorted(zip(placements.to_dict("records"), dates),
+                                        key=lambda p: (pd.isna(p[1]), p[1] if not pd.isna(p[1]) else 0)):
+                self.placement_recorded(placement, None if pd.isna(at) else at.to_pydatetime())
+
+    # === EVENTS ===
+
+    @staticmethod
+    def _placement_scopes_of(record):
+        department, company = record.get("department"), record.get("company")
+        scopes = [("all",), ("department", department)]
+        if company is not None and not pd.isna(company):
+            scopes += [("company", company), ("department_company", department, company)]
+        return scopes
+
+    def _apply_student(self, student_id, student, sign):
+        record = {"department": student.get("department"), "company": student.get("company"),
+                  "status": student.get("placement_status"), "package": _number(student.get("package"))}
+        department, status = record["department"], record["status"]
+        for scope in [("all",), ("department", department), ("status", status),
+                      ("department_status", department, status)]:
+            self._student_scopes[scope].apply(status, record["package"], sign)
+        if sign > 0:
+            self._students[student_id] = record
+        else:
+            self._students.pop(student_id, None)
+
+    def student_added(self, student, at=None):
+        self._apply_student(student["student_id"], student, 1)
+        self._record("students", at)
+
+    def student_status_changed(self, student_id, status, company=None, package=None, at=None):
+        """A student's placement status (and company/package) changed; unknown students are ignored"""
+        old = self._students.get(student_id)
+        if old is None:
+            return False
+        self._apply_student(student_id, {**old, "placement_status": old["status"]}, -1)
+        self._apply_student(student_id, {
+            "department": old["department"], "placement_status": status,
+            "company": company if company is not None else old["company"],
+            "package": package if package is not None else old["package"]
+        }, 1)
+        self._record("students", at)
+        return True
+
+    def placement_recorded(self, placement, at=None):
+        placement_id = placement["placement_id"]
+        if placement_id in self._placements:
+            self._apply_placement(placement_id, self._placements[placement_id], -1)
+        self._apply_placement(placement_id, {
+            "department": placement.get("department"), "company": placement.get("company"),
+            "status": placement.get("status"), "package": _number(placement.get("package"))
+        }, 1)
+        self._record("placements", at)
+
+    def offer_status_changed(self, placement_id, status, at=None):
+        """A placement's offer status changed (e.g. Offer Pending -> Offer Accepted)"""
+        old = self._placements.get(placement_id)
+        if old is None:
+            return False
+        self._apply_placement(placement_id, old, -1)
+        self._apply_placement(placement_id, {**old, "status": status}, 1)
+        self._record("placements", at)
+        return True
+
+    def _apply_placement(self, placement_id, record, sign):
+        for scope in self._placement_scopes_of(record):
+            self._placement_scopes[scope].apply(record["status"], record["package"], sign)
+        if sign > 0:
+            self._placements[placement_id] = record
+        else:
+            self._placements.pop(placement_id, None)
+
+    # === SNAPSHOTS ===
+
+    def student_kpis(self, department=None, status=None):
+        """Totals, placed/intern counts, placement rate and package stats, optionally for a department and/or status"""
+        if department is not None and status is not None:
+            scope = ("department_status", department, status)
+        elif department is not None:
+            scope = ("department", department)
+        elif status is not None:
+            scope = ("status", status)
+        else:
+            scope = ("all",)
+        stats = self._student_scopes.get(scope, ScopeStats())
+        total, placed, interns = stats.count, stats.statuses["Placed"], stats.statuses["Intern"]
+        return {
+            "total": total,
+            "placed": placed,
+            "interns": interns,
+            "placement_rate": placed / total * 100 if total else 0.0,
+            "avg_package": stats.mean,
+            "max_package": stats.top.max() or 0.0
+        }
+
+    def placement_kpis(self, department=None, company=None):
+        """Placement count, package total/average/max and offer statuses, optionally for a department and/or company"""
+        if department is not None and company is not None:
+            scope = ("department_company", department, company)
+        elif department is not None:
+            scope = ("department", department)
+        elif company is not None:
+            scope = ("company", company)
+        else:
+            scope = ("all",)
+        stats = self._placement_scopes.get(scope, ScopeStats())
+        return {
+            "placements": stats.count,
+            "total_package": stats.total,
+            "avg_package": stats.mean,
+            "max_package": stats.top.max() or 0.0,
+            "statuses": dict(+stats.statuses)
+        }
+
+    # === HISTORY ===
+
+    def _record(self, family, at=None):
+        snapshot = self.student_kpis() if family == "students" else self.placement_kpis()
+        snapshot.pop("statuses", None)
+        history, times = self._history[family], self._times[family]
+        at = at or datetime.now()
+        # Replayed events can arrive out of order; keep the history sorted by time
+        i = bisect_right(times, at)
+        history.insert(i, (at, snapshot))
+        times.insert(i, at)
+        del history[:-self.history_size]
+        del times[:-self.history_size]
+
+    def delta(self, family, kpi, days=None):
+        """
+        Change of a headline KPI ("students" or "placements" family) since
+        ``days`` ago, or since the oldest snapshot when days is None. None
+        when there is no snapshot that old.
+        """
+        history = self._history[family]
+        if not history:
+            return None
+        if days is None:
+            past = history[0][1]
+        else:
+            i = bisect_right(self._times[family], datetime.now() - timedelta(days=days))
+            if i == 0:
+                return None
+            past = history[i - 1][1]
+        current = self.student_kpis() if family == "students" else self.placement_kpis()
+        return current[kpi] - past[kpi]
+
+    def history(self, family):
+        """The snapshots of a family as a DataFrame indexed by time"""
+        entries = self._history[family]
+        return pd.DataFrame([s for _, s in entries], index=pd.DatetimeIndex([t for t, _ in entries], name="at"))
@@ -0,0 +1,238 @@
+"""
+Versioned model registry with manifests, an atomic active pointer and rollback
+"""
+
+import json
+import os
+import stat
+import tempfile
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+
+MODEL_FILE = "model.pkl"
+MANIFEST_FILE = "manifest.json"
+ACTIVE_FILE = "ACTIVE"
+ACTIVATION_LOG = "activations.log"
+
+
+def _atomic_write(path, text):
+    """Write a small file so readers see either the old or the new content"""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def benchmark_latency(model, X_sample, runs=100):
+    """Single-row predict_proba latency percentiles in milliseconds"""
+    X_sample = X_sample if isinstance(X_sample, pd.DataFrame) else pd.DataFrame(X_sample)
+    timings = []
+
+    # Warm up caches before timing
+    model.predict_proba(X_sample.iloc[:1])
+
+    for i in range(runs):
+        row = X_sample.iloc[[i % len(X_sample)]]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "p99_ms": round(float(np.percentile(timings, 99)), 3),
+        "runs": runs
+    }
+
+
+class ModelRegistry:
+    """
+    Directory layout::
+
+        <root>/versions/v0001/model.pkl       immutable artifact
+        <root>/versions/v0001/manifest.json   feature schema, metrics, benchmark
+        <root>/ACTIVE                         name of the active version
+        <root>/activations.log                one line per activation, rollbacks marked
+    """
+
+    def __init__(self, root="models/registry", latency_tolerance=0.25,
+                 latency_slack_ms=1.0, benchmark_runs=100):
+        self.root = root
+        self.versions_dir = os.path.join(root, "versions")
+        self.latency_tolerance = latency_tolerance
+        self.latency_slack_ms = latency_slack_ms
+        self.benchmark_runs = benchmark_runs
+        os.makedirs(self.versions_dir, exist_ok=True)
+
+    # === VERSIONS ===
+
+    def list_versions(self):
+        """All published version names, oldest first"""
+        return sorted(
+            name for name in os.listdir(self.versions_dir)
+            if os.path.exists(os.path.join(self.versions_dir, name, MANIFEST_FILE))
+        )
+
+    def get_manifest(self, version):
+        """Manifest for a published version"""
+        with open(os.path.join(self.versions_dir, version, MANIFEST_FILE)) as f:
+            return json.load(f)
+
+    def _claim_next_version(self):
+        """Create the next version directory; mkdir is atomic so racing publishers never share one"""
+        existing = [int(v[1:]) for v in os.listdir(self.versions_dir) if v.startswith("v") and v[1:].isdigit()]
+        number = max(existing, default=0) + 1
+
+        while True:
+            version = f"v{number:04d}"
+            try:
+                os.mkdir(os.path.join(self.versions_dir, version))
+                return version
+            except FileExistsError:
+                number += 1
+
+    # === ACTIVE POINTER ===
+
+    def active_version(self):
+        """Name of the active version, or None"""
+        path = os.path.join(self.root, ACTIVE_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            version = f.read().strip()
+        return version or None
+
+    def activate(self, version):
+        """Point ACTIVE at a published version"""
+        if version not in self.list_versions():
+            raise ValueError(f"Unknown model version: {version}")
+
+        self._set_active(version)
+
+    def _set_active(self, version, note=""):
+        _atomic_write(os.path.join(self.root, ACTIVE_FILE), version)
+        with open(os.path.join(self.root, ACTIVATION_LOG), "a") as f:
+            f.write(f"{datetime.now().isoformat(timespec='seconds')} {version} {note}".rstrip() + "\n")
+
+    def _activation_stack(self):
+        """
+        Replay the activation log into a stack of versions: activations push,
+        rollbacks pop, so the entry below the top is what a rollback returns to.
+        """
+        path = os.path.join(self.root, ACTIVATION_LOG)
+        if not os.path.exists(path):
+            return []
+        stack = []
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 2:
+                    continue
+                version = parts[1]
+                if parts[2:] == ["rollback"]:
+                    if stack:
+                        stack.pop()
+                    if stack and stack[-1] == version:
+                        continue
+                elif stack and stack[-1] == version:
+                    continue
+                stack.append(version)
+        return stack
+
+    def rollback(self):
+        """Re-activate the version that was active before the current one; repeated calls step further back"""
+        current = self.active_version()
+        stack = self._activation_stack()
+        while stack and stack[-1] == current:
+            stack.pop()
+        if not stack:
+            raise ValueError("No earlier model version to roll back to")
+        self._set_active(stack[-1], "rollback")
+        return stack[-1]
+
+    # === PUBLISH & LOAD ===
+
+    def publish(self, model, feature_names, X_sample, training_rows, metrics=None,
+                activate=True, force=False):
+        """
+        Benchmark, store and (optionally) activate a new model version.
+
+        Raises ValueError without writing anything when the candidate's p99
+        single-row latency regresses past the active version's by more than
+        the configured tolerance, unless ``force`` is set.
+        """
+        import sklearn
+
+        benchmark = benchmark_latency(model, X_sample, self.benchmark_runs)
+
+        active = self.active_version()
+        if active and not force:
+            baseline = self.get_manifest(active).get("benchmark", {}).get("p99_ms")
+            if baseline is not None:
+                limit = baseline * (1 + self.latency_tolerance) + self.latency_slack_ms
+                if benchmark["p99_ms"] > limit:
+                    raise ValueError(
+                        f"p99 latency {benchmark['p99_ms']:.2f}ms regresses past "
+                        f"{active} ({baseline:.2f}ms, limit {limit:.2f}ms)"
+                    )
+
+        version = self._claim_next_version()
+        version_dir = os.path.join(self.versions_dir, version)
+        model_path = os.path.join(version_dir, MODEL_FILE)
+
+        joblib.dump(model, model_path + ".tmp")
+        os.replace(model_path + ".tmp", model_path)
+
+        start = time.perf_counter()
+        joblib.load(model_path)
+        load_time_ms = (time.perf_counter() - start) * 1000
+
+        manifest = {
+            "version": version,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "model_class": type(model).__name__,
+            "feature_names": list(feature_names),
+            "training_rows": int(training_rows),
+            "metrics": metrics or {},
+            "sklearn_version": sklearn.__version__,
+            "load_time_ms": round(load_time_ms, 3),
+            "artifact_bytes": os.path.getsize(model_path),
+            "benchmark": benchmark
+        }
+        _atomic_write(os.path.join(version_dir, MANIFEST_FILE), json.dumps(manifest, indent=2))
+
+        # Published artifacts are never rewritten
+        for name in (MODEL_FILE, MANIFEST_FILE):
+            os.chmod(os.path.join(version_dir, name), stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+        if activate:
+            self.activate(version)
+
+        return manifest
+
+    def load(self, version=None):
+        """Load (model, manifest) for a version, defaulting to the active one"""
+        version = version or self.active_version()
+        if version is None:
+            raise ValueError("No active model version")
+
+        manifest = self.get_manifest(version)
+        model = joblib.load(os.path.join(self.versions_dir, version, MODEL_FILE))
+
+        expected = manifest.get("feature_names")
+        actual = list(getattr(model, "feature_names_in_", expected or []))
+        if expected and actual != expected:
+            raise ValueError(f"Model {version} feature schema does not match its manifest")
+
+        return model, manifest
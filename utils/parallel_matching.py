@@ -0,0 +1,180 @@
+"""
+Multi-college matching across a process pool, with score matrices returned through shared memory
+
+Run from the project root:
+
+    python -m utils.parallel_matching --db campus_placement.db
+    python -m utils.parallel_matching --synthetic 4 --students 10000 --companies 500
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.matching_engine import ALGORITHM_WEIGHTS, DEFAULT_ALGORITHM, MatchingEngine
+
+SCORE_DTYPE = np.float32
+
+
+def _score_block(shm_name, shape, students, companies, column_start, algorithm, partition):
+    """
+    Worker: score one (college, company block) partition straight into the
+    college's shared score matrix. Only timings travel back.
+    """
+    start = time.perf_counter()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        scores = np.ndarray(shape, dtype=SCORE_DTYPE, buffer=shm.buf)
+        block = MatchingEngine(students, companies, algorithm).score_matrix()
+        scores[:, column_start:column_start + block.shape[1]] = block
+        del scores
+    finally:
+        shm.close()
+
+    return {
+        **partition,
+        "rows": len(students),
+        "columns": len(companies),
+        "seconds": time.perf_counter() - start,
+        "pid": os.getpid()
+    }
+
+
+def score_colleges(students_by_college, companies, algorithm=DEFAULT_ALGORITHM,
+                   block_size=100, max_workers=None):
+    """
+    Score every college's students against ``companies`` in parallel.
+
+    Work is split into (college, company block) partitions. Each college
+    gets one shared-memory matrix that workers fill in place, so results
+    are never pickled. Returns ({college_id: score matrix}, partition
+    timings).
+    """
+    if algorithm not in ALGORITHM_WEIGHTS:
+        raise ValueError(f"Unknown matching algorithm: {algorithm}")
+
+    companies = companies.reset_index(drop=True)
+    segments = {}
+    results = {}
+    timings = []
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = []
+            for college_id, students in students_by_college.items():
+                students = students.reset_index(drop=True)
+                shape = (len(students), len(companies))
+                if 0 in shape:
+                    results[college_id] = np.empty(shape, dtype=SCORE_DTYPE)
+                    continue
+
+                shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(SCORE_DTYPE).itemsize)
+                segments[college_id] = (shm, shape)
+
+                for block, column_start in enumerate(range(0, len(companies), block_size)):
+                    partition = {"college_id": college_id, "block": block}
+                    futures.append(pool.submit(
+                        _score_block, shm.name, shape, students,
+                        companies.iloc[column_start:column_start + block_size],
+                        column_start, algorithm, partition
+                    ))
+
+            for future in as_completed(futures):
+                timings.append(future.result())
+
+        for college_id, (shm, shape) in segments.items():
+            results[college_id] = np.ndarray(shape, dtype=SCORE_DTYPE, buffer=shm.buf).copy()
+    finally:
+        for shm, _ in segments.values():
+            shm.close()
+            shm.unlink()
+
+    timings.sort(key=lambda t: (t["college_id"], t["block"]))
+    return results, timings
+
+
+# === CLI ===
+
+def synthetic_data(n_colleges, n_students, n_companies, seed=0):
+    """Random students per college and companies, in MatchingEngine's format"""
+    rng = np.random.default_rng(seed)
+    departments = ["Computer Science", "Information Technology", "Electrical Engineering",
+                   "Mechanical Engineering", "Civil Engineering"]
+    skills = [f"Skill {i}" for i in range(60)]
+
+    students_by_college = {}
+    for college_id in range(1, n_colleges + 1):
+        students_by_college[college_id] = pd.DataFrame({
+            "student_id": np.arange(n_students),
+            "name": [f"Student {i}" for i in range(n_students)],
+            "department": rng.choice(departments, n_students),
+            "cgpa": rng.uniform(5.0, 10.0, n_students).round(2),
+            "backlogs": rng.integers(0, 4, n_students),
+            "skills": [list(rng.choice(skills, 6, replace=False)) for _ in range(n_students)]
+        })
+
+    companies = pd.DataFrame({
+        "name": [f"Company {i}" for i in range(n_companies)],
+        "required_skills": [list(rng.choice(skills, 4, replace=False)) for _ in range(n_companies)],
+        "preferred_departments": [list(rng.choice(departments, 2, replace=False)) for _ in range(n_companies)]
+    })
+    return students_by_college, companies
+
+
+def database_data(db_path, college_ids=None):
+    """Unplaced students per college and active job postings from the database"""
+    from database.db_manager import DatabaseManager
+
+    db = DatabaseManager(db_path)
+    college_ids = college_ids or db.get_college_ids()
+    students_by_college = {c: db.get_matching_students(college_id=c) for c in college_ids}
+    return students_by_college, db.get_matching_jobs()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score students against companies for several colleges in parallel")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--db", default="campus_placement.db", help="SQLite database to read students and jobs from")
+    source.add_argument("--synthetic", type=int, metavar="COLLEGES", help="use random data for this many colleges")
+    parser.add_argument("--colleges", type=int, nargs="*", help="college ids to score (default: all)")
+    parser.add_argument("--students", type=int, default=10000, help="students per synthetic college")
+    parser.add_argument("--companies", type=int, default=500, help="synthetic companies")
+    parser.add_argument("--algorithm", default=DEFAULT_ALGORITHM, choices=list(ALGORITHM_WEIGHTS))
+    parser.add_argument("--block-size", type=int, default=100, help="companies per partition")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        students_by_college, companies = synthetic_data(args.synthetic, args.students, args.companies)
+    else:
+        students_by_college, companies = database_data(args.db, args.colleges)
+
+    start = time.perf_counter()
+    results, timings = score_colleges(students_by_college, companies, args.algorithm,
+                                      args.block_size, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'college':>8} {'block':>6} {'rows':>8} {'cols':>6} {'seconds':>9} {'pid':>8}")
+    for t in timings:
+        print(f"{t['college_id']:>8} {t['block']:>6} {t['rows']:>8} {t['columns']:>6} "
+              f"{t['seconds']:>9.3f} {t['pid']:>8}")
+
+    for college_id, scores in results.items():
+        best = scores.max(axis=1).mean() if scores.size else float("nan")
+        print(f"College {college_id}: {scores.shape[0]} students x {scores.shape[1]} companies, "
+              f"mean best score {best:.1f}")
+
+    busy = sum(t["seconds"] for t in timings)
+    print(f"Wall time {elapsed:.2f}s, worker time {busy:.2f}s across {len(timings)} partitions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Background PDF/Excel/HTML report generation with a job queue and a cache of finished reports
+"""
+
+import html
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+PAGE_ROWS = 500
+
+FORMATS = {
+    "PDF": ("pdf", "application/pdf"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "HTML": ("html", "text/html")
+}
+
+
+def _pages(frame, page_rows):
+    """A table as successive pages of display strings, so only one page is converted at a time"""
+    for start in range(0, len(frame), page_rows):
+        page = frame.iloc[start:start + page_rows]
+        yield [[_text(value) for value in row] for row in page.itertuples(index=False, name=None)]
+
+
+def _text(value):
+    if value is None or (not isinstance(value, (list, tuple, np.ndarray)) and pd.isna(value)):
+        return ""
+    if isinstance(value, (float, np.floating)):
+        return f"{value:,.2f}"
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return ", ".join(str(v) for v in value)
+    return str(value)
+
+
+# === RENDERERS ===
+# Each writes a report ({"title", "subtitle", "summary": [(label, value)],
+# "tables": [(heading, DataFrame)]}) to a path, calling progress(rows) per page.
+
+def render_html(report, path, progress, page_rows=PAGE_ROWS):
+    with open(path, "w", encoding="utf-8") as out:
+        out.write("<!DOCTYPE html><html><head><meta charset='utf-8'>"
+                  f"<title>{html.escape(report['title'])}</title><style>"
+                  "body{font-family:Arial,sans-serif;margin:32px;color:#222}"
+                  "table{border-collapse:collapse;margin-bottom:24px;font-size:13px}"
+                  "th,td{border:1px solid #ccc;padding:4px 8px;text-align:left}th{background:#f0f2f6}"
+                  "</style></head><body>")
+        out.write(f"<h1>{html.escape(report['title'])}</h1><p>{html.escape(report.get('subtitle', ''))}</p>")
+
+        if report.get("summary"):
+            out.write("<h2>Summary</h2><table>")
+            out.writelines(f"<tr><th>{html.escape(label)}</th><td>{html.escape(_text(value))}</td></tr>"
+                           for label, value in report["summary"])
+            out.write("</table>")
+
+        for heading, frame in report.get("tables", []):
+            out.write(f"<h2>{html.escape(heading)}</h2><table><thead><tr>")
+            out.writelines(f"<th>{html.escape(str(c))}</th>" for c in frame.columns)
+            out.write("</tr></thead><tbody>")
+            for rows in _pages(frame, page_rows):
+                out.writelines("<tr>" + "".join(f"<td>{html.escape(v)}</td>" for v in row) + "</tr>"
+                               for row in rows)
+                progress(len(rows))
+            out.write("</tbody></table>")
+        out.write("</body></html>")
+
+
+def render_pdf(report, path, progress, page_rows=PAGE_ROWS):
+    """Drawn line by line on a canvas, so no table object holding every row is built"""
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.pdfgen import canvas
+
+    width, height = landscape(A4)
+    margin, line = 36, 14
+    pdf = canvas.Canvas(path, pagesize=landscape(A4))
+    pdf.setTitle(report["title"])
+    y = height - margin
+
+    def fit(text, size, room, font="Helvetica"):
+        while text and stringWidth(text, font, size) > room:
+            text = text[:-2] + "…" if len(text) > 1 else ""
+        return text
+
+    def new_page():
+        nonlocal y
+        pdf.showPage()
+        y = height - margin
+
+    def write(text, size=9, font="Helvetica", x=margin):
+        nonlocal y
+        if y < margin + line:
+            new_page()
+        pdf.setFont(font, size)
+        pdf.drawString(x, y, fit(text, size, width - x - margin, font))
+        y -= line + (size - 9)
+
+    def row(values, columns, font="Helvetica"):
+        nonlocal y
+        pdf.setFont(font, 8)
+        for i, value in enumerate(values):
+            pdf.drawString(margin + i * columns, y, fit(value, 8, columns - 4, font))
+        y -= line
+
+    write(report["title"], 16, "Helvetica-Bold")
+    write(report.get("subtitle", ""), 9)
+    y -= line / 2
+
+    if report.get("summary"):
+        write("Summary", 12, "Helvetica-Bold")
+        for label, value in report["summary"]:
+            write(f"{label}: {_text(value)}")
+        y -= line / 2
+
+    for heading, frame in report.get("tables", []):
+        if y < margin + 4 * line:
+            new_page()
+        write(heading, 12, "Helvetica-Bold")
+        header = [str(c) for c in frame.columns]
+        columns = (width - 2 * margin) / max(len(header), 1)
+        row(header, columns, "Helvetica-Bold")
+        for rows in _pages(frame, page_rows):
+            for values in rows:
+                if y < margin:
+                    new_page()
+                    row(header, columns, "Helvetica-Bold")
+                row(values, columns)
+            progress(len(rows))
+        y -= line / 2
+    pdf.save()
+
+
+_XLSX_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_XLSX_RELS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PACKAGE_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def _xlsx_row(values):
+    cells = []
+    for value in values:
+        if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool) \
+                and np.isfinite(value):
+            cells.append(f"<c><v>{value}</v></c>")
+        elif value is None or (not isinstance(value, (list, tuple, np.ndarray)) and pd.isna(value)):
+            cells.append("<c/>")
+        else:
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_text(value))}</t></is></c>')
+    return "<row>" + "".join(cells) + "</row>"
+
+
+def render_xlsx(report, path, progress, page_rows=PAGE_ROWS):
+    """
+    SpreadsheetML written straight into the zip, one sheet per table and a
+    page of rows at a time, so the workbook is never held in memory.
+    """
+    sheets = [("Summary", None)] if report.get("summary") else []
+    used = set()
+    for heading, frame in report.get("tables", []):
+        name = "".join(c for c in heading if c not in "[]:*?/\\")[:31] or "Sheet"
+        while name in used:
+            name = name[:28] + f"~{len(used)}"
+        used.add(name)
+        sheets.append((name, frame))
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as book:
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, len(sheets) + 1))
+        book.writestr("[Content_Types].xml",
+                      '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                      '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                      '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                      '<Default Extension="xml" ContentType="application/xml"/>'
+                      '<Override PartName="/xl/workbook.xml" '
+                      'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                      f'{overrides}</Types>')
+        book.writestr("_rels/.rels",
+                      f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="{_PACKAGE_RELS}">'
+                      f'<Relationship Id="rId1" Type="{_XLSX_RELS}/officeDocument" Target="xl/workbook.xml"/>'
+                      '</Relationships>')
+        book.writestr("xl/workbook.xml",
+                      f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                      f'<workbook xmlns="{_XLSX_MAIN}" xmlns:r="{_XLSX_RELS}"><sheets>'
+                      + "".join(f'<sheet name="{escape(name)}" sheetId="{i}" r:id="rId{i}"/>'
+                                for i, (name, _) in enumerate(sheets, 1))
+                      + "</sheets></workbook>")
+        book.writestr("xl/_rels/workbook.xml.rels",
+                      f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="{_PACKAGE_RELS}">'
+                      + "".join(f'<Relationship Id="rId{i}" Type="{_XLSX_RELS}/worksheet" '
+                                f'Target="worksheets/sheet{i}.xml"/>' for i in range(1, len(sheets) + 1))
+                      + "</Relationships>")
+
+        for i, (name, frame) in enumerate(sheets, 1):
+            with book.open(f"xl/worksheets/sheet{i}.xml", "w") as sheet:
+                sheet.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                            f'<worksheet xmlns="{_XLSX_MAIN}"><sheetData>'.encode())
+                if frame is None:
+                    rows = [[report["title"]], [report.get("subtitle", "")], []]
+                    rows += [[label, value] for label, value in report["summary"]]
+                    sheet.write("".join(_xlsx_row(r) for r in rows).encode())
+                else:
+                    sheet.write(_xlsx_row([str(c) for c in frame.columns]).encode())
+                    for start in range(0, len(frame), page_rows):
+                        page = frame.iloc[start:start + page_rows]
+                        sheet.write("".join(_xlsx_row(r) for r in page.itertuples(index=False, name=None)).encode())
+                        progress(len(page))
+                sheet.write(b"</sheetData></worksheet>")
+
+
+RENDERERS = {"PDF": render_pdf, "Excel": render_xlsx, "HTML": render_html}
+
+
+# === JOBS ===
+
+class ReportJob:
+    """One report request; status goes queued -> running -> done or failed"""
+
+    def __init__(self, job_id, key, fmt, file_name):
+        self.job_id = job_id
+        self.key = key
+        self.format = fmt
+        self.file_name = file_name
+        self.status = "queued"
+        self.progress = 0.0
+        self.message = "Waiting for a worker"
+        self.path = None
+        self.report = None
+        self.error = None
+        self.created = time.time()
+        self.seconds = None
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    @property
+    def mime(self):
+        return FORMATS[self.format][1]
+
+    def read(self):
+        """The rendered file's bytes"""
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+class ReportEngine:
+    """
+    Renders reports on a background thread pool. Jobs are keyed by the
+    caller's (filters, data version) key plus format: a key already being
+    rendered returns the same job, and a finished one is served from an
+    LRU cache of rendered files until evicted.
+    """
+
+    def __init__(self, max_workers=2, cache_size=32, page_rows=PAGE_ROWS, reports_dir=None):
+        self.page_rows = page_rows
+        self.cache_size = cache_size
+        self.reports_dir = reports_dir
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self._jobs = {}
+        self._by_key = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _dir(self):
+        if self.reports_dir is None:
+            self.reports_dir = tempfile.mkdtemp(prefix="placement-reports-")
+        os.makedirs(self.reports_dir, exist_ok=True)
+        return self.reports_dir
+
+    def submit(self, key, build, fmt, file_name="placement_report", preview_tables=()):
+        """
+        Queue a report. ``build()`` runs on the worker and returns the
+        report dict; ``key`` must change whenever the filters or the data
+        behind them do. Once the file is rendered, job.report keeps only
+        the tables named in ``preview_tables``, so cached jobs do not hold
+        full record tables. Returns the ReportJob (possibly a cached one).
+        """
+        if fmt not in RENDERERS:
+            raise ValueError(f"Unknown report format: {fmt}")
+
+        cache_key = (key, fmt)
+        with self._lock:
+            job = self._by_key.get(cache_key)
+            if job is not None and job.status != "failed":
+                self._by_key.move_to_end(cache_key)
+                return job
+
+            job = ReportJob(next(self._ids), cache_key, fmt, f"{file_name}.{FORMATS[fmt][0]}")
+            self._jobs[job.job_id] = job
+            self._by_key[cache_key] = job
+            self._evict()
+        self._pool.submit(self._run, job, build, preview_tables)
+        return job
+
+    def job(self, job_id):
+        return self._jobs.get(job_id)
+
+    def _run(self, job, build, preview_tables=()):
+        started = time.perf_counter()
+        job.status, job.message = "running", "Collecting data"
+        try:
+            report = job.report = build()
+            total = sum(len(frame) for _, frame in report.get("tables", [])) or 1
+            done = 0
+
+            def progress(rows):
+                nonlocal done
+                done += rows
+                job.progress = min(done / total, 1.0)
+                job.message = f"Rendered {done:,} of {total:,} rows"
+
+            path = os.path.join(self._dir(), f"report-{job.job_id}.{FORMATS[job.format][0]}")
+            RENDERERS[job.format](report, path + ".tmp", progress, self.page_rows)
+            os.replace(path + ".tmp", path)
+            job.path, job.progress, job.message, job.status = path, 1.0, "Ready", "done"
+        except Exception as e:
+            job.status, job.error, job.message = "failed", str(e), f"Failed: {e}"
+        if job.report is not None:
+            job.report = {**job.report, "tables": [(name, frame) for name, frame in job.report.get("tables", [])
+                                                   if name in preview_tables]}
+        job.seconds = time.perf_counter() - started
+
+    def _evict(self):
+        """Drop the least recently used finished reports beyond cache_size (caller holds the lock)"""
+        while len(self._by_key) > self.cache_size:
+            key, job = next(iter(self._by_key.items()))
+            if not job.finished:
+                break
+            del self._by_key[key]
+            self._jobs.pop(job.job_id, None)
+            if job.path and os.path.exists(job.path):
+                os.remove(job.path)
+
+    def clear(self):
+        """Forget every finished report and delete the files"""
+        with self._lock:
+            for key, job in list(self._by_key.items()):
+                if job.finished:
+                    del self._by_key[key]
+                    self._jobs.pop(job.job_id, None)
+            if self.reports_dir and not self._by_key:
+                shutil.rmtree(self.reports_dir, ignore_errors=True)
+
+
+report_engine = ReportEngine()
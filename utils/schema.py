@@ -0,0 +1,101 @@
+"""
+Compact column dtypes and memory budgets for the in-memory tables
+"""
+
+import pandas as pd
+
+# Per table: column -> dtype enforced at load time. Low-cardinality text is
+# categorical, CGPA/package float32 and small counts int8/int16.
+SCHEMAS = {
+    "students": {
+        "department": "category",
+        "semester": "int8",
+        "cgpa": "float32",
+        "backlogs": "int8",
+        "graduation_year": "int16",
+        "placement_status": "category",
+        "company": "category",
+        "package": "float32"
+    },
+    "placements": {
+        "department": "category",
+        "company": "category",
+        "job_role": "category",
+        "package": "float32",
+        "status": "category"
+    },
+    "student_profiles": {
+        "department": "category",
+        "semester": "int8",
+        "cgpa": "float32",
+        "backlogs": "int8",
+        "placement_status": "category",
+        "placement_company": "category"
+    },
+    "colleges": {
+        "location": "category",
+        "established": "int16",
+        "accreditation": "category",
+        "total_students": "int32",
+        "faculty_count": "int16",
+        "placement_rate": "float32",
+        "avg_package": "float32"
+    }
+}
+
+# Deep memory per row each table may use, in bytes
+BUDGETS = {
+    "students": 240,
+    "placements": 100,
+    "student_profiles": 240,
+    "colleges": 200
+}
+
+
+def _cast(series, dtype):
+    if dtype == "category":
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    if dtype.startswith("int") and series.isna().any():
+        # Plain integer dtypes cannot hold missing values; use the nullable variant
+        dtype = dtype.capitalize()
+    return series.astype(dtype)
+
+
+def apply_schema(frame, table):
+    """``frame`` with the table's dtypes applied to the columns it has"""
+    columns = {column: _cast(frame[column], dtype)
+               for column, dtype in SCHEMAS[table].items() if column in frame}
+    return frame.assign(**columns) if columns else frame
+
+
+def set_values(frame, rows, column, value):
+    """
+    ``frame.loc[rows, column] = value``, first adding ``value`` to the
+    categories of a categorical column that does not have it yet.
+    """
+    series = frame[column]
+    if isinstance(series.dtype, pd.CategoricalDtype) and value is not None \
+            and not pd.isna(value) and value not in series.cat.categories:
+        frame[column] = series.cat.add_categories([value])
+    frame.loc[rows, column] = value
+
+
+def memory_report(tables):
+    """
+    Rows, deep bytes, bytes per row and budget for each of ``tables``
+    ({table name: frame}), one row per table.
+    """
+    report = []
+    for table, frame in tables.items():
+        size = int(frame.memory_usage(deep=True).sum())
+        per_row = size / len(frame) if len(frame) else 0.0
+        budget = BUDGETS.get(table)
+        report.append({
+            "table": table,
+            "rows": len(frame),
+            "bytes": size,
+            "bytes_per_row": round(per_row, 1),
+            "budget_per_row": budget,
+            "within_budget": budget is None or per_row <= budget
+        })
+    return pd.DataFrame(report)
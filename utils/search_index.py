@@ -0,0 +1,181 @@
+"""
+In-memory trigram and prefix search over student records
+"""
+
+import re
+from bisect import bisect_left, insort
+
+import numpy as np
+import pandas as pd
+
+# Columns searched, in the order used to show a record's text
+DEFAULT_FIELDS = ["student_id", "name", "email", "skills"]
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+def _field_text(value):
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return ", ".join(str(v) for v in value).lower()
+    if value is None or pd.isna(value):
+        return ""
+    return str(value).lower()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _PrefixMap:
+    """Key -> set of ids, with the distinct keys kept sorted for prefix ranges"""
+
+    def __init__(self):
+        self.ids = {}
+        self.keys = []
+
+    def add(self, key, record_id):
+        if key not in self.ids:
+            self.ids[key] = set()
+            insort(self.keys, key)
+        self.ids[key].add(record_id)
+
+    def discard(self, key, record_id):
+        ids = self.ids.get(key)
+        if ids is None:
+            return
+        ids.discard(record_id)
+        if not ids:
+            del self.ids[key]
+            del self.keys[bisect_left(self.keys, key)]
+
+    def exact(self, key):
+        return self.ids.get(key, set())
+
+    def prefixed(self, prefix):
+        matches = set()
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix):
+            matches |= self.ids[self.keys[i]]
+            i += 1
+        return matches
+
+
+class SearchIndex:
+    """
+    Case-insensitive search over a few columns of a frame, returning ids
+    ranked in tiers: whole field equal to the query, field starting with
+    it, a word starting with it, then any substring. Ids within a tier
+    keep frame order.
+
+    Equality and prefixes are lookups in sorted key maps. Substrings come
+    from intersecting the trigram posting sets of the query, which hold
+    every record containing it, and are then confirmed; queries shorter
+    than a trigram scan every record instead. ``row(id)`` maps
+    an id to its row position in the indexed frame.
+    """
+
+    def __init__(self, frame=None, id_column="student_id", fields=None):
+        self.id_column = id_column
+        self.fields = list(fields or DEFAULT_FIELDS)
+        self._texts = {}
+        self._rows = {}
+        self._size = 0
+        self._values = _PrefixMap()
+        self._words = _PrefixMap()
+        self._postings = {}
+        if frame is not None:
+            self.add_many(frame)
+
+    def __len__(self):
+        return len(self._texts)
+
+    # === MAINTENANCE ===
+
+    def add(self, record, row=None):
+        """Index one record (dict with id_column); ``row`` is its position in the frame, default the end"""
+        record_id = record[self.id_column]
+        if record_id in self._texts:
+            self.remove(record_id)
+
+        texts = tuple(_field_text(record.get(field)) for field in self.fields)
+        self._texts[record_id] = texts
+        self._rows[record_id] = self._size if row is None else row
+        self._size = max(self._size, self._rows[record_id] + 1)
+        self._index(record_id, texts, add=True)
+
+    def add_many(self, frame):
+        start = self._size
+        for offset, record in enumerate(frame.to_dict("records")):
+            self.add(record, start + offset)
+
+    def remove(self, record_id):
+        texts = self._texts.pop(record_id, None)
+        if texts is None:
+            return False
+        self._rows.pop(record_id, None)
+        self._index(record_id, texts, add=False)
+        return True
+
+    def _index(self, record_id, texts, add):
+        grams, words = set(), set()
+        for text in texts:
+            if not text:
+                continue
+            grams |= _trigrams(text)
+            words.update(_TOKEN.findall(text))
+            if add:
+                self._values.add(text, record_id)
+            else:
+                self._values.discard(text, record_id)
+
+        for word in words:
+            if add:
+                self._words.add(word, record_id)
+            else:
+                self._words.discard(word, record_id)
+        for gram in grams:
+            if add:
+                self._postings.setdefault(gram, set()).add(record_id)
+            else:
+                self._postings[gram].discard(record_id)
+
+    # === QUERIES ===
+
+    def _substring(self, query, exclude, limit=None):
+        """Ids (in frame order) with the query inside a field, skipping ``exclude``"""
+        if len(query) < 3:
+            candidates = self._texts.keys() - exclude
+        else:
+            postings = sorted((self._postings.get(gram, set()) for gram in _trigrams(query)), key=len)
+            candidates = postings[0].intersection(*postings[1:]) - exclude
+        matches = []
+        for c in sorted(candidates, key=self._rows.__getitem__):
+            if any(query in text for text in self._texts[c]):
+                matches.append(c)
+                if limit and len(matches) >= limit:
+                    break
+        return matches
+
+    def search(self, query, limit=None):
+        """Ids matching ``query``, best tier first; ``limit`` stops once enough are found"""
+        query = str(query).strip().lower()
+        if not query:
+            return []
+
+        ranked, seen = [], set()
+        for found in (self._values.exact(query), self._values.prefixed(query), self._words.prefixed(query)):
+            found = found - seen
+            ranked.extend(sorted(found, key=self._rows.__getitem__))
+            seen |= found
+            if limit and len(ranked) >= limit:
+                return ranked[:limit]
+
+        ranked.extend(self._substring(query, seen, limit and limit - len(ranked)))
+        return ranked
+
+    def row(self, record_id):
+        """Row position of an id in the indexed frame (KeyError if unknown)"""
+        return self._rows[record_id]
+
+    def rows(self, record_ids):
+        return [self._rows[r] for r in record_ids]
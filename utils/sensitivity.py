@@ -0,0 +1,93 @@
+"""
+What-if sensitivity sweeps over one or two model features
+"""
+
+import numpy as np
+
+
+def feature_grid(start, stop, steps, integer=False):
+    """Evenly spaced values for a sweep axis (unique whole numbers for count features)"""
+    values = np.linspace(start, stop, steps)
+    if integer:
+        values = np.unique(np.round(values))
+    return values
+
+
+def sensitivity_grid(predict_fn, base_vector, feature_names, ranges, threshold=None):
+    """
+    Evaluate a base profile over a 1-D or 2-D grid of feature values.
+
+    ``predict_fn`` maps an (n x k) matrix to n probabilities and is called
+    exactly once for the whole grid (plus the base row). ``ranges`` maps one
+    or two feature names to arrays of values to sweep.
+
+    Returns a dict with the swept ``features``, their ``axes``, the
+    probability ``surface`` (shape len(axis0) or len(axis0) x len(axis1)),
+    the ``base_probability`` and, when ``threshold`` is given, the
+    ``min_change`` needed to reach it (None if no grid point does).
+    """
+    if not 1 <= len(ranges) <= 2:
+        raise ValueError("Sensitivity sweeps take one or two features")
+
+    features = list(ranges.keys())
+    axes = [np.asarray(ranges[f], dtype=np.float64) for f in features]
+    columns = [feature_names.index(f) for f in features]
+    base_vector = np.asarray(base_vector, dtype=np.float64)
+
+    mesh = np.meshgrid(*axes, indexing="ij")
+    n_points = mesh[0].size
+
+    X = np.tile(base_vector, (n_points + 1, 1))
+    for column, values in zip(columns, mesh):
+        X[1:, column] = values.ravel()
+
+    probabilities = np.asarray(predict_fn(X), dtype=np.float64)
+    base_probability = float(probabilities[0])
+    surface = probabilities[1:].reshape(mesh[0].shape)
+
+    result = {
+        "features": features,
+        "axes": axes,
+        "surface": surface,
+        "base_probability": base_probability,
+        "min_change": None
+    }
+
+    if threshold is not None:
+        result["min_change"] = minimum_change(base_vector, columns, features, axes, mesh,
+                                              surface, base_probability, threshold)
+
+    return result
+
+
+def minimum_change(base_vector, columns, features, axes, mesh, surface, base_probability, threshold):
+    """
+    Smallest move from the base profile that reaches ``threshold``.
+
+    Distance is the sum of per-feature changes scaled by each axis span, so
+    one full-range step in either feature costs the same.
+    """
+    if base_probability >= threshold:
+        return {
+            "values": {f: float(base_vector[c]) for f, c in zip(features, columns)},
+            "deltas": {f: 0.0 for f in features},
+            "probability": base_probability
+        }
+
+    reachable = surface >= threshold
+    if not reachable.any():
+        return None
+
+    distance = np.zeros(surface.shape)
+    for column, axis, values in zip(columns, axes, mesh):
+        span = (axis.max() - axis.min()) or 1.0
+        distance += np.abs(values - base_vector[column]) / span
+
+    distance = np.where(reachable, distance, np.inf)
+    best = np.unravel_index(np.argmin(distance), surface.shape)
+
+    return {
+        "values": {f: float(values[best]) for f, values in zip(features, mesh)},
+        "deltas": {f: float(values[best] - base_vector[c]) for f, c, values in zip(features, columns, mesh)},
+        "probability": float(surface[best])
+    }
@@ -0,0 +1,147 @@
+"""
+Packed skill bitsets: overlap, Jaccard and skill gaps as popcounts
+"""
+
+import numpy as np
+
+WORD_BITS = 64
+
+if hasattr(np, "bitwise_count"):
+    def popcount(words):
+        """Set bits per uint64 word"""
+        return np.bitwise_count(words)
+else:
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        """Set bits per uint64 word (byte lookup for NumPy < 2.0)"""
+        words = np.ascontiguousarray(words, dtype=np.uint64)
+        counts = _BYTE_COUNTS[words.view(np.uint8)]
+        return counts.reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def _split(skills):
+    """Skills as a list from a list, a comma-separated string or a missing value"""
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    elif skills is None or not hasattr(skills, "__iter__"):
+        return []
+    return [str(s).strip() for s in skills if str(s).strip()]
+
+
+def count(bits):
+    """Number of skills in each bitset (sums over the last axis)"""
+    return popcount(bits).sum(axis=-1, dtype=np.int64)
+
+
+def overlap(a, b):
+    """Skills shared by a and b; broadcasts over leading axes"""
+    return count(a & b)
+
+
+def jaccard(a, b):
+    """|a & b| / |a | b|, 0 where both are empty"""
+    union = count(a | b)
+    return np.where(union > 0, overlap(a, b) / np.maximum(union, 1), 0.0)
+
+
+def missing(required, have):
+    """Bitsets of required skills not in have"""
+    return required & ~have
+
+
+def overlap_matrix(a, b, chunk_rows=4096):
+    """
+    Pairwise overlap counts between rows of a (n x w) and b (m x w), as an
+    (n x m) array. Rows are processed in chunks to bound the temporary
+    (chunk x m x w) array.
+    """
+    result = np.empty((len(a), len(b)), dtype=np.int64)
+    for start in range(0, len(a), chunk_rows):
+        block = a[start:start + chunk_rows, None, :] & b[None, :, :]
+        result[start:start + chunk_rows] = count(block)
+    return result
+
+
+class SkillVocabulary:
+    """
+    Maps skill names to bit positions. Lookups are case-insensitive and
+    keep the first spelling seen for decoding.
+    """
+
+    def __init__(self, skills=()):
+        self._index = {}
+        self._names = []
+        for skill in _split(skills):
+            self.add(skill)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, skill):
+        return str(skill).strip().lower() in self._index
+
+    @property
+    def n_words(self):
+        return max(1, -(-len(self._names) // WORD_BITS))
+
+    @property
+    def names(self):
+        return list(self._names)
+
+    def add(self, skill):
+        """Bit position for a skill, assigning the next one if it is new"""
+        key = skill.strip().lower()
+        if key not in self._index:
+            self._index[key] = len(self._names)
+            self._names.append(skill.strip())
+        return self._index[key]
+
+    def update(self, skill_lists):
+        """Add every skill from several lists"""
+        for skills in skill_lists:
+            for skill in _split(skills):
+                self.add(skill)
+        return self
+
+    def encode(self, skills, n_words=None):
+        """
+        One bitset (uint64 array of n_words) for a list or comma string of
+        skills. Skills outside the vocabulary are ignored.
+        """
+        return self.encode_many([skills], n_words)[0]
+
+    def encode_many(self, skill_lists, n_words=None):
+        """(n x n_words) bitsets, one row per skill list"""
+        n_words = n_words or self.n_words
+        bits = np.zeros((len(skill_lists), n_words), dtype=np.uint64)
+
+        pairs = [
+            (row, self._index[skill.lower()])
+            for row, skills in enumerate(skill_lists)
+            for skill in _split(skills)
+            if skill.lower() in self._index
+        ]
+        if pairs:
+            rows, positions = np.array(pairs, dtype=np.int64).T
+            masks = np.left_shift(np.uint64(1), (positions % WORD_BITS).astype(np.uint64))
+            np.bitwise_or.at(bits, (rows, positions // WORD_BITS), masks)
+        return bits
+
+    def decode(self, bits):
+        """Skill names set in one bitset, in vocabulary order"""
+        bits = np.ascontiguousarray(bits, dtype="<u8")
+        flags = np.unpackbits(bits.view(np.uint8), bitorder="little")[:len(self._names)]
+        return [self._names[i] for i in np.flatnonzero(flags)]
+
+    def has(self, bits, skill):
+        """Whether a bitset contains a skill"""
+        position = self._index.get(str(skill).strip().lower())
+        if position is None:
+            return False
+        word = bits[..., position // WORD_BITS]
+        return bool((word >> np.uint64(position % WORD_BITS)) & np.uint64(1))
+
+    def missing_skills(self, required, have):
+        """Names of required skills that have lacks"""
+        return self.decode(missing(required, have))
@@ -0,0 +1,133 @@
+"""
+Yearly and monthly placement trends, with finalized periods served from snapshots
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+SERIES = ["year", "month"]
+
+# Columns holding counts, kept integer when snapshots (stored as JSON numbers) are merged in
+COUNT_COLUMNS = ["students", "placed", "placements", "interviews"]
+
+# Last semester of the programme; unplaced students below it may still be placed
+FINAL_SEMESTER = 8
+
+
+class TrendEngine:
+    """
+    Per-graduation-year and per-month placement series for a college.
+
+    Each series is one grouped aggregation over the rows of periods that
+    are still open. A month closes when it ends; a graduation year once
+    the year has ended and no student of the cohort is still waiting for
+    a placement (unplaced and below the final semester). With a data
+    ``version``, closed periods are handed to ``save(series, frame)``
+    stamped with it, and periods that ``load(series)`` returns with the
+    same stamp are used as they are: data that has not changed cannot
+    reopen a closed period. Stamps from other versions are recomputed and
+    saved over. Results are cached for the life of the engine.
+    """
+
+    def __init__(self, students, placements, interviews=None, load=None, save=None, today=None, version=None):
+        self.students = students
+        self.placements = placements
+        self.interviews = interviews
+        self.load = load
+        self.save = save
+        self.today = today or datetime.now()
+        self.version = version
+        self._series = {}
+
+    def _years(self):
+        """Graduation year of each student as text, and which students have one"""
+        years = pd.to_numeric(self.students["graduation_year"], errors="coerce").astype("Int64")
+        return years.astype(str), years.notna()
+
+    def _months(self, frame, column):
+        """YYYY-MM of a date column, missing where the date does not parse"""
+        return pd.to_datetime(frame[column], errors="coerce").dt.strftime("%Y-%m")
+
+    def _closed(self, series, fresh):
+        if series == "month":
+            return fresh.index < self.today.strftime("%Y-%m")
+        return (fresh.index < str(self.today.year)) & fresh["waiting"].eq(0)
+
+    # === AGGREGATION ===
+
+    def _yearly(self, finalized):
+        """
+        students, placed, placement_rate, avg_package and max_package per
+        graduation year, plus the students still waiting for a placement
+        """
+        students = self.students
+        years, dated = self._years()
+        open_rows = ~years.isin(finalized) & dated
+        placed = students["placement_status"].eq("Placed")[open_rows]
+        semester = pd.to_numeric(students["semester"][open_rows], errors="coerce") if "semester" in students \
+            else pd.Series(FINAL_SEMESTER, index=placed.index)
+
+        yearly = pd.DataFrame({
+            "period": years[open_rows],
+            "placed": placed,
+            "waiting": students["placement_status"][open_rows].eq("Not Placed") & ~(semester >= FINAL_SEMESTER),
+            "package": pd.to_numeric(students["package"][open_rows], errors="coerce").where(placed)
+        }).groupby("period").agg(
+            students=("placed", "size"),
+            placed=("placed", "sum"),
+            waiting=("waiting", "sum"),
+            avg_package=("package", "mean"),
+            max_package=("package", "max")
+        )
+        yearly["placement_rate"] = yearly["placed"] / yearly["students"] * 100
+        return yearly[["students", "placed", "placement_rate", "avg_package", "max_package", "waiting"]]
+
+    def _monthly(self, finalized):
+        """placements, avg_package and interviews per month of placement/interview date"""
+        months = self._months(self.placements, "placement_date")
+        open_rows = months.notna() & ~months.isin(finalized)
+        monthly = pd.DataFrame({
+            "period": months[open_rows],
+            "package": pd.to_numeric(self.placements["package"][open_rows], errors="coerce")
+        }).groupby("period").agg(placements=("package", "size"), avg_package=("package", "mean"))
+
+        if self.interviews is not None and "date" in self.interviews:
+            interview_months = self._months(self.interviews, "date")
+            interview_months = interview_months[interview_months.notna() & ~interview_months.isin(finalized)]
+            monthly = monthly.join(interview_months.value_counts().rename("interviews"), how="outer")
+        else:
+            monthly["interviews"] = 0
+        monthly[["placements", "interviews"]] = monthly[["placements", "interviews"]].fillna(0).astype(int)
+        monthly.index.name = "period"
+        return monthly
+
+    # === QUERIES ===
+
+    def series(self, series):
+        """The "year" or "month" series as a frame indexed by period, oldest first"""
+        if series not in self._series:
+            finalized = self.load(series) if self.load and self.version is not None else pd.DataFrame()
+            if not finalized.empty:
+                stamps = finalized.get("version", pd.Series(float("nan"), index=finalized.index))
+                finalized = finalized[stamps.eq(self.version)].drop(columns="version", errors="ignore")
+            fresh = (self._yearly if series == "year" else self._monthly)(finalized.index)
+
+            closed = self._closed(series, fresh)
+            fresh = fresh.drop(columns="waiting", errors="ignore")
+            if self.save and self.version is not None and closed.any():
+                self.save(series, fresh[closed].assign(version=self.version))
+
+            frames = [frame for frame in (finalized, fresh) if not frame.empty]
+            combined = pd.concat(frames) if frames else fresh
+            counts = [column for column in COUNT_COLUMNS if column in combined]
+            combined[counts] = combined[counts].fillna(0).astype(int)
+            combined.index.name = "period"
+            self._series[series] = combined.sort_index()
+        return self._series[series]
+
+    def compare(self, series="year", columns=None):
+        """The series with the change of each column (all by default) since the previous period"""
+        frame = self.series(series)
+        columns = list(columns or frame.columns)
+        return frame.join(frame[columns].diff().add_prefix("change_"))